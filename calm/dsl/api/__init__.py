@@ -1,8 +1,12 @@
 from .handle import get_client_handle_obj, get_api_client
 from .resource import get_resource_api
+from .metrics import ConnectionMetrics, add_metrics_hook, remove_metrics_hook
 
 __all__ = [
     "get_client_handle_obj",
     "get_api_client",
     "get_resource_api",
+    "ConnectionMetrics",
+    "add_metrics_hook",
+    "remove_metrics_hook",
 ]
@@ -91,6 +91,31 @@ class BlueprintAPI(ResourceAPI):
             method=REQUEST.METHOD.POST,
         )
 
+    def brownfield_vms_list_all(self, base_params, api_limit=250):
+        """returns (entities, err) of all brownfield vms matching base_params,
+        fetched page by page"""
+
+        params = base_params.copy()
+        length = params.get("length", api_limit)
+        params["length"] = length
+
+        entities = []
+        offset = 0
+        while True:
+            params["offset"] = offset
+            # brownfield_vms modifies the filter of payload, so pass a copy
+            res, err = self.brownfield_vms(params.copy())
+            if err:
+                return [], err
+
+            res = res.json()
+            entities.extend(res["entities"])
+            offset += length
+            if offset >= res["metadata"]["total_matches"] or not res["entities"]:
+                break
+
+        return entities, None
+
     def protection_policies(
         self, bp_uuid, app_profile_uuid, config_uuid, env_uuid, length=250, offset=0
     ):
@@ -13,17 +13,20 @@ client = get_connection(pc_ip, pc_port,
 
 import traceback
 import json
+import os
 import urllib3
 import sys
 
 from requests import Session as Session
 from requests_toolbelt import MultipartEncoder
-from requests.adapters import HTTPAdapter
 from requests.exceptions import ConnectTimeout
 from requests.packages.urllib3.util.retry import Retry
 
 from calm.dsl.log import get_logging_handle
 from calm.dsl.config import get_context
+from calm.dsl.tools import profile_span
+from .metrics import TimedHTTPAdapter, track_request
+from .response_cache import ResponseCache
 
 urllib3.disable_warnings()
 LOG = get_logging_handle(__name__)
@@ -125,6 +128,7 @@ class Connection:
         self.scheme = scheme
         self.auth_type = auth_type
         self.response_processor = response_processor
+        self.response_cache = None
 
     def connect(self):
         """Connect to api server, create http session pool.
@@ -148,7 +152,7 @@ class Connection:
                     "POST",
                 ],
             )
-            http_adapter = HTTPAdapter(
+            http_adapter = TimedHTTPAdapter(
                 pool_block=bool(self._pool_block),
                 pool_connections=int(self._pool_connections),
                 pool_maxsize=int(self._pool_maxsize),
@@ -156,7 +160,7 @@ class Connection:
             )
 
         else:
-            http_adapter = HTTPAdapter(
+            http_adapter = TimedHTTPAdapter(
                 pool_block=bool(self._pool_block),
                 pool_connections=int(self._pool_connections),
                 pool_maxsize=int(self._pool_maxsize),
@@ -170,6 +174,18 @@ class Connection:
         self.session.mount("http://", http_adapter)
         self.session.mount("https://", http_adapter)
         self.base_url = build_url(self.host, self.port, scheme=self.scheme)
+
+        if connection_config["response_cache_enabled"]:
+            # Responses are stored along with the local database
+            db_location = context.get_init_config()["DB"]["location"]
+            self.response_cache = ResponseCache(
+                os.path.join(os.path.dirname(db_location), "response_cache"),
+                max_size=connection_config["response_cache_size"] * 1024 * 1024,
+                identity="{}|{}".format(
+                    self.base_url, self.auth[0] if self.auth else ""
+                ),
+            )
+
         LOG.debug("{} session created".format(self.__class__.__name__))
         return self.session
 
@@ -196,6 +212,7 @@ class Connection:
         files=None,
         ignore_error=False,
         warning_msg="",
+        stream=False,
         **kwargs,
     ):
         """Private method for making http request to calm
@@ -207,6 +224,8 @@ class Connection:
             request_json (dict): request data
             request_params (dict): request params
             timeout (touple): (connection timeout, read timeout)
+            stream (bool): defer download of response body, to be read
+                           incrementally by the caller
         Returns:
             (tuple (requests.Response, dict)): Response
         """
@@ -223,35 +242,94 @@ class Connection:
             request_params = {}
 
         request_json = request_json or {}
+        # Arguments are formatted by logger only if debug logs are enabled
         LOG.debug(
-            """Server Request- '{method}' at '{endpoint}' with body:
-            '{body}'""".format(
-                method=method, endpoint=endpoint, body=request_json
-            )
+            """Server Request- '%s' at '%s' with body:
+            '%s'""",
+            method,
+            endpoint,
+            request_json,
         )
         res = None
         err = None
+
+        cached = None
+        # Streamed responses are consumed by caller, so these are never cached
+        response_cache = self.response_cache if not stream else None
+        if response_cache is not None:
+            ttl = response_cache.get_ttl(method, endpoint)
+            if ttl is None:
+                # Drop cached responses of the resource modified by request
+                response_cache.invalidate(method, endpoint)
+                response_cache = None
+
+            # Multipart uploads are never cached
+            elif files is None:
+                cached = response_cache.get(
+                    method, endpoint, params=request_params, body=request_json
+                )
+                if cached is not None and cached.is_fresh(ttl):
+                    LOG.debug("Serving response from cache")
+                    return cached.get_response(), None
+
         try:
             res = None
             url = build_url(self.host, self.port, endpoint=endpoint, scheme=self.scheme)
-            LOG.debug("URL is: {}".format(url))
-            base_headers = self.session.headers
-            if headers:
-                base_headers.update(headers)
-
-            if method == REQUEST.METHOD.POST:
-                if files is not None:
-                    request_json.update(files)
-                    m = MultipartEncoder(fields=request_json)
-                    res = self.session.post(
+            LOG.debug("URL is: %s", url)
+            with profile_span("api", "{} {}".format(method, endpoint)), track_request(
+                method, endpoint
+            ) as request_record:
+                base_headers = self.session.headers
+                if headers:
+                    base_headers.update(headers)
+                if cached is not None:
+                    base_headers = dict(base_headers)
+                    base_headers.update(cached.get_conditional_headers())
+
+                if method == REQUEST.METHOD.POST:
+                    if files is not None:
+                        request_json.update(files)
+                        m = MultipartEncoder(fields=request_json)
+                        res = self.session.post(
+                            url,
+                            data=m,
+                            verify=verify,
+                            headers={"Content-Type": m.content_type},
+                            timeout=timeout,
+                        )
+                    else:
+                        res = self.session.post(
+                            url,
+                            params=request_params,
+                            data=json.dumps(request_json),
+                            verify=verify,
+                            headers=base_headers,
+                            cookies=cookies,
+                            timeout=timeout,
+                            stream=stream,
+                        )
+                elif method == REQUEST.METHOD.PUT:
+                    res = self.session.put(
                         url,
-                        data=m,
+                        params=request_params,
+                        data=json.dumps(request_json),
                         verify=verify,
-                        headers={"Content-Type": m.content_type},
+                        headers=base_headers,
+                        cookies=cookies,
                         timeout=timeout,
                     )
-                else:
-                    res = self.session.post(
+                elif method == REQUEST.METHOD.GET:
+                    res = self.session.get(
+                        url,
+                        params=request_params or request_json,
+                        verify=verify,
+                        headers=base_headers,
+                        cookies=cookies,
+                        timeout=timeout,
+                        stream=stream,
+                    )
+                elif method == REQUEST.METHOD.DELETE:
+                    res = self.session.delete(
                         url,
                         params=request_params,
                         data=json.dumps(request_json),
@@ -260,34 +338,17 @@ class Connection:
                         cookies=cookies,
                         timeout=timeout,
                     )
-            elif method == REQUEST.METHOD.PUT:
-                res = self.session.put(
-                    url,
-                    params=request_params,
-                    data=json.dumps(request_json),
-                    verify=verify,
-                    headers=base_headers,
-                    cookies=cookies,
-                    timeout=timeout,
-                )
-            elif method == REQUEST.METHOD.GET:
-                res = self.session.get(
-                    url,
-                    params=request_params or request_json,
-                    verify=verify,
-                    headers=base_headers,
-                    cookies=cookies,
-                    timeout=timeout,
-                )
-            elif method == REQUEST.METHOD.DELETE:
-                res = self.session.delete(
-                    url,
+
+                if request_record is not None and res is not None:
+                    request_record.set_response(res, stream=stream)
+            if response_cache is not None and files is None:
+                res = response_cache.update(
+                    method,
+                    endpoint,
+                    res,
+                    cached=cached,
                     params=request_params,
-                    data=json.dumps(request_json),
-                    verify=verify,
-                    headers=base_headers,
-                    cookies=cookies,
-                    timeout=timeout,
+                    body=request_json,
                 )
             res.raise_for_status()
             if not url.endswith("/download"):
@@ -0,0 +1,156 @@
+import codecs
+import json
+
+
+# Size (in bytes) of chunks read from streamed responses
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = " \t\n\r"
+
+# Characters that can follow a complete value in the document
+_VALUE_END = _WHITESPACE + ",:]}"
+
+
+class JSONStreamReader:
+    """reads json values one at a time from chunks of a json document, so that
+    only the value being decoded is kept in memory"""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json_decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _read_more(self):
+        """appends next chunk to buffer, returns False at end of document"""
+
+        if self.eof:
+            return False
+
+        text = ""
+        for chunk in self._chunks:
+            text = self._text_decoder.decode(chunk)
+            if text:
+                break
+        else:
+            text = self._text_decoder.decode(b"", final=True)
+            self.eof = True
+
+        # Drop the consumed part of buffer
+        self.buffer = self.buffer[self.pos :] + text
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """returns next non-whitespace character, without consuming it"""
+
+        while True:
+            buffer = self.buffer
+            while self.pos < len(buffer) and buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+
+            if self.pos < len(buffer):
+                return buffer[self.pos]
+
+            if not self._read_more():
+                raise ValueError("Unexpected end of json document")
+
+    def accept(self, char):
+        """consumes next character if it is the supplied one"""
+
+        if self.peek() == char:
+            self.pos += 1
+            return True
+
+        return False
+
+    def expect(self, char):
+        if not self.accept(char):
+            raise ValueError(
+                "Expected '{}' but found '{}' in json document".format(
+                    char, self.peek()
+                )
+            )
+
+    def read_value(self):
+        """decodes and consumes the next json value"""
+
+        self.peek()
+        while True:
+            try:
+                value, end = self._json_decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self._read_more():
+                    continue
+                raise
+
+            # Numbers and literals cut at end of buffer continue in next chunk
+            buffer = self.buffer
+            if (end == len(buffer) or buffer[end] not in _VALUE_END) and (
+                self._read_more()
+            ):
+                continue
+
+            self.pos = end
+            return value
+
+
+def project_fields(entity, fields):
+    """returns dict having only the supplied dotted field paths of entity,
+    i.e. ["status.name", "metadata.uuid"]. Dicts present on a path are kept
+    even if the field is missing in them, so lookups on them behave as before"""
+
+    result = {}
+    for field in fields:
+        keys = field.split(".")
+        value = entity
+        target = result
+        for index, key in enumerate(keys):
+            if not isinstance(value, dict) or key not in value:
+                break
+
+            value = value[key]
+            if index == len(keys) - 1:
+                target[key] = value
+            elif isinstance(value, dict):
+                target = target.setdefault(key, {})
+
+    return result
+
+
+def iter_list_entities(chunks, fields=None, info=None):
+    """yields the entities of a list api response, decoded incrementally from
+    chunks of response body. If fields are supplied, entities are reduced to
+    them as soon as they are decoded. Other top level keys of the response
+    (i.e. metadata) are set in info dict"""
+
+    reader = JSONStreamReader(chunks)
+    reader.expect("{")
+    if reader.accept("}"):
+        return
+
+    while True:
+        key = reader.read_value()
+        reader.expect(":")
+
+        if key == "entities" and reader.accept("["):
+            if not reader.accept("]"):
+                while True:
+                    entity = reader.read_value()
+                    yield project_fields(entity, fields) if fields else entity
+                    if not reader.accept(","):
+                        break
+
+                reader.expect("]")
+
+        else:
+            value = reader.read_value()
+            if info is not None:
+                info[key] = value
+
+        if not reader.accept(","):
+            break
+
+    reader.expect("}")
@@ -0,0 +1,239 @@
+import re
+import threading
+import time
+
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+
+# Upper bounds (in ms) of latency histogram buckets, last bucket is unbounded
+LATENCY_BUCKETS = [10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+_UUID_SEGMENT = re.compile(
+    r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$"
+)
+
+# Hooks called with RequestRecord of every request made by connections
+_HOOKS = []
+
+# Time spent by current thread waiting for a connection from the pool
+_pool_wait = threading.local()
+
+
+def get_endpoint_template(endpoint):
+    """returns endpoint with uuids and ids replaced, to group calls on it"""
+
+    path = endpoint.split("?", 1)[0].strip("/")
+    segments = []
+    for segment in path.split("/"):
+        if _UUID_SEGMENT.match(segment):
+            segment = "{uuid}"
+        elif segment.isdigit():
+            segment = "{id}"
+        segments.append(segment)
+
+    return "/".join(segments)
+
+
+def add_metrics_hook(hook):
+    """registers hook to be called with RequestRecord of every request"""
+
+    if hook not in _HOOKS:
+        _HOOKS.append(hook)
+
+
+def remove_metrics_hook(hook):
+    if hook in _HOOKS:
+        _HOOKS.remove(hook)
+
+
+class RequestRecord:
+    """details of a request made to the server"""
+
+    __slots__ = (
+        "method",
+        "endpoint",
+        "status_code",
+        "duration",
+        "pool_wait",
+        "retries",
+        "bytes_sent",
+        "bytes_received",
+        "error",
+    )
+
+    def __init__(self, method, endpoint):
+        self.method = method
+        self.endpoint = endpoint
+        self.status_code = None
+        self.duration = 0
+        self.pool_wait = 0
+        self.retries = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.error = None
+
+    def set_response(self, res, stream=False):
+        """sets status, payload sizes and retries from response. Body of
+        streamed responses is not read, so their size is taken from headers"""
+
+        self.status_code = res.status_code
+        if stream:
+            self.bytes_received = int(res.headers.get("Content-Length") or 0)
+        else:
+            self.bytes_received = len(res.content or b"")
+
+        body = getattr(res.request, "body", None)
+        if body is not None:
+            self.bytes_sent = getattr(body, "len", None) or len(body)
+
+        # Retry object of urllib3 keeps history of retried attempts
+        retries = getattr(res.raw, "retries", None)
+        if retries is not None:
+            self.retries = len(retries.history)
+
+
+class RequestTracker:
+    """context manager recording a request, and passing it to metrics hooks"""
+
+    def __init__(self, method, endpoint):
+        self.record = RequestRecord(method, endpoint)
+        self.start = None
+
+    def __enter__(self):
+        _pool_wait.duration = 0
+        self.start = time.perf_counter()
+        return self.record
+
+    def __exit__(self, exc_type, exc_value, tb):
+        record = self.record
+        record.duration = time.perf_counter() - self.start
+        record.pool_wait = getattr(_pool_wait, "duration", 0)
+        if exc_value is not None:
+            record.error = type(exc_value).__name__
+
+        for hook in list(_HOOKS):
+            hook(record)
+
+
+class _NullTracker:
+    def __enter__(self):
+        return None
+
+    def __exit__(self, exc_type, exc_value, tb):
+        return None
+
+
+_NULL_TRACKER = _NullTracker()
+
+
+def track_request(method, endpoint):
+    """returns context manager recording the request made in it. It yields
+    the RequestRecord, or None if no metrics hook is registered"""
+
+    if not _HOOKS:
+        return _NULL_TRACKER
+
+    return RequestTracker(method, endpoint)
+
+
+class _PoolWaitMixin:
+    """times the wait for a free connection, when the pool is blocking"""
+
+    def _get_conn(self, timeout=None):
+        start = time.perf_counter()
+        try:
+            return super()._get_conn(timeout=timeout)
+        finally:
+            _pool_wait.duration = getattr(_pool_wait, "duration", 0) + (
+                time.perf_counter() - start
+            )
+
+
+class TimedHTTPConnectionPool(_PoolWaitMixin, HTTPConnectionPool):
+    pass
+
+
+class TimedHTTPSConnectionPool(_PoolWaitMixin, HTTPSConnectionPool):
+    pass
+
+
+TIMED_POOL_CLASSES = {
+    "http": TimedHTTPConnectionPool,
+    "https": TimedHTTPSConnectionPool,
+}
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """http adapter using connection pools that time the wait for connection"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = TIMED_POOL_CLASSES
+
+
+class ConnectionMetrics:
+    """metrics hook aggregating requests per method and endpoint template"""
+
+    def __init__(self):
+        self.stats = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, record):
+        key = (record.method.upper(), get_endpoint_template(record.endpoint))
+        duration_ms = record.duration * 1000
+
+        bucket = len(LATENCY_BUCKETS)
+        for index, bound in enumerate(LATENCY_BUCKETS):
+            if duration_ms <= bound:
+                bucket = index
+                break
+
+        with self._lock:
+            stats = self.stats.get(key, None)
+            if stats is None:
+                stats = {
+                    "method": key[0],
+                    "endpoint": key[1],
+                    "calls": 0,
+                    "errors": 0,
+                    "retries": 0,
+                    "total_ms": 0,
+                    "max_ms": 0,
+                    "pool_wait_ms": 0,
+                    "bytes_sent": 0,
+                    "bytes_received": 0,
+                    "latency_buckets": [0] * (len(LATENCY_BUCKETS) + 1),
+                }
+                self.stats[key] = stats
+
+            stats["calls"] += 1
+            if record.error or (record.status_code or 0) >= 400:
+                stats["errors"] += 1
+            stats["retries"] += record.retries
+            stats["total_ms"] += duration_ms
+            stats["max_ms"] = max(stats["max_ms"], duration_ms)
+            stats["pool_wait_ms"] += record.pool_wait * 1000
+            stats["bytes_sent"] += record.bytes_sent
+            stats["bytes_received"] += record.bytes_received
+            stats["latency_buckets"][bucket] += 1
+
+    def get_summary(self):
+        """returns stats of endpoints, sorted on total time"""
+
+        with self._lock:
+            endpoints = [
+                dict(stats, latency_buckets=list(stats["latency_buckets"]))
+                for stats in self.stats.values()
+            ]
+
+        endpoints.sort(key=lambda stats: stats["total_ms"], reverse=True)
+        for stats in endpoints:
+            stats["avg_ms"] = stats["total_ms"] / stats["calls"]
+
+        return {
+            "latency_buckets_ms": LATENCY_BUCKETS,
+            "total_calls": sum(stats["calls"] for stats in endpoints),
+            "total_ms": sum(stats["total_ms"] for stats in endpoints),
+            "endpoints": endpoints,
+        }
@@ -111,13 +111,14 @@ class ProjectAPI(ResourceAPI):
     # https://jira.nutanix.com/browse/CALM-32302
     # Project list timeout if we have more Projects.
     # So setting read timeout to 300 seconds
-    def list(self, params={}, ignore_error=False):
+    def list(self, params={}, ignore_error=False, stream=False):
         return self.connection._call(
             self.LIST,
             verify=False,
             request_json=params,
             method=REQUEST.METHOD.POST,
             ignore_error=ignore_error,
+            stream=stream,
             timeout=(5, 300),
         )
 
@@ -1,4 +1,14 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+
 from .connection import REQUEST
+from .json_stream import STREAM_CHUNK_SIZE, iter_list_entities
+
+# Upper bound on parallel page requests issued by ResourceAPI.list_all
+LIST_ALL_MAX_WORKERS = 8
+
+# Fields used by name/uuid map helpers
+NAME_UUID_FIELDS = ["status.name", "metadata.uuid"]
 
 
 class ResourceAPI:
@@ -34,17 +44,20 @@ class ResourceAPI:
             self.ITEM.format(uuid), verify=False, method=REQUEST.METHOD.DELETE
         )
 
-    def list(self, params={}, ignore_error=False):
+    def list(self, params={}, ignore_error=False, stream=False):
         return self.connection._call(
             self.LIST,
             verify=False,
             request_json=params,
             method=REQUEST.METHOD.POST,
             ignore_error=ignore_error,
+            stream=stream,
         )
 
     def get_name_uuid_map(self, params={}):
-        res_entities, err = self.list_all(base_params=params, ignore_error=True)
+        res_entities, err = self.list_all(
+            base_params=params, ignore_error=True, fields=NAME_UUID_FIELDS
+        )
 
         if not err:
             response = res_entities
@@ -78,7 +91,9 @@ class ResourceAPI:
         return name_uuid_map
 
     def get_uuid_name_map(self, params={}):
-        res_entities, err = self.list_all(base_params=params, ignore_error=True)
+        res_entities, err = self.list_all(
+            base_params=params, ignore_error=True, fields=NAME_UUID_FIELDS
+        )
         if not err:
             response = res_entities
         else:
@@ -97,40 +112,147 @@ class ResourceAPI:
 
         return uuid_name_map
 
-    # TODO: Fix return type of list_all helper
-    def list_all(self, api_limit=250, base_params=None, ignore_error=False):
-        """returns the list of entities"""
+    def _list_page(self, params, offset, ignore_error=False, fields=None):
+        """returns (entities, total_matches, err) for the page at given offset.
+        If fields are supplied, response is streamed and entities are reduced
+        to these dotted field paths while decoding"""
 
-        final_list = []
-        offset = 0
-        if base_params is None:
-            base_params = {}
-        params = base_params.copy()
-        length = params.get("length", api_limit)
-        params["length"] = length
+        params = params.copy()
         params["offset"] = offset
+        if not fields:
+            response, err = self.list(params, ignore_error=ignore_error)
+            if err:
+                return [], 0, err
+
+            response = response.json()
+            return response["entities"], response["metadata"]["total_matches"], None
+
+        response, err = self.list(params, ignore_error=ignore_error, stream=True)
+        if err:
+            return [], 0, err
+
+        info = {}
+        with closing(response):
+            entities = list(
+                iter_list_entities(
+                    response.iter_content(STREAM_CHUNK_SIZE), fields=fields, info=info
+                )
+            )
+
+        return entities, info["metadata"]["total_matches"], None
+
+    def _get_list_all_params(self, api_limit, base_params):
+        """returns list api payload used for paging through all entities"""
+
+        params = (base_params or {}).copy()
+        params["length"] = params.get("length", api_limit)
         if params.get("sort_attribute", None) is None:
             params["sort_attribute"] = "_created_timestamp_usecs_"
         if params.get("sort_order", None) is None:
             params["sort_order"] = "ASCENDING"
+
+        return params
+
+    def list_iter(self, api_limit=250, base_params=None, fields=None):
+        """yields all entities one at a time. Pages are requested one after
+        another and decoded incrementally, so memory used does not grow with
+        number of entities
+
+        Args:
+            api_limit (int): page size used if base_params has no length
+            base_params (dict): list api payload
+            fields (list): dotted field paths to keep in yielded entities,
+                i.e. ["status.name", "metadata.uuid"]. All fields by default
+        """
+
+        params = self._get_list_all_params(api_limit, base_params)
+        offset = 0
         while True:
             params["offset"] = offset
-            response, err = self.list(params, ignore_error=ignore_error)
-            if not err:
-                response = response.json()
-            else:
-                if ignore_error:
-                    return [], err
-                else:
-                    raise Exception("[{}] - {}".format(err["code"], err["error"]))
+            response, err = self.list(params, ignore_error=True, stream=True)
+            if err:
+                raise Exception("[{}] - {}".format(err["code"], err["error"]))
+
+            info = {}
+            count = 0
+            with closing(response):
+                for entity in iter_list_entities(
+                    response.iter_content(STREAM_CHUNK_SIZE), fields=fields, info=info
+                ):
+                    count += 1
+                    yield entity
+
+            offset += count
+            if not count or offset >= info["metadata"]["total_matches"]:
+                break
 
-            final_list.extend(response["entities"])
+    # TODO: Fix return type of list_all helper
+    def list_all(
+        self,
+        api_limit=250,
+        base_params=None,
+        ignore_error=False,
+        concurrent=True,
+        max_workers=LIST_ALL_MAX_WORKERS,
+        fields=None,
+    ):
+        """returns the list of entities
+
+        Args:
+            api_limit (int): page size used if base_params has no length
+            base_params (dict): list api payload
+            ignore_error (bool): return (entities, err) instead of raising
+            concurrent (bool): read total_matches from the first page and
+                fetch the remaining pages in parallel
+            max_workers (int): upper bound on parallel page requests, capped
+                by the connection pool size
+            fields (list): dotted field paths to keep in entities. Pages are
+                streamed and reduced while decoding. All fields by default
+        """
+
+        params = self._get_list_all_params(api_limit, base_params)
+        length = params["length"]
+
+        entities, total_matches, err = self._list_page(
+            params, 0, ignore_error=ignore_error, fields=fields
+        )
+        if err:
+            if ignore_error:
+                return [], err
+            raise Exception("[{}] - {}".format(err["code"], err["error"]))
 
-            total_matches = response["metadata"]["total_matches"]
-            if total_matches <= (length + offset):
-                break
+        final_list = list(entities)
+        offsets = list(range(length, total_matches, length))
+
+        if concurrent and len(offsets) > 1:
+            pool_size = getattr(self.connection, "_pool_maxsize", max_workers)
+            workers = max(1, min(max_workers, int(pool_size), len(offsets)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                # executor.map yields results in submission order
+                pages = executor.map(
+                    lambda offset: self._list_page(
+                        params, offset, ignore_error=ignore_error, fields=fields
+                    ),
+                    offsets,
+                )
+                for entities, _, err in pages:
+                    if err:
+                        break
+                    final_list.extend(entities)
 
-            offset += length
+        else:
+            for offset in offsets:
+                entities, _, err = self._list_page(
+                    params, offset, ignore_error=ignore_error, fields=fields
+                )
+                if err:
+                    break
+                final_list.extend(entities)
+
+        if err:
+            if ignore_error:
+                return [], err
+            raise Exception("[{}] - {}".format(err["code"], err["error"]))
 
         if ignore_error:
             return final_list, None
@@ -0,0 +1,245 @@
+import hashlib
+import json
+import os
+import pickle
+import re
+import shutil
+import threading
+import time
+
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+
+from calm.dsl.log import get_logging_handle
+from .metrics import get_endpoint_template
+
+LOG = get_logging_handle(__name__)
+
+
+# Time (in seconds) for which responses of endpoint templates are served from
+# cache. Responses with ttl 0 are always revalidated with server. Responses of
+# other endpoints are not cached.
+RESPONSE_CACHE_TTLS = [
+    # Infra entities listed by provider plugins, which change rarely
+    (r"^api/nutanix/v3/(nutanix/v1/)?(images|subnets|clusters|vpcs)/list$", 300),
+    (r"^api/nutanix/v3/(vmware|aws|azure_rm|gcp)/.+/list$", 300),
+    # Blueprints and their runtime editables
+    (r"^api/nutanix/v3/blueprints/{uuid}(/runtime_editables)?$", 60),
+    # App state changes by itself, so app is served only after revalidation
+    (r"^api/nutanix/v3/apps/{uuid}$", 0),
+]
+
+# Number of endpoint segments identifying the resource, whose cached responses
+# are dropped on any write to it. i.e. 'api/nutanix/v3/blueprints'
+RESOURCE_SEGMENTS = 4
+
+_ENDPOINT_TTLS = [(re.compile(pattern), ttl) for pattern, ttl in RESPONSE_CACHE_TTLS]
+
+
+def is_read_request(method, endpoint):
+    """returns True if request does not modify anything on server. Entities
+    are listed using POST calls on '/list' endpoints"""
+
+    return method == "get" or (
+        method == "post" and endpoint.split("?", 1)[0].endswith("/list")
+    )
+
+
+class CachedResponse:
+    """response stored in cache, along with its validators"""
+
+    def __init__(self, url, status_code, headers, content, encoding, stored_at):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.encoding = encoding
+        self.stored_at = stored_at
+
+    @classmethod
+    def from_response(cls, res):
+        return cls(
+            res.url,
+            res.status_code,
+            dict(res.headers),
+            res.content,
+            res.encoding,
+            time.time(),
+        )
+
+    def is_fresh(self, ttl):
+        return time.time() - self.stored_at < ttl
+
+    def get_conditional_headers(self):
+        """returns headers to revalidate response with server"""
+
+        headers = {}
+        headers_map = CaseInsensitiveDict(self.headers)
+        if headers_map.get("ETag"):
+            headers["If-None-Match"] = headers_map["ETag"]
+        if headers_map.get("Last-Modified"):
+            headers["If-Modified-Since"] = headers_map["Last-Modified"]
+
+        return headers
+
+    def get_response(self):
+        res = Response()
+        res.url = self.url
+        res.status_code = self.status_code
+        res.headers = CaseInsensitiveDict(self.headers)
+        res.encoding = self.encoding
+        res._content = self.content
+        res.reason = "OK"
+        return res
+
+
+class ResponseCache:
+    """on-disk cache of responses of read calls, with size bounded LRU eviction.
+    Responses are kept per resource in separate directories"""
+
+    def __init__(self, location, max_size, identity=""):
+        self.location = location
+        self.max_size = max_size
+        self.identity = identity
+        self._lock = threading.Lock()
+
+    def get_ttl(self, method, endpoint):
+        """returns ttl of responses of endpoint, None if these are not cached"""
+
+        if not is_read_request(method, endpoint):
+            return None
+
+        template = get_endpoint_template(endpoint)
+        for pattern, ttl in _ENDPOINT_TTLS:
+            if pattern.match(template):
+                return ttl
+
+        return None
+
+    def _get_resource_dir(self, endpoint):
+        template = get_endpoint_template(endpoint)
+        resource = "/".join(template.split("/")[:RESOURCE_SEGMENTS])
+        resource_hash = hashlib.sha1(
+            "{}\n{}".format(self.identity, resource).encode("utf-8")
+        ).hexdigest()
+        return os.path.join(self.location, resource_hash)
+
+    def _get_entry_path(self, method, endpoint, params, body):
+        request_hash = hashlib.sha256(
+            "\n".join(
+                [
+                    method,
+                    endpoint,
+                    json.dumps(params or {}, sort_keys=True),
+                    json.dumps(body or {}, sort_keys=True),
+                ]
+            ).encode("utf-8")
+        ).hexdigest()
+        return os.path.join(self._get_resource_dir(endpoint), request_hash)
+
+    def get(self, method, endpoint, params=None, body=None):
+        """returns cached response of request, None if not found"""
+
+        entry_path = self._get_entry_path(method, endpoint, params, body)
+        try:
+            with open(entry_path, "rb") as fd:
+                cached = pickle.load(fd)
+
+            # Modification time of entry is used as its last access time
+            os.utime(entry_path)
+        except FileNotFoundError:
+            return None
+        except Exception as exp:
+            LOG.debug("Unable to read cached response: {}".format(exp))
+            return None
+
+        return cached
+
+    def put(self, method, endpoint, cached, params=None, body=None):
+        """stores response in cache, evicting least recently used ones"""
+
+        content_size = len(cached.content or b"")
+        if content_size > self.max_size:
+            return
+
+        entry_path = self._get_entry_path(method, endpoint, params, body)
+        try:
+            os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+
+            # Write to a temporary file first, so that parallel runs never read partial files
+            tmp_path = "{}.{}.{}".format(entry_path, os.getpid(), threading.get_ident())
+            with open(tmp_path, "wb") as fd:
+                pickle.dump(cached, fd, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, entry_path)
+
+        except Exception as exp:
+            LOG.debug("Unable to cache response: {}".format(exp))
+            return
+
+        self.evict()
+
+    def update(self, method, endpoint, res, cached=None, params=None, body=None):
+        """updates cache with response of request, returns the response to be
+        used by caller. Response for revalidated requests is the cached one"""
+
+        ttl = self.get_ttl(method, endpoint)
+        if ttl is None:
+            return res
+
+        if res.status_code == 304 and cached is not None:
+            cached.stored_at = time.time()
+            self.put(method, endpoint, cached, params=params, body=body)
+            return cached.get_response()
+
+        if res.status_code == 200:
+            cached = CachedResponse.from_response(res)
+
+            # Responses to be revalidated are useful only with validators
+            if ttl or cached.get_conditional_headers():
+                self.put(method, endpoint, cached, params=params, body=body)
+
+        return res
+
+    def invalidate(self, method, endpoint):
+        """drops cached responses of resource, if request modifies it"""
+
+        if is_read_request(method, endpoint):
+            return
+
+        shutil.rmtree(self._get_resource_dir(endpoint), ignore_errors=True)
+
+    def evict(self):
+        """removes least recently used responses, till cache fits in max size"""
+
+        with self._lock:
+            entries = []
+            total_size = 0
+            try:
+                for resource_dir in os.scandir(self.location):
+                    if not resource_dir.is_dir():
+                        continue
+                    for entry in os.scandir(resource_dir.path):
+                        entry_stat = entry.stat()
+                        entries.append(
+                            (entry_stat.st_mtime, entry_stat.st_size, entry.path)
+                        )
+                        total_size += entry_stat.st_size
+            except FileNotFoundError:
+                return
+
+            if total_size <= self.max_size:
+                return
+
+            entries.sort()
+            for _, size, path in entries:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+                total_size -= size
+                if total_size <= self.max_size:
+                    break
+
+    def clear(self):
+        shutil.rmtree(self.location, ignore_errors=True)
@@ -30,7 +30,11 @@ class AccountsAPI(ResourceAPI):
     def get_uuid_type_map(self, params=dict()):
         """returns map containing {account_uuid: account_type} details"""
 
-        res_entities, err = self.list_all(base_params=params, ignore_error=True)
+        res_entities, err = self.list_all(
+            base_params=params,
+            ignore_error=True,
+            fields=["metadata.uuid", "status.resources.type"],
+        )
         if err:
             raise Exception(err)
 
@@ -7,7 +7,7 @@ class UserAPI(ResourceAPI):
         super().__init__(connection, resource_type="users")
 
     # Temporary hack to fix blocker CALM-32740
-    def list(self, params={}, ignore_error=False):
+    def list(self, params={}, ignore_error=False, stream=False):
         params.pop("sort_attribute", None)
         params.pop("sort_order", None)
         return self.connection._call(
@@ -16,5 +16,6 @@ class UserAPI(ResourceAPI):
             request_json=params,
             method=REQUEST.METHOD.POST,
             ignore_error=ignore_error,
+            stream=stream,
             timeout=(5, 60),
         )
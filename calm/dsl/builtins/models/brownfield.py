@@ -68,343 +68,153 @@ def match_vm_data(
     return False
 
 
-# TODO merge provider specific helpers into one
-def get_ahv_bf_vm_data(
-    project_uuid, account_uuid, instance_name=None, ip_address=[], instance_id=None
-):
-    """Return ahv vm data matched with provided instacne details"""
-
-    if not instance_id:
-        if not (instance_name or ip_address):
-            LOG.error("One of 'instance_name' or 'ip_address' must be given.")
-            sys.exit(-1)
-
-    client = get_api_client()
-    res, err = client.account.read(account_uuid)
-    if err:
-        raise Exception("[{}] - {}".format(err["code"], err["error"]))
-
-    res = res.json()
-    clusters = res["status"]["resources"]["data"].get(
-        "cluster_account_reference_list", []
-    )
-    if not clusters:
-        LOG.error("No cluster found in ahv account (uuid='{}')".format(account_uuid))
-        sys.exit(-1)
-
-    # TODO Cluster should be a part of project whitelisted clusters. Change after jira is resolved
-    # Jira: https://jira.nutanix.com/browse/CALM-20205
-    cluster_uuid = clusters[0]["uuid"]
-
-    params = {
-        "length": 1000,
-        "offset": 0,
-        "filter": "project_uuid=={};account_uuid=={}".format(
-            project_uuid, cluster_uuid
-        ),
-    }
-    res, err = client.blueprint.brownfield_vms(params)
-    if err:
-        raise Exception("[{}] - {}".format(err["code"], err["error"]))
-
-    res = res.json()
-    if not res["metadata"]["total_matches"]:
-        LOG.error(
-            "No nutanix brownfield vms found on account(uuid='{}') and project(uuid='{}')".format(
-                account_uuid, project_uuid
-            )
-        )
-        sys.exit(-1)
-
-    res_vm_data = None
-    for entity in res["entities"]:
-        e_resources = entity["status"]["resources"]
-        e_name = e_resources["instance_name"]
-        e_id = e_resources["instance_id"]
-        e_address = e_resources["address"]
-        e_address_list = e_resources["address_list"]
-
-        if match_vm_data(
-            vm_name=e_name,
-            vm_address_list=e_address_list,
-            vm_id=e_id,
-            instance_name=instance_name,
-            instance_address=ip_address,
-            instance_id=instance_id,
-        ):
-            if res_vm_data:
-                # If there is an existing vm with provided configuration
-                LOG.error(
-                    "Multiple vms with same name ({}) found".format(instance_name)
-                )
-                sys.exit(-1)
-
-            res_vm_data = {
-                "instance_name": e_name,
-                "instance_id": e_id,
-                "address": ip_address or e_address,
+# provider_type: (provider name, instance id attribute, ip address list attribute)
+BF_VM_PROVIDER_ATTRS = {
+    "AHV_VM": ("nutanix", "instance_id", "address_list"),
+    "AWS_VM": ("aws", "instance_id", "public_ip_address"),
+    "AZURE_VM": ("azure", "instance_id", "public_ip_address"),
+    "VMWARE_VM": ("vmware", "instance_id", "guest.ipAddress"),
+    "GCP_VM": ("gcp", "id", "natIP"),
+}
+
+
+class BrownfieldVmIndex:
+    """Index of brownfield vms of a (project, account) on instance name, ip address
+    and instance id. Vms are listed once per compile, and every brownfield vm of
+    the compile is resolved against the index"""
+
+    # Indexes of current compile, keyed on (provider_type, project_uuid, account_uuid)
+    _indexes = {}
+
+    def __init__(self, provider_type, entities):
+        _, id_attr, address_list_attr = BF_VM_PROVIDER_ATTRS[provider_type]
+
+        self.vms = []
+        self.id_index = {}
+        self.name_index = {}
+        self.address_index = {}
+        for entity in entities:
+            e_resources = entity["status"]["resources"]
+            vm = {
+                "instance_name": e_resources["instance_name"],
+                "instance_id": e_resources[id_attr],
+                "address": e_resources["address"],
+                "address_list": e_resources[address_list_attr],
             }
 
-    # If vm not found raise error
-    if not res_vm_data:
-        LOG.error(
-            "No nutanix brownfield vm with details (name='{}', address='{}', id='{}') found on account(uuid='{}') and project(uuid='{}')".format(
-                instance_name, ip_address, instance_id, account_uuid, project_uuid
-            )
-        )
-        sys.exit(-1)
-
-    return res_vm_data
+            if provider_type == "AZURE_VM":
+                e_private_address = e_resources["private_ip_address"]
+                if (not vm["address_list"]) and e_private_address:
+                    vm["address"] = [e_private_address]
+                    vm["address_list"] = [e_private_address]
+                vm["platform_data"] = {"resource_group": e_resources["resource_group"]}
 
+            self.vms.append(vm)
+            self.id_index.setdefault(vm["instance_id"], []).append(vm)
+            self.name_index.setdefault(vm["instance_name"], []).append(vm)
+            for address in vm["address_list"] or []:
+                self.address_index.setdefault(address, []).append(vm)
 
-def get_aws_bf_vm_data(
-    project_uuid, account_uuid, instance_name=None, ip_address=[], instance_id=None
-):
-    """Return aws vm data matched with provided instacne details"""
-
-    client = get_api_client()
-
-    params = {
-        "length": 250,
-        "offset": 0,
-        "filter": "project_uuid=={};account_uuid=={}".format(
-            project_uuid, account_uuid
-        ),
-    }
-    res, err = client.blueprint.brownfield_vms(params)
-    if err:
-        raise Exception("[{}] - {}".format(err["code"], err["error"]))
-
-    res = res.json()
-    if not res["metadata"]["total_matches"]:
-        LOG.error(
-            "No aws brownfield vms found on account(uuid='{}') and project(uuid='{}')".format(
-                account_uuid, project_uuid
-            )
-        )
-        sys.exit(-1)
+    @classmethod
+    def get(cls, provider_type, project_uuid, account_uuid):
+        """returns index of brownfield vms, listing them if not indexed yet"""
 
-    res_vm_data = None
-    for entity in res["entities"]:
-        e_resources = entity["status"]["resources"]
-        e_name = e_resources["instance_name"]
-        e_id = e_resources["instance_id"]
-        e_address = e_resources["address"]
-        e_address_list = e_resources["public_ip_address"]
+        key = (provider_type, project_uuid, account_uuid)
+        if key not in cls._indexes:
+            entities = cls.list_vms(provider_type, project_uuid, account_uuid)
+            cls._indexes[key] = cls(provider_type, entities)
 
-        if match_vm_data(
-            vm_name=e_name,
-            vm_address_list=e_address_list,
-            vm_id=e_id,
-            instance_name=instance_name,
-            instance_address=ip_address,
-            instance_id=instance_id,
-        ):
-            if res_vm_data:
-                # If there is an existing vm with provided configuration
-                LOG.error(
-                    "Multiple vms with same name ({}) found".format(instance_name)
-                )
-                sys.exit(-1)
+        return cls._indexes[key]
 
-            res_vm_data = {
-                "instance_name": e_name,
-                "instance_id": e_id,
-                "address": ip_address or e_address,
-            }
-
-    # If vm not found raise error
-    if not res_vm_data:
-        LOG.error(
-            "No aws brownfield vm with details (name='{}', address='{}', id='{}') found on account(uuid='{}') and project(uuid='{}')".format(
-                instance_name, ip_address, instance_id, account_uuid, project_uuid
-            )
-        )
-        sys.exit(-1)
-
-    return res_vm_data
+    @classmethod
+    def reset(cls):
+        """clears indexes, called at the start of every compile"""
 
+        cls._indexes.clear()
 
-def get_azure_bf_vm_data(
-    project_uuid, account_uuid, instance_name=None, ip_address=[], instance_id=None
-):
-    """Return azure vm data matched with provided instacne details"""
+    @classmethod
+    def list_vms(cls, provider_type, project_uuid, account_uuid):
+        """returns all brownfield vms of project present on account"""
 
-    client = get_api_client()
+        client = get_api_client()
+        filter_account_uuid = account_uuid
+        if provider_type == "AHV_VM":
+            res, err = client.account.read(account_uuid)
+            if err:
+                raise Exception("[{}] - {}".format(err["code"], err["error"]))
 
-    if instance_name:
-        filter = "instance_name=={};project_uuid=={};account_uuid=={}".format(
-            instance_name, project_uuid, account_uuid
-        )
-    else:
-        filter = "project_uuid=={};account_uuid=={}".format(project_uuid, account_uuid)
-    params = {"length": 1000, "offset": 0, "filter": filter}
-    res, err = client.blueprint.brownfield_vms(params)
-    if err:
-        raise Exception("[{}] - {}".format(err["code"], err["error"]))
-
-    res = res.json()
-    if not res["metadata"]["total_matches"]:
-        LOG.error(
-            "No azure brownfield vms found on account(uuid='{}') and project(uuid='{}')".format(
-                account_uuid, project_uuid
+            res = res.json()
+            clusters = res["status"]["resources"]["data"].get(
+                "cluster_account_reference_list", []
             )
-        )
-        sys.exit(-1)
-
-    res_vm_data = None
-    for entity in res["entities"]:
-        e_resources = entity["status"]["resources"]
-        e_name = e_resources["instance_name"]
-        e_id = e_resources["instance_id"]
-        e_address = e_resources["address"]
-        e_address_list = e_resources["public_ip_address"]
-        e_private_address = e_resources["private_ip_address"]
-        if (not e_address_list) and e_private_address:
-            e_address = [e_private_address]
-            e_address_list = e_private_address
-
-        if match_vm_data(
-            vm_name=e_name,
-            vm_address_list=e_address_list,
-            vm_id=e_id,
-            instance_name=instance_name,
-            instance_address=ip_address,
-            instance_id=instance_id,
-        ):
-            if res_vm_data:
-                # If there is an existing vm with provided configuration
+            if not clusters:
                 LOG.error(
-                    "Multiple vms with same name ({}) found".format(instance_name)
+                    "No cluster found in ahv account (uuid='{}')".format(account_uuid)
                 )
                 sys.exit(-1)
 
-            res_vm_data = {
-                "instance_name": e_name,
-                "instance_id": e_id,
-                "address": ip_address or e_address,
-                "platform_data": {"resource_group": e_resources["resource_group"]},
-            }
+            # TODO Cluster should be a part of project whitelisted clusters. Change after jira is resolved
+            # Jira: https://jira.nutanix.com/browse/CALM-20205
+            filter_account_uuid = clusters[0]["uuid"]
 
-    # If vm not found raise error
-    if not res_vm_data:
-        LOG.error(
-            "No azure brownfield vm with details (name='{}', address='{}', id='{}') found on account(uuid='{}') and project(uuid='{}')".format(
-                instance_name, ip_address, instance_id, account_uuid, project_uuid
+        params = {
+            "filter": "project_uuid=={};account_uuid=={}".format(
+                project_uuid, filter_account_uuid
             )
-        )
-        sys.exit(-1)
-
-    return res_vm_data
-
-
-def get_vmware_bf_vm_data(
-    project_uuid, account_uuid, instance_name=None, ip_address=[], instance_id=None
+        }
+        entities, err = client.blueprint.brownfield_vms_list_all(params)
+        if err:
+            raise Exception("[{}] - {}".format(err["code"], err["error"]))
+
+        return entities
+
+    def get_candidates(self, instance_name=None, ip_address=[], instance_id=None):
+        """returns vms that may match the instance details, in the order of
+        precedence used by match_vm_data"""
+
+        if instance_id:
+            return self.id_index.get(instance_id, [])
+        elif ip_address:
+            return self.address_index.get(ip_address[0], [])
+        elif instance_name:
+            return self.name_index.get(instance_name, [])
+        return []
+
+
+def get_bf_vm_data(
+    provider_type,
+    project_uuid,
+    account_uuid,
+    instance_name=None,
+    ip_address=[],
+    instance_id=None,
 ):
-    """Return vmware vm data matched with provided instacne details"""
-
-    client = get_api_client()
-
-    params = {
-        "length": 250,
-        "offset": 0,
-        "filter": "project_uuid=={};account_uuid=={}".format(
-            project_uuid, account_uuid
-        ),
-    }
-    res, err = client.blueprint.brownfield_vms(params)
-    if err:
-        raise Exception("[{}] - {}".format(err["code"], err["error"]))
-
-    res = res.json()
-    if not res["metadata"]["total_matches"]:
-        LOG.error(
-            "No vmware brownfield vms found on account(uuid='{}') and project(uuid='{}')".format(
-                account_uuid, project_uuid
-            )
-        )
-        sys.exit(-1)
-
-    res_vm_data = None
-    for entity in res["entities"]:
-        e_resources = entity["status"]["resources"]
-        e_name = e_resources["instance_name"]
-        e_id = e_resources["instance_id"]
-        e_address = e_resources["address"]
-        e_address_list = e_resources["guest.ipAddress"]
-
-        if match_vm_data(
-            vm_name=e_name,
-            vm_address_list=e_address_list,
-            vm_id=e_id,
-            instance_name=instance_name,
-            instance_address=ip_address,
-            instance_id=instance_id,
-        ):
-            if res_vm_data:
-                # If there is an existing vm with provided configuration
-                LOG.error(
-                    "Multiple vms with same name ({}) found".format(instance_name)
-                )
-                sys.exit(-1)
-
-            res_vm_data = {
-                "instance_name": e_name,
-                "instance_id": e_id,
-                "address": ip_address or e_address,
-            }
-
-    # If vm not found raise error
-    if not res_vm_data:
-        LOG.error(
-            "No vmware brownfield vm with details (name='{}', address='{}', id='{}') found on account(uuid='{}') and project(uuid='{}')".format(
-                instance_name, ip_address, instance_id, account_uuid, project_uuid
-            )
-        )
-        sys.exit(-1)
-
-    return res_vm_data
+    """Return vm data matched with provided instance details"""
 
+    if not instance_id:
+        if not (instance_name or ip_address):
+            LOG.error("One of 'instance_name' or 'ip_address' must be given.")
+            sys.exit(-1)
 
-def get_gcp_bf_vm_data(
-    project_uuid, account_uuid, instance_name=None, ip_address=[], instance_id=None
-):
-    """Return gcp vm data matched with provided instacne details"""
-
-    client = get_api_client()
-
-    params = {
-        "length": 250,
-        "offset": 0,
-        "filter": "project_uuid=={};account_uuid=={}".format(
-            project_uuid, account_uuid
-        ),
-    }
-    res, err = client.blueprint.brownfield_vms(params)
-    if err:
-        raise Exception("[{}] - {}".format(err["code"], err["error"]))
-
-    res = res.json()
-    if not res["metadata"]["total_matches"]:
+    provider_name = BF_VM_PROVIDER_ATTRS[provider_type][0]
+    vm_index = BrownfieldVmIndex.get(provider_type, project_uuid, account_uuid)
+    if not vm_index.vms:
         LOG.error(
-            "No gcp brownfield vms found on account(uuid='{}') and project(uuid='{}')".format(
-                account_uuid, project_uuid
+            "No {} brownfield vms found on account(uuid='{}') and project(uuid='{}')".format(
+                provider_name, account_uuid, project_uuid
             )
         )
         sys.exit(-1)
 
     res_vm_data = None
-    for entity in res["entities"]:
-        e_resources = entity["status"]["resources"]
-        e_name = e_resources["instance_name"]
-        e_id = e_resources["id"]
-        e_address = e_resources["address"]
-        e_address_list = e_resources["natIP"]
-
+    candidates = vm_index.get_candidates(
+        instance_name=instance_name, ip_address=ip_address, instance_id=instance_id
+    )
+    for vm in candidates:
         if match_vm_data(
-            vm_name=e_name,
-            vm_address_list=e_address_list,
-            vm_id=e_id,
+            vm_name=vm["instance_name"],
+            vm_address_list=vm["address_list"],
+            vm_id=vm["instance_id"],
             instance_name=instance_name,
             instance_address=ip_address,
             instance_id=instance_id,
@@ -417,16 +227,23 @@ def get_gcp_bf_vm_data(
                 sys.exit(-1)
 
             res_vm_data = {
-                "instance_name": e_name,
-                "instance_id": e_id,
-                "address": ip_address or e_address,
+                "instance_name": vm["instance_name"],
+                "instance_id": vm["instance_id"],
+                "address": ip_address or vm["address"],
             }
+            if "platform_data" in vm:
+                res_vm_data["platform_data"] = vm["platform_data"]
 
     # If vm not found raise error
     if not res_vm_data:
         LOG.error(
-            "No gcp brownfield vm with details (name='{}', address='{}', id='{}') found on account(uuid='{}') and project(uuid='{}')".format(
-                instance_name, ip_address, instance_id, account_uuid, project_uuid
+            "No {} brownfield vm with details (name='{}', address='{}', id='{}') found on account(uuid='{}') and project(uuid='{}')".format(
+                provider_name,
+                instance_name,
+                ip_address,
+                instance_id,
+                account_uuid,
+                project_uuid,
             )
         )
         sys.exit(-1)
@@ -531,52 +348,7 @@ class BrownfiedVmType(EntityType):
 
         project_uuid = project_cache_data.get("uuid")
 
-        if provider_type == "AHV_VM":
-            cdict = get_ahv_bf_vm_data(
-                project_uuid=project_uuid,
-                account_uuid=account_uuid,
-                instance_name=cdict["instance_name"],
-                ip_address=cdict["address"],
-                instance_id=cdict["instance_id"],
-            )
-
-        elif provider_type == "AWS_VM":
-            cdict = get_aws_bf_vm_data(
-                project_uuid=project_uuid,
-                account_uuid=account_uuid,
-                instance_name=cdict["instance_name"],
-                ip_address=cdict["address"],
-                instance_id=cdict["instance_id"],
-            )
-
-        elif provider_type == "AZURE_VM":
-            cdict = get_azure_bf_vm_data(
-                project_uuid=project_uuid,
-                account_uuid=account_uuid,
-                instance_name=cdict["instance_name"],
-                ip_address=cdict["address"],
-                instance_id=cdict["instance_id"],
-            )
-
-        elif provider_type == "VMWARE_VM":
-            cdict = get_vmware_bf_vm_data(
-                project_uuid=project_uuid,
-                account_uuid=account_uuid,
-                instance_name=cdict["instance_name"],
-                ip_address=cdict["address"],
-                instance_id=cdict["instance_id"],
-            )
-
-        elif provider_type == "GCP_VM":
-            cdict = get_gcp_bf_vm_data(
-                project_uuid=project_uuid,
-                account_uuid=account_uuid,
-                instance_name=cdict["instance_name"],
-                ip_address=cdict["address"],
-                instance_id=cdict["instance_id"],
-            )
-
-        else:
+        if provider_type not in BF_VM_PROVIDER_ATTRS:
             LOG.error(
                 "Support for {} provider's brownfield vm not available".format(
                     provider_type
@@ -584,6 +356,15 @@ class BrownfiedVmType(EntityType):
             )
             sys.exit(-1)
 
+        cdict = get_bf_vm_data(
+            provider_type=provider_type,
+            project_uuid=project_uuid,
+            account_uuid=account_uuid,
+            instance_name=cdict["instance_name"],
+            ip_address=cdict["address"],
+            instance_id=cdict["instance_id"],
+        )
+
         return cdict
 
 
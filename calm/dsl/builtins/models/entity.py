@@ -7,9 +7,10 @@ from types import MappingProxyType
 import uuid
 import copy
 import keyword
+import weakref
 
 from ruamel.yaml import YAML, resolver, SafeRepresenter
-from calm.dsl.tools import StrictDraft7Validator
+from calm.dsl.tools import get_validator, profile_span
 from calm.dsl.log import get_logging_handle
 from .schema import get_schema_details
 from .utils import get_valid_identifier
@@ -17,6 +18,13 @@ from .client_attrs import update_dsl_metadata_map, get_dsl_metadata_map
 
 LOG = get_logging_handle(__name__)
 
+# Defaults of these types can not be modified, so are created once and shared
+IMMUTABLE_DEFAULT_TYPES = (type(None), bool, int, float, str)
+
+# Attrs of entity classes merged with the ones of their bases. Cache entry of a
+# class is dropped when an attribute of the class or of its bases is changed
+_MERGED_ATTRS = weakref.WeakKeyDictionary()
+
 
 class EntityDict(OrderedDict):
     @staticmethod
@@ -54,7 +62,7 @@ class EntityDict(OrderedDict):
                 or ("actions" in vdict and isinstance(type(value), DescriptorType))
                 or ("runbook" in vdict and isinstance(type(value), DescriptorType))
             ):
-                LOG.debug("Validating object: {}".format(vdict))
+                LOG.debug("Validating object: %s", vdict)
                 raise
 
             # Validate and set variable/action/runbook
@@ -142,9 +150,13 @@ class EntityType(EntityTypeBase):
 
     @classmethod
     def validate_dict(cls, entity_dict):
-        schema = {"type": "object", "properties": cls.__schema_props__}
+        # Schema is created once per entity type, to reuse its compiled validator
+        schema = cls.__dict__.get("__dict_schema__", None)
+        if schema is None:
+            schema = {"type": "object", "properties": cls.__schema_props__}
+            setattr(cls, "__dict_schema__", schema)
 
-        validator = StrictDraft7Validator(schema)
+        validator = get_validator(schema)
         validator.validate(entity_dict)
 
     @classmethod
@@ -196,11 +208,12 @@ class EntityType(EntityTypeBase):
         openapi_type = getattr(mcls, "__openapi_type__")
         setattr(cls, "__kind__", openapi_type)
 
-        for k, v in cls.get_default_attrs().items():
+        default_attrs = getattr(mcls, "__default_attrs__", {}) or {}
+        for k in default_attrs:
             # Check if attr was set during class creation
             # else - set default value
             if not hasattr(cls, k):
-                setattr(cls, k, v)
+                setattr(cls, k, mcls.get_default_attr(k))
 
         return cls
 
@@ -222,20 +235,34 @@ class EntityType(EntityTypeBase):
         # Set attribute
         super().__setattr__(name, value)
 
+        # Parent is set after every compile, and is not a user attr
+        if name != "__parent__":
+            cls.invalidate_merged_attrs()
+
+    def __delattr__(cls, name):
+
+        super().__delattr__(name)
+        cls.invalidate_merged_attrs()
+
     def __str__(cls):
         return cls.__name__
 
     def __repr__(cls):
         return cls.__name__
 
-    def get_user_attrs(cls):
+    def get_user_attrs(cls, attrs=None):
+        """returns user attrs from given attrs, defaults to attrs of class"""
+
+        if attrs is None:
+            attrs = cls.__dict__
+
         types = EntityTypeBase.get_entity_types()
         ActionType = types.get("Action", None)
         RunbookType = types.get("Runbook", None)
         VariableType = types.get("Variable", None)
         DescriptorType = types.get("Descriptor", None)
         user_attrs = {}
-        for name, value in cls.__dict__.items():
+        for name, value in attrs.items():
             if (
                 name.startswith("__")
                 and name.endswith("__")
@@ -247,13 +274,40 @@ class EntityType(EntityTypeBase):
 
         return user_attrs
 
+    @classmethod
+    def get_shared_defaults(mcls):
+        """returns immutable default attrs, created once per entity type"""
+
+        shared_defaults = mcls.__dict__.get("__shared_defaults__", None)
+        if shared_defaults is None:
+            shared_defaults = {}
+            default_attrs = getattr(mcls, "__default_attrs__", {}) or {}
+            for key, value in default_attrs.items():
+                default = value()
+                if isinstance(default, IMMUTABLE_DEFAULT_TYPES):
+                    shared_defaults[key] = default
+
+            setattr(mcls, "__shared_defaults__", MappingProxyType(shared_defaults))
+
+        return shared_defaults
+
+    @classmethod
+    def get_default_attr(mcls, key):
+        """returns default value of attr"""
+
+        shared_defaults = mcls.get_shared_defaults()
+        if key in shared_defaults:
+            return shared_defaults[key]
+
+        return mcls.__default_attrs__[key]()
+
     @classmethod
     def get_default_attrs(mcls):
         ret = {}
         default_attrs = getattr(mcls, "__default_attrs__", {}) or {}
 
-        for key, value in default_attrs.items():
-            ret[key] = value()
+        for key in default_attrs:
+            ret[key] = mcls.get_default_attr(key)
 
         # return a deepcopy, this dict or it's contents should NEVER be modified
         return ret
@@ -315,18 +369,51 @@ class EntityType(EntityTypeBase):
         for k in del_keys:
             attrs.pop(k)
 
-    def get_all_attrs(cls):
+    def get_merged_attrs(cls):
+        """returns attrs of class merged with the ones of its bases. Attrs are
+        merged once per class, and this dict should NEVER be modified"""
 
-        ncls_ns = cls.get_default_attrs()
+        merged_attrs = _MERGED_ATTRS.get(cls, None)
+        if merged_attrs is not None:
+            return merged_attrs
+
+        class_attrs = {}
         for klass in reversed(cls.mro()):
             if hasattr(klass, "get_user_attrs") and callable(
                 getattr(klass, "get_user_attrs")
             ):
-                ncls_ns = {**ncls_ns, **klass.__dict__}
+                class_attrs.update(klass.__dict__)
+
+        # Defaults are set on class creation, so these are created only if
+        # missing in class dicts. Default attrs are kept first, for ordering
+        merged_attrs = {}
+        default_attrs = getattr(type(cls), "__default_attrs__", {}) or {}
+        for key in default_attrs:
+            if key in class_attrs:
+                merged_attrs[key] = class_attrs[key]
+            else:
+                merged_attrs[key] = type(cls).get_default_attr(key)
+        merged_attrs.update(class_attrs)
 
-        ncls = type(cls)(cls.__name__, cls.__bases__, ncls_ns)
+        _MERGED_ATTRS[cls] = merged_attrs
+        return merged_attrs
+
+    def invalidate_merged_attrs(cls):
+        """drops merged attrs of the class and its subclasses"""
+
+        if not _MERGED_ATTRS:
+            return
 
-        return ncls.get_user_attrs()
+        classes = [cls]
+        while classes:
+            klass = classes.pop()
+            _MERGED_ATTRS.pop(klass, None)
+            classes.extend(type.__subclasses__(klass))
+
+    def get_all_attrs(cls):
+
+        # Attrs are already validated, so no new class is created for them
+        return cls.get_user_attrs(cls.get_merged_attrs())
 
     def get_not_required_if_none_attrs(cls):
         not_required_attrs = []
@@ -341,12 +428,9 @@ class EntityType(EntityTypeBase):
     def clone(cls):
         """returns the clone (deepcopy) of the original class"""
 
-        ncls_ns = cls.get_default_attrs()
-        for klass in reversed(cls.mro()):
-            if hasattr(klass, "get_user_attrs") and callable(
-                getattr(klass, "get_user_attrs")
-            ):
-                ncls_ns = {**ncls_ns, **klass.__dict__}
+        ncls_ns = dict(cls.get_merged_attrs())
+        if hasattr(cls, "__parent__"):
+            ncls_ns["__parent__"] = getattr(cls, "__parent__")
 
         for k, v in ncls_ns.items():
             if isinstance(v, list):
@@ -615,7 +699,8 @@ class EntityType(EntityTypeBase):
         return _cls
 
     def get_dict(cls):
-        return json.loads(cls.json_dumps())
+        with profile_span("serialize", str(cls)):
+            return json.loads(cls.json_dumps())
 
 
 class Entity(metaclass=EntityType):
@@ -629,7 +714,9 @@ class EntityJSONEncoder(JSONEncoder):
             return super().default(cls)
 
         # Add single function(wrapper) that can contain pre-post checks
-        return cls.generate_payload()
+        entity_name = getattr(cls, "name", "") or cls.__name__
+        with profile_span("compile", "{} {}".format(cls.__schema_name__, entity_name)):
+            return cls.generate_payload()
 
 
 class EntityJSONDecoder(JSONDecoder):
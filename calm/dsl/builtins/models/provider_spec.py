@@ -8,6 +8,7 @@ from calm.dsl.builtins import file_exists
 from .entity import EntityType
 from .validator import PropertyValidator
 from calm.dsl.log import get_logging_handle
+from calm.dsl.tools import profile_span
 
 LOG = get_logging_handle(__name__)
 
@@ -25,7 +26,8 @@ class _ProviderSpec(metaclass=ProviderSpecType):
     def __validate__(self, provider_type):
 
         Provider = get_provider(provider_type)
-        Provider.validate_spec(self.spec)
+        with profile_span("provider", "validate {}".format(provider_type)):
+            Provider.validate_spec(self.spec)
 
         return self.spec
 
@@ -52,8 +54,9 @@ def read_spec(filename, depth=1):
         LOG.debug("file {} not found at location {}".format(filename, file_path))
         raise ValueError("file {} not found".format(filename))
 
-    with open(file_path, "r") as f:
-        spec = yaml.safe_load(f.read())
+    with profile_span("file", filename):
+        with open(file_path, "r") as f:
+            spec = yaml.safe_load(f.read())
 
     return spec
 
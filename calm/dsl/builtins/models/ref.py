@@ -20,10 +20,10 @@ class RefType(EntityType):
 
         return cdict
 
-    def get_user_attrs(cls):
+    def get_user_attrs(cls, attrs=None):
         """returns user attrs for ref class"""
 
-        attrs = super().get_user_attrs()
+        attrs = super().get_user_attrs(attrs)
         attrs.pop("__self__", None)  # Not a user attr for reference object
 
         return attrs
@@ -1,6 +1,9 @@
 """ Schema should be according to OpenAPI 3 format with x-calm-dsl-type extension"""
 
+import os
 import json
+import pickle
+import hashlib
 from copy import deepcopy
 from io import StringIO
 from distutils.version import LooseVersion as LV
@@ -12,20 +15,117 @@ from bidict import bidict
 
 from .validator import get_property_validators
 from calm.dsl.store import Version
+from calm.dsl.config import get_context
 from calm.dsl.log import get_logging_handle
 
 
 LOG = get_logging_handle(__name__)
 _SCHEMAS = None
 
+# Resolved schemas are stored in this file alongside the dsl db
+SCHEMA_SNAPSHOT_FILE = "dsl_schemas.pickle"
+
 
 def _get_all_schemas():
     global _SCHEMAS
     if not _SCHEMAS:
-        _SCHEMAS = _load_all_schemas()
+        signature = _get_schema_templates_signature()
+        _SCHEMAS = _load_schema_snapshot(signature)
+        if not _SCHEMAS:
+            _SCHEMAS = _resolve_schema_refs(_load_all_schemas())
+            _save_schema_snapshot(signature, _SCHEMAS)
     return _SCHEMAS
 
 
+def _get_schema_templates_signature():
+    """returns signature of schema templates. It changes whenever
+    templates are modified i.e. on package upgrade or local edits"""
+
+    schema_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "schemas")
+    template_stats = []
+    for file_name in sorted(os.listdir(schema_dir)):
+        file_stat = os.stat(os.path.join(schema_dir, file_name))
+        template_stats.append(
+            "{}:{}:{}".format(file_name, file_stat.st_size, file_stat.st_mtime_ns)
+        )
+
+    return hashlib.sha1("\n".join(template_stats).encode("utf-8")).hexdigest()
+
+
+def _get_schema_snapshot_location():
+    """returns location of resolved schemas snapshot"""
+
+    ContextObj = get_context()
+    init_obj = ContextObj.get_init_config()
+    db_location = init_obj["DB"]["location"]
+    return os.path.join(os.path.dirname(db_location), SCHEMA_SNAPSHOT_FILE)
+
+
+def _load_schema_snapshot(signature):
+    """returns resolved schemas from snapshot if it matches signature, else None"""
+
+    try:
+        with open(_get_schema_snapshot_location(), "rb") as fd:
+            snapshot = pickle.load(fd)
+    except Exception as exp:
+        LOG.debug("Unable to load schema snapshot: {}".format(exp))
+        return None
+
+    if not isinstance(snapshot, dict) or snapshot.get("signature") != signature:
+        LOG.debug("Schema snapshot is stale")
+        return None
+
+    return snapshot.get("schemas")
+
+
+def _save_schema_snapshot(signature, schemas):
+    """stores resolved schemas to snapshot file. Failures are ignored"""
+
+    try:
+        snapshot_location = _get_schema_snapshot_location()
+
+        # Write to a temporary file first, so that parallel runs never read partial files
+        tmp_location = "{}.{}".format(snapshot_location, os.getpid())
+        with open(tmp_location, "wb") as fd:
+            pickle.dump(
+                {"signature": signature, "schemas": schemas},
+                fd,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(tmp_location, snapshot_location)
+
+    except Exception as exp:
+        LOG.debug("Unable to save schema snapshot: {}".format(exp))
+
+
+def _resolve_schema_refs(obj, resolved=None):
+    """returns copy of obj with all json references replaced by plain objects.
+    Objects shared by multiple references stay shared in the copy"""
+
+    if resolved is None:
+        resolved = {}
+
+    if isinstance(obj, jsonref.JsonRef):
+        obj = obj.__subject__
+
+    if id(obj) in resolved:
+        return resolved[id(obj)]
+
+    if isinstance(obj, dict):
+        res = resolved[id(obj)] = {}
+        for key, value in obj.items():
+            res[key] = _resolve_schema_refs(value, resolved)
+        return res
+
+    elif isinstance(obj, list):
+        res = resolved[id(obj)] = []
+        for value in obj:
+            res.append(_resolve_schema_refs(value, resolved))
+        return res
+
+    return obj
+
+
 def _load_all_schemas(schema_file="main.yaml.jinja2"):
 
     loader = PackageLoader(__name__, "schemas")
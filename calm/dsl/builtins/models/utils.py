@@ -7,6 +7,7 @@ from ruamel import yaml
 import re
 from calm.dsl.log import get_logging_handle
 from calm.dsl.config import get_context
+from calm.dsl.tools import profile_span
 
 LOG = get_logging_handle(__name__)
 
@@ -27,8 +28,9 @@ def read_file(filename, depth=1):
         LOG.debug("file {} not found at location {}".format(filename, file_path))
         raise ValueError("file {} not found".format(filename))
 
-    with open(file_path, "r") as data:
-        return data.read()
+    with profile_span("file", filename):
+        with open(file_path, "r") as data:
+            return data.read()
 
 
 def _get_caller_filepath(filename, depth=2):
@@ -1,9 +1,11 @@
+import sys
 import click
 
 from calm.dsl.api import get_api_client
 
 from .main import main, get, describe, delete, run, watch, download, create, update
-from .utils import Display, FeatureFlagGroup
+from .utils import Display, FeatureFlagGroup, get_args_from_stdin
+from .constants import POLL
 from .apps import (
     get_apps,
     describe_app,
@@ -11,6 +13,7 @@ from .apps import (
     run_patches,
     watch_patch_or_action,
     watch_app,
+    watch_apps,
     delete_app,
     download_runlog,
     create_app,
@@ -217,13 +220,56 @@ def _watch_app(app_name, poll_interval):
     """Watch an app"""
 
     def display_action(screen):
-        watch_app(app_name, screen)
+        watch_app(app_name, screen, poll_interval=poll_interval)
         screen.wait_for_input(10.0)
 
     Display.wrapper(display_action, watch=True)
     LOG.info("Action runs completed for app {}".format(app_name))
 
 
+@watch.command("apps")
+@click.argument("app_names", nargs=-1, required=True)
+@click.option(
+    "--poll-interval",
+    "poll_interval",
+    "-p",
+    type=int,
+    default=10,
+    show_default=True,
+    help="Maximum polling interval per app",
+)
+@click.option(
+    "--concurrency",
+    "-c",
+    type=int,
+    default=POLL.MAX_WORKERS,
+    show_default=True,
+    help="Maximum number of parallel polls",
+)
+@click.option(
+    "--timeout",
+    "-t",
+    type=int,
+    default=None,
+    help="Stop watching after given seconds",
+)
+def _watch_apps(app_names, poll_interval, concurrency, timeout):
+    """Watch action runs of multiple apps. Use '-' to read app names from stdin"""
+
+    app_names = get_args_from_stdin(app_names)
+    failed_apps = watch_apps(
+        app_names,
+        poll_interval=poll_interval,
+        max_workers=concurrency,
+        max_wait=timeout,
+    )
+    if failed_apps:
+        LOG.error("Action runs did not succeed for apps: {}".format(failed_apps))
+        sys.exit(-1)
+
+    LOG.info("Action runs completed for apps {}".format(app_names))
+
+
 @download.command("action_runlog")
 @click.argument("runlog_uuid")
 @click.option(
@@ -14,8 +14,15 @@ from anytree import NodeMixin, RenderTree
 from calm.dsl.api import get_api_client
 from calm.dsl.config import get_context
 
-from .utils import get_name_query, get_states_filter, highlight_text, Display
-from .constants import APPLICATION, RUNLOG, SYSTEM_ACTIONS
+from .utils import (
+    get_name_query,
+    get_states_filter,
+    highlight_text,
+    show_entity_names,
+    Display,
+)
+from .constants import APPLICATION, RUNLOG, SYSTEM_ACTIONS, POLL
+from .polling import poll_until_complete, WatchTarget, MultiWatcher
 from .bps import (
     launch_blueprint_simple,
     compile_blueprint,
@@ -46,7 +53,9 @@ def get_apps(name, filter_by, limit, offset, quiet, all_items, out):
     if filter_query:
         params["filter"] = filter_query
 
-    res, err = client.application.list(params=params)
+    # Only names are printed in quiet mode, so response is streamed
+    stream = quiet and out != "json"
+    res, err = client.application.list(params=params, stream=stream)
 
     if err:
         ContextObj = get_context()
@@ -56,6 +65,10 @@ def get_apps(name, filter_by, limit, offset, quiet, all_items, out):
         LOG.warning("Cannot fetch applications from {}".format(pc_ip))
         return
 
+    if stream:
+        show_entity_names(res, limit, "application")
+        return
+
     res = res.json()
     total_matches = res["metadata"]["total_matches"]
     if total_matches > limit:
@@ -610,13 +623,75 @@ def watch_app(app_name, screen, app=None, poll_interval=10):
             if not is_app_describe:
                 screen.print_at(msg, 0, line)
                 screen.refresh()
-                time.sleep(10)
             return (is_complete, msg)
         return (False, "")
 
     poll_runnnable(poll_func, is_complete, poll_interval=poll_interval)
 
 
+def get_app_watch_status(response):
+    """returns (state, completed, failed) of an app using its runlogs"""
+
+    entities = response["entities"]
+    if not entities:
+        return ("PENDING", False, False)
+
+    states = [runlog["status"]["state"] for runlog in entities]
+    action_states = [
+        runlog["status"]["state"]
+        for runlog in entities
+        if runlog["status"]["type"] == "action_runlog"
+    ]
+    completed = all(state in RUNLOG.TERMINAL_STATES for state in states)
+    failed = any(state in RUNLOG.FAILURE_STATES for state in states)
+
+    if not completed:
+        completed_actions = sum(
+            1 for state in action_states if state in RUNLOG.TERMINAL_STATES
+        )
+        state = "{} ({}/{} actions)".format(
+            RUNLOG.STATUS.RUNNING, completed_actions, len(action_states)
+        )
+    elif failed:
+        state = RUNLOG.STATUS.FAILURE
+    else:
+        state = RUNLOG.STATUS.SUCCESS
+
+    return (state, completed, failed)
+
+
+def watch_apps(
+    app_names, poll_interval=10, max_workers=POLL.MAX_WORKERS, max_wait=None
+):
+    """Watch action runs of multiple apps. Returns names of apps that did not succeed"""
+
+    client = get_api_client()
+    max_workers = min(max_workers, client.connection._pool_maxsize)
+
+    targets = []
+    for app_name in app_names:
+        app = _get_app(client, app_name)
+        app_id = app["metadata"]["uuid"]
+        url = client.application.ITEM.format(app_id) + "/app_runlogs/list"
+        payload = {
+            "filter": "application_reference=={};(type==action_runlog,type==audit_runlog,type==ngt_runlog,type==clone_action_runlog)".format(
+                app_id
+            )
+        }
+
+        def poll_func(url=url, payload=payload):
+            return client.application.poll_action_run(url, payload)
+
+        targets.append(
+            WatchTarget(
+                app_name, poll_func, get_app_watch_status, poll_interval=poll_interval
+            )
+        )
+
+    watcher = MultiWatcher(targets, max_workers=max_workers, max_wait=max_wait)
+    return [target.name for target in watcher.run()]
+
+
 def delete_app(app_names, soft=False):
     client = get_api_client()
 
@@ -1528,21 +1603,11 @@ def run_actions(
 
 
 def poll_runnnable(poll_func, completion_func, poll_interval=10):
-    # Poll every 10 seconds on the app status, for 5 mins
+    # Poll on the app status, backing off up to poll_interval, for 5 mins
     maxWait = 5 * 60
-    count = 0
-    while count < maxWait:
-        # call status api
-        res, err = poll_func()
-        if err:
-            raise Exception("[{}] - {}".format(err["code"], err["error"]))
-        response = res.json()
-        (completed, msg) = completion_func(response)
-        if completed:
-            # click.echo(msg)
-            break
-        count += poll_interval
-        time.sleep(poll_interval)
+    poll_until_complete(
+        poll_func, completion_func, poll_interval=poll_interval, max_wait=maxWait
+    )
 
 
 def download_runlog(runlog_id, app_name, file_name):
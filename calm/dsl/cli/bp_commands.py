@@ -18,6 +18,7 @@ from .bps import (
     patch_bp_if_required,
     delete_blueprint,
     decompile_bp,
+    decompile_bps,
     create_blueprint_from_json,
     create_blueprint_from_dsl,
 )
@@ -130,9 +131,30 @@ def _format_blueprint_command(bp_file):
     default="json",
     help="output format",
 )
-def _compile_blueprint_command(bp_file, brownfield_deployment_file, out):
+@click.option(
+    "--profile",
+    "profile",
+    is_flag=True,
+    default=False,
+    help="Print timing tree of compile steps to stderr",
+)
+@click.option(
+    "--profile_trace",
+    "profile_trace",
+    type=click.Path(file_okay=True, dir_okay=False, writable=True),
+    help="Path of file to write timings of compile steps as chrome trace",
+)
+def _compile_blueprint_command(
+    bp_file, brownfield_deployment_file, out, profile, profile_trace
+):
     """Compiles a DSL (Python) blueprint into JSON or YAML"""
-    compile_blueprint_command(bp_file, brownfield_deployment_file, out)
+    compile_blueprint_command(
+        bp_file,
+        brownfield_deployment_file,
+        out,
+        profile=profile,
+        profile_trace=profile_trace,
+    )
 
 
 @decompile.command("bp", experimental=True)
@@ -170,6 +192,48 @@ def _decompile_bp(name, bp_file, with_secrets, prefix, bp_dir):
     decompile_bp(name, bp_file, with_secrets, prefix, bp_dir)
 
 
+@decompile.command("bps", experimental=True)
+@click.option("--name", "-n", default=None, help="Search for blueprints by name")
+@click.option(
+    "--filter", "filter_by", "-f", default=None, help="Filter blueprints by this string"
+)
+@click.option(
+    "--project", "-p", "project_name", default=None, help="Project of blueprints"
+)
+@click.option(
+    "--dir",
+    "-d",
+    "export_dir",
+    default=None,
+    help="Directory location used for placing decompiled blueprints",
+)
+@click.option(
+    "--workers",
+    "-w",
+    type=int,
+    default=None,
+    help="Number of processes decompiling blueprints (default: cpu count)",
+)
+@click.option(
+    "--force",
+    is_flag=True,
+    default=False,
+    help="Decompile blueprints even if they are not updated since last export",
+)
+def _decompile_bps(name, filter_by, project_name, export_dir, workers, force):
+    """Decompiles all blueprints matching the filters, each to its own directory.
+    Blueprints not updated since the last export to the directory are skipped"""
+
+    decompile_bps(
+        name=name,
+        filter_by=filter_by,
+        project_name=project_name,
+        export_dir=export_dir,
+        workers=workers,
+        force=force,
+    )
+
+
 @create.command("bp")
 @click.option(
     "--file",
@@ -6,6 +6,8 @@ import os
 import uuid
 from pprint import pprint
 import pathlib
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 
 from ruamel import yaml
 import arrow
@@ -32,22 +34,31 @@ from calm.dsl.api import get_api_client
 from calm.dsl.store import Cache
 from calm.dsl.decompile.decompile_render import create_bp_dir
 from calm.dsl.decompile.file_handler import get_bp_dir
+from calm.dsl.decompile import init_decompile_context
 
 from .utils import (
     get_name_query,
     get_states_filter,
     highlight_text,
     import_var_from_file,
+    show_entity_names,
+    show_profile,
 )
-from .secrets import find_secret, create_secret
-from .constants import BLUEPRINT
+from .secrets import find_secrets, create_secret
+from .constants import BLUEPRINT, DECOMPILE
 from .environments import get_project_environment
-from calm.dsl.tools import get_module_from_file
+from calm.dsl.tools import (
+    get_module_from_file,
+    profile_span,
+    start_profiling,
+    stop_profiling,
+)
 from calm.dsl.builtins import Brownfield as BF
+from calm.dsl.builtins.models.brownfield import BrownfieldVmIndex
 from calm.dsl.providers import get_provider
 from calm.dsl.providers.plugins.ahv_vm.main import AhvNew
 from calm.dsl.constants import CACHE
-from calm.dsl.log import get_logging_handle
+from calm.dsl.log import CustomLogging, get_logging_handle
 from calm.dsl.builtins.models.calm_ref import Ref
 
 LOG = get_logging_handle(__name__)
@@ -72,7 +83,9 @@ def get_blueprint_list(name, filter_by, limit, offset, quiet, all_items, out):
     if filter_query:
         params["filter"] = filter_query
 
-    res, err = client.blueprint.list(params=params)
+    # Only names are printed in quiet mode, so response is streamed
+    stream = quiet and out != "json"
+    res, err = client.blueprint.list(params=params, stream=stream)
 
     if err:
         context = get_context()
@@ -82,6 +95,10 @@ def get_blueprint_list(name, filter_by, limit, offset, quiet, all_items, out):
         LOG.warning("Cannot fetch blueprints from {}".format(pc_ip))
         return
 
+    if stream:
+        show_entity_names(res, limit, "blueprint")
+        return
+
     res = res.json()
     total_matches = res["metadata"]["total_matches"]
     if total_matches > limit:
@@ -284,17 +301,23 @@ def get_brownfield_deployment_classes(brownfield_deployment_file=None):
 
 def compile_blueprint(bp_file, brownfield_deployment_file=None):
 
+    # Brownfield vms are listed afresh for every compile
+    BrownfieldVmIndex.reset()
+
     # Constructing metadata payload
     # Note: This should be constructed before loading bp module. As metadata will be used while getting bp_payload
-    metadata_payload = get_metadata_payload(bp_file)
+    with profile_span("phase", "metadata"):
+        metadata_payload = get_metadata_payload(bp_file)
 
-    user_bp_module = get_blueprint_module_from_file(bp_file)
+    with profile_span("phase", "import"):
+        user_bp_module = get_blueprint_module_from_file(bp_file)
     UserBlueprint = get_blueprint_class_from_module(user_bp_module)
     if UserBlueprint is None:
         return None
 
     # Fetching bf_deployments
-    bf_deployments = get_brownfield_deployment_classes(brownfield_deployment_file)
+    with profile_span("phase", "brownfield import"):
+        bf_deployments = get_brownfield_deployment_classes(brownfield_deployment_file)
     if bf_deployments:
         bf_dep_map = {bd.__name__: bd for bd in bf_deployments}
         for pf in UserBlueprint.profiles:
@@ -313,6 +336,15 @@ def compile_blueprint(bp_file, brownfield_deployment_file=None):
                     # Replacing new deployment in profile.deployments
                     pf.deployments[ind] = bf_dep
 
+    with profile_span("phase", "payload"):
+        bp_payload = get_blueprint_payload(UserBlueprint, metadata_payload)
+
+    return bp_payload
+
+
+def get_blueprint_payload(UserBlueprint, metadata_payload):
+    """returns payload of compiled blueprint class"""
+
     ContextObj = get_context()
     project_config = ContextObj.get_project_config()
 
@@ -356,14 +388,21 @@ def create_blueprint(
     bp_payload.pop("status", None)
 
     credential_list = bp_payload["spec"]["resources"]["credential_definition_list"]
+
+    # Secrets used by credentials are read from local store together
+    secret_values = find_secrets(
+        [
+            cred["secret"]["secret"]
+            for cred in credential_list
+            if cred["secret"].get("secret", None)
+        ]
+    )
     for cred in credential_list:
         if cred["secret"].get("secret", None):
             secret = cred["secret"].pop("secret")
 
-            try:
-                value = find_secret(secret)
-
-            except ValueError:
+            value = secret_values.get(secret)
+            if value is None:
                 click.echo(
                     "\nNo secret corresponding to '{}' found !!!\n".format(secret)
                 )
@@ -375,6 +414,7 @@ def create_blueprint(
                 )
                 if choice[0] == "y":
                     create_secret(secret, value)
+                secret_values[secret] = value
 
             cred["secret"]["value"] = value
 
@@ -529,6 +569,19 @@ def decompile_bp_from_file(filename, with_secrets=False, prefix="", bp_dir=None)
 def _decompile_bp(bp_payload, with_secrets=False, prefix="", bp_dir=None):
     """decompiles the blueprint from payload"""
 
+    _create_bp_dir_from_payload(
+        bp_payload, with_secrets=with_secrets, prefix=prefix, bp_dir=bp_dir
+    )
+    click.echo(
+        "\nSuccessfully decompiled. Directory location: {}. Blueprint location: {}".format(
+            get_bp_dir(), os.path.join(get_bp_dir(), "blueprint.py")
+        )
+    )
+
+
+def _create_bp_dir_from_payload(bp_payload, with_secrets=False, prefix="", bp_dir=None):
+    """creates blueprint directory by decompiling the blueprint payload"""
+
     blueprint = bp_payload["spec"]["resources"]
     blueprint_name = bp_payload["spec"].get("name", "DslBlueprint")
     blueprint_description = bp_payload["spec"].get("description", "")
@@ -570,18 +623,247 @@ def _decompile_bp(bp_payload, with_secrets=False, prefix="", bp_dir=None):
         metadata_obj=metadata_obj,
         bp_dir=bp_dir,
     )
-    click.echo(
-        "\nSuccessfully decompiled. Directory location: {}. Blueprint location: {}".format(
-            get_bp_dir(), os.path.join(get_bp_dir(), "blueprint.py")
+
+
+def _get_bp_export_payload(client, bp_uuid):
+    """returns the blueprint payload used for decompiling it"""
+
+    res, err = client.blueprint.export_file(bp_uuid)
+    if err:
+        raise Exception("[{}] - {}".format(err["code"], err["error"]))
+
+    return res.json()
+
+
+def _init_decompile_worker(config_file, verbose_level):
+    """initializes dsl context of process decompiling blueprints"""
+
+    CustomLogging.set_verbose_level(verbose_level)
+    if config_file:
+        ContextObj = get_context()
+        ContextObj.update_config_file_context(config_file=config_file)
+
+
+def _decompile_bp_in_worker(bp_payload, bp_dir):
+    """decompiles the blueprint payload to bp_dir in worker process"""
+
+    # Worker decompiles many blueprints, so state of last one is cleared
+    init_decompile_context()
+    init_dsl_metadata_map({})
+
+    try:
+        _create_bp_dir_from_payload(bp_payload, bp_dir=bp_dir)
+    except SystemExit as exp:
+        # Decompile helpers exit on unsupported data, that fails only this blueprint
+        raise Exception("Decompile exited with code {}".format(exp.code))
+
+
+def _load_export_state(export_dir):
+    """returns {bp_uuid: {name, dir, last_update_time}} of last export"""
+
+    try:
+        with open(os.path.join(export_dir, DECOMPILE.STATE_FILE)) as fd:
+            return json.load(fd)
+    except Exception as exp:
+        LOG.debug("Unable to read export state: {}".format(exp))
+        return {}
+
+
+def _save_export_state(export_dir, state):
+
+    state_file = os.path.join(export_dir, DECOMPILE.STATE_FILE)
+
+    # Write to a temporary file first, so that interrupted runs never leave partial files
+    tmp_file = "{}.{}".format(state_file, os.getpid())
+    with open(tmp_file, "w") as fd:
+        json.dump(state, fd, indent=4, sort_keys=True)
+    os.replace(tmp_file, state_file)
+
+
+def decompile_bps(
+    name=None,
+    filter_by=None,
+    project_name=None,
+    export_dir=None,
+    workers=None,
+    force=False,
+):
+    """decompiles all blueprints matching the filters, each to its own directory
+    in export_dir. Blueprints not updated since last export are skipped"""
+
+    client = get_api_client()
+    export_dir = os.path.abspath(export_dir or os.getcwd())
+    workers = workers or os.cpu_count() or 1
+
+    filter_query = ""
+    if name:
+        filter_query = get_name_query([name])
+    if filter_by:
+        filter_query = filter_query + ";(" + filter_by + ")"
+    if project_name:
+        project_cache_data = Cache.get_entity_data(
+            entity_type=CACHE.ENTITY.PROJECT, name=project_name
+        )
+        if not project_cache_data:
+            LOG.error(
+                "Project {} not found. Please run: calm update cache".format(
+                    project_name
+                )
+            )
+            sys.exit(-1)
+        filter_query += ";project_reference=={}".format(project_cache_data["uuid"])
+    if filter_query.startswith(";"):
+        filter_query = filter_query[1:]
+
+    start_time = time.time()
+    base_params = {"filter": filter_query} if filter_query else {}
+    entities = client.blueprint.list_all(
+        base_params=base_params,
+        fields=["status.name", "metadata.uuid", "metadata.last_update_time"],
+    )
+
+    if not os.path.isdir(export_dir):
+        os.makedirs(export_dir)
+
+    # Results of this run are merged into state of earlier exports
+    state = _load_export_state(export_dir)
+
+    # Directories claimed by exported blueprints, new blueprint with same name gets suffix
+    dir_owners = {entry["dir"]: bp_uuid for bp_uuid, entry in state.items()}
+    pending_bps = []
+    skipped = 0
+    for entity in entities:
+        bp_uuid = entity["metadata"]["uuid"]
+        bp_name = entity["status"]["name"]
+        last_update_time = entity["metadata"].get("last_update_time")
+
+        dir_name = get_valid_identifier(bp_name)
+        if dir_owners.get(dir_name, bp_uuid) != bp_uuid:
+            dir_name = "{}_{}".format(dir_name, bp_uuid[:8])
+        dir_owners[dir_name] = bp_uuid
+
+        last_export = state.get(bp_uuid, {})
+        if (
+            not force
+            and last_export.get("dir") == dir_name
+            and last_export.get("last_update_time") == last_update_time
+            and os.path.isdir(os.path.join(export_dir, dir_name))
+        ):
+            skipped += 1
+            continue
+
+        pending_bps.append(
+            {
+                "uuid": bp_uuid,
+                "name": bp_name,
+                "dir": dir_name,
+                "last_update_time": last_update_time,
+            }
+        )
+
+    LOG.info(
+        "Exporting {} blueprints, skipping {} unchanged".format(
+            len(pending_bps), skipped
         )
     )
 
+    failed_bps = []
+    fetch_workers = min(DECOMPILE.MAX_FETCH_WORKERS, client.connection._pool_maxsize)
+    ContextObj = get_context()
+
+    # State of exported blueprints is saved even if the run is interrupted
+    try:
+        # Fresh worker processes are used, as decompile keeps its state in module globals
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_decompile_worker,
+            initargs=(ContextObj._CONFIG_FILE, CustomLogging._VERBOSE_LEVEL),
+        ) as decompile_executor, ThreadPoolExecutor(
+            max_workers=max(1, fetch_workers)
+        ) as fetch_executor:
+
+            fetch_futures = {
+                fetch_executor.submit(_get_bp_export_payload, client, bp["uuid"]): bp
+                for bp in pending_bps
+            }
+
+            # Blueprints are decompiled as soon as their payload is fetched
+            decompile_futures = {}
+            for future in as_completed(fetch_futures):
+                bp = fetch_futures[future]
+                try:
+                    bp_payload = future.result()
+                except (Exception, SystemExit) as exp:
+                    LOG.error(
+                        "Failed to fetch blueprint {}: {}".format(bp["name"], exp)
+                    )
+                    failed_bps.append(bp["name"])
+                    continue
+
+                decompile_futures[
+                    decompile_executor.submit(
+                        _decompile_bp_in_worker,
+                        bp_payload,
+                        os.path.join(export_dir, bp["dir"]),
+                    )
+                ] = bp
+
+            for future in as_completed(decompile_futures):
+                bp = decompile_futures[future]
+                try:
+                    future.result()
+                except (Exception, SystemExit) as exp:
+                    LOG.error(
+                        "Failed to decompile blueprint {}: {}".format(bp["name"], exp)
+                    )
+                    failed_bps.append(bp["name"])
+                    continue
+
+                state[bp["uuid"]] = {
+                    "name": bp["name"],
+                    "dir": bp["dir"],
+                    "last_update_time": bp["last_update_time"],
+                }
 
-def compile_blueprint_command(bp_file, brownfield_deployment_file, out):
+    finally:
+        _save_export_state(export_dir, state)
 
-    bp_payload = compile_blueprint(
-        bp_file, brownfield_deployment_file=brownfield_deployment_file
+    total_time = time.time() - start_time
+    exported = len(pending_bps) - len(failed_bps)
+    click.echo(
+        "\nExported {} blueprints to {} in {:.2f}s ({:.2f} blueprints/s). Skipped {} unchanged, {} failed".format(
+            highlight_text(exported),
+            highlight_text(export_dir),
+            total_time,
+            exported / total_time if total_time else 0,
+            highlight_text(skipped),
+            highlight_text(len(failed_bps)),
+        )
     )
+
+    if failed_bps:
+        LOG.error("Failed blueprints: {}".format(", ".join(failed_bps)))
+        sys.exit(-1)
+
+
+def compile_blueprint_command(
+    bp_file, brownfield_deployment_file, out, profile=False, profile_trace=None
+):
+
+    profiler = None
+    if profile or profile_trace:
+        profiler = start_profiling()
+
+    try:
+        with profile_span("phase", "compile {}".format(bp_file)):
+            bp_payload = compile_blueprint(
+                bp_file, brownfield_deployment_file=brownfield_deployment_file
+            )
+    finally:
+        if profiler:
+            stop_profiling()
+
     if bp_payload is None:
         LOG.error("User blueprint not found in {}".format(bp_file))
         return
@@ -605,6 +887,9 @@ def compile_blueprint_command(bp_file, brownfield_deployment_file, out):
     else:
         LOG.error("Unknown output format {} given".format(out))
 
+    if profiler:
+        show_profile(profiler, trace_file=profile_trace)
+
 
 def format_blueprint_command(bp_file):
     path = pathlib.Path(bp_file)
@@ -1328,6 +1613,7 @@ def launch_blueprint_simple(
                 ContextObj.update_project_context(project_name=project_name)
 
         bf_deployments = get_brownfield_deployment_classes(brownfield_deployment_file)
+        BrownfieldVmIndex.reset()
 
         bp_profile_data = {}
         for _profile in bp_status_data["resources"]["app_profile_list"]:
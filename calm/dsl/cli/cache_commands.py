@@ -47,13 +47,29 @@ def clear_cache():
     help="Cache entity, if not given will update whole cache",
     type=click.Choice(get_cache_table_types()),
 )
-def update_cache(entity):
+@click.option(
+    "--timings",
+    "-t",
+    is_flag=True,
+    default=False,
+    help="Display time taken to update each cache table",
+)
+@click.option(
+    "--incremental",
+    "-i",
+    is_flag=True,
+    default=False,
+    help="Fetch only entities updated since last cache update, wherever supported",
+)
+def update_cache(entity, timings, incremental):
     """Update the data for dynamic entities stored in the cache"""
 
     if entity:
         Cache.sync_table(entity)
         Cache.show_table(entity)
     else:
-        Cache.sync()
+        sync_results = Cache.sync(incremental=incremental)
         Cache.show_data()
+        if timings:
+            Cache.show_sync_timings(sync_results)
     LOG.info(highlight_text("Cache updated at {}".format(datetime.datetime.now())))
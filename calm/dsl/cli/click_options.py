@@ -2,6 +2,7 @@ import click
 
 from calm.dsl.config import get_context
 from calm.dsl.log import CustomLogging
+from calm.dsl.log.structured import LOG_FORMATS
 
 
 def simple_verbosity_option(logging_mod=None, *names, **kwargs):
@@ -18,6 +19,8 @@ def simple_verbosity_option(logging_mod=None, *names, **kwargs):
         raise TypeError("Logging object should be instance of CustomLogging.")
 
     log_level = "INFO"
+    log_format = "text"
+    log_file = None
     try:
         ContextObj = get_context()
         log_config = ContextObj.get_log_config()
@@ -25,6 +28,9 @@ def simple_verbosity_option(logging_mod=None, *names, **kwargs):
         if "level" in log_config:
             log_level = log_config.get("level") or log_level
 
+        log_format = log_config.get("format") or log_format
+        log_file = log_config.get("file") or None
+
     except (FileNotFoundError, ValueError):
         # At the time of initializing dsl, config file may not be present or incorrect
         pass
@@ -35,6 +41,11 @@ def simple_verbosity_option(logging_mod=None, *names, **kwargs):
             "Invalid log level in config. Select from {}".format(logging_levels)
         )
 
+    if log_format not in LOG_FORMATS:
+        raise ValueError(
+            "Invalid log format in config. Select from {}".format(LOG_FORMATS)
+        )
+
     log_level = logging_levels.index(log_level) + 1
     kwargs.setdefault("default", log_level)
     kwargs.setdefault("expose_value", False)
@@ -54,6 +65,9 @@ def simple_verbosity_option(logging_mod=None, *names, **kwargs):
             x = getattr(logging_mod, log_level, None)
             CustomLogging.set_verbose_level(x)
 
+            if log_format == "json":
+                CustomLogging.enable_structured_logging(log_file)
+
         return click.option(*names, callback=_set_level, **kwargs)(f)
 
     return decorator
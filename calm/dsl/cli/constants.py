@@ -42,6 +42,21 @@ class RUNLOG:
     ]
 
 
+class POLL:
+    """Intervals (in seconds) used while watching runlogs"""
+
+    MIN_INTERVAL = 1
+    MAX_INTERVAL = 10
+    BACKOFF = 1.5
+    JITTER = 0.1
+
+    # Upper bound on parallel polls while watching multiple entities
+    MAX_WORKERS = 8
+
+    # Consecutive failed polls after which a watched entity is marked failed
+    MAX_ERRORS = 5
+
+
 class JOBS:
     class STATES:
         ACTIVE = "ACTIVE"
@@ -90,6 +105,16 @@ class BLUEPRINT:
         ERROR = "ERROR"
 
 
+class DECOMPILE:
+    """Defaults used while decompiling multiple blueprints"""
+
+    # Upper bound on blueprints fetched in parallel from server
+    MAX_FETCH_WORKERS = 8
+
+    # File in export directory storing last update time of exported blueprints
+    STATE_FILE = ".export_state.json"
+
+
 class APPLICATION:
     class STATES:
         PROVISIONING = "provisioning"
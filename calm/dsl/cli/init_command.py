@@ -20,6 +20,7 @@ from calm.dsl.providers import get_provider_types
 
 from .main import init, set
 from calm.dsl.log import get_logging_handle
+from calm.dsl.log.structured import LOG_FORMATS
 
 LOG = get_logging_handle(__name__)
 
@@ -165,6 +166,8 @@ def set_server_details(
     retries_enabled = default_connection_config["retries_enabled"]
     connection_timeout = default_connection_config["connection_timeout"]
     read_timeout = default_connection_config["read_timeout"]
+    response_cache_enabled = default_connection_config["response_cache_enabled"]
+    response_cache_size = default_connection_config["response_cache_size"]
 
     # Do not prompt for init config variables, Take default values for init.ini file
     config_file = config_file or get_default_config_file()
@@ -209,6 +212,8 @@ def set_server_details(
         retries_enabled=retries_enabled,
         connection_timeout=connection_timeout,
         read_timeout=read_timeout,
+        response_cache_enabled=response_cache_enabled,
+        response_cache_size=response_cache_size,
     )
 
     # Updating context for using latest config data
@@ -335,6 +340,18 @@ def init_dsl_runbook(runbook_name, dir_name):
     help="Path to local directory for storing secrets",
 )
 @click.option("--log_level", "-l", default=None, help="Default log level")
+@click.option(
+    "--log_format",
+    default=None,
+    type=click.Choice(LOG_FORMATS),
+    help="Format of logs, json logs are written by a background writer",
+)
+@click.option(
+    "--log_file",
+    default=None,
+    type=click.Path(file_okay=True, dir_okay=False, writable=True),
+    help="Path of file to write json logs to, stderr by default",
+)
 @click.option(
     "--retries-enabled/--retries-disabled",
     "-re/-rd",
@@ -353,6 +370,16 @@ def init_dsl_runbook(runbook_name, dir_name):
     type=int,
     help="read timeout",
 )
+@click.option(
+    "--response-cache-enabled/--response-cache-disabled",
+    default=None,
+    help="Response cache for read calls enabled/disabled",
+)
+@click.option(
+    "--response-cache-size",
+    type=int,
+    help="Maximum size of response cache in MiB",
+)
 @click.argument("config_file", required=False)
 def _set_config(
     host,
@@ -367,6 +394,10 @@ def _set_config(
     retries_enabled,
     connection_timeout,
     read_timeout,
+    response_cache_enabled,
+    response_cache_size,
+    log_format,
+    log_file,
 ):
     """writes the configuration to config files i.e. config.ini and init.ini
 
@@ -415,6 +446,8 @@ def _set_config(
 
     log_config = ContextObj.get_log_config()
     log_level = log_level or log_config.get("level") or "INFO"
+    log_format = log_format or log_config.get("format")
+    log_file = log_file or log_config.get("file")
 
     # Take init_configuration from user params or init file
     init_config = ContextObj.get_init_config()
@@ -430,6 +463,11 @@ def _set_config(
         retries_enabled = connection_config["retries_enabled"]
     connection_timeout = connection_timeout or connection_config["connection_timeout"]
     read_timeout = read_timeout or connection_config["read_timeout"]
+    if response_cache_enabled is None:
+        response_cache_enabled = connection_config["response_cache_enabled"]
+    response_cache_size = (
+        response_cache_size or connection_config["response_cache_size"]
+    )
 
     # Set the dsl configuration
     set_dsl_config(
@@ -445,6 +483,10 @@ def _set_config(
         retries_enabled=retries_enabled,
         connection_timeout=connection_timeout,
         read_timeout=read_timeout,
+        response_cache_enabled=response_cache_enabled,
+        response_cache_size=response_cache_size,
+        log_format=log_format,
+        log_file=log_file,
     )
     LOG.info("Configuration changed successfully")
 
@@ -0,0 +1,271 @@
+"""Maps cli commands to the modules registering them, so that command modules
+are imported only when one of their commands is used.
+
+LAZY_COMMAND_MAP must be regenerated using generate_lazy_command_map() whenever
+commands are added or moved.
+"""
+
+import importlib
+
+
+# Modules registering commands to the groups of main module
+COMMAND_MODULES = [
+    "bp_commands",
+    "app_commands",
+    "runbook_commands",
+    "library_tasks_commands",
+    "endpoint_commands",
+    "config_commands",
+    "account_commands",
+    "project_commands",
+    "secret_commands",
+    "cache_commands",
+    "completion_commands",
+    "init_command",
+    "marketplace_bp_commands",
+    "marketplace_item_commands",
+    "marketplace_runbook_commands",
+    "app_icon_commands",
+    "user_commands",
+    "group_commands",
+    "role_commands",
+    "directory_service_commands",
+    "acp_commands",
+    "task_commands",
+    "brownfield_commands",
+    "environment_commands",
+    "protection_policy_commands",
+    "vm_recovery_point_commands",
+    "scheduler_commands",
+    "network_group_commands",
+]
+
+# {group path: {subcommand name: [command modules]}}, "" being the root group
+LAZY_COMMAND_MAP = {
+    "": {
+        "restart": ["app_commands"],
+        "start": ["app_commands"],
+        "stop": ["app_commands"],
+    },
+    "abort": {"runbook_execution": ["runbook_commands"]},
+    "approve": {
+        "marketplace": ["marketplace_bp_commands", "marketplace_runbook_commands"]
+    },
+    "clear": {"cache": ["cache_commands"], "secrets": ["secret_commands"]},
+    "compile": {
+        "bp": ["bp_commands"],
+        "endpoint": ["endpoint_commands"],
+        "environment": ["environment_commands"],
+        "project": ["project_commands"],
+        "runbook": ["runbook_commands"],
+    },
+    "completion": {"install": ["completion_commands"], "show": ["completion_commands"]},
+    "create": {
+        "acp": ["acp_commands"],
+        "app": ["app_commands"],
+        "app_icon": ["app_icon_commands"],
+        "bp": ["bp_commands"],
+        "endpoint": ["endpoint_commands"],
+        "environment": ["environment_commands"],
+        "group": ["group_commands"],
+        "job": ["scheduler_commands"],
+        "library": ["library_tasks_commands"],
+        "network-group-tunnel": ["network_group_commands"],
+        "project": ["project_commands"],
+        "runbook": ["runbook_commands"],
+        "secret": ["secret_commands"],
+        "user": ["user_commands"],
+    },
+    "decompile": {
+        "bp": ["bp_commands"],
+        "bps": ["bp_commands"],
+        "marketplace": ["marketplace_bp_commands"],
+    },
+    "delete": {
+        "account": ["account_commands"],
+        "acp": ["acp_commands"],
+        "app": ["app_commands"],
+        "app_icon": ["app_icon_commands"],
+        "bp": ["bp_commands"],
+        "endpoint": ["endpoint_commands"],
+        "environment": ["environment_commands"],
+        "group": ["group_commands"],
+        "job": ["scheduler_commands"],
+        "library": ["library_tasks_commands"],
+        "marketplace": ["marketplace_bp_commands", "marketplace_runbook_commands"],
+        "network-group-tunnel": ["network_group_commands"],
+        "project": ["project_commands"],
+        "runbook": ["runbook_commands"],
+        "secret": ["secret_commands"],
+        "user": ["user_commands"],
+    },
+    "describe": {
+        "account": ["account_commands"],
+        "acp": ["acp_commands"],
+        "app": ["app_commands"],
+        "bp": ["bp_commands"],
+        "endpoint": ["endpoint_commands"],
+        "job": ["scheduler_commands"],
+        "library": ["library_tasks_commands"],
+        "marketplace": [
+            "marketplace_bp_commands",
+            "marketplace_item_commands",
+            "marketplace_runbook_commands",
+        ],
+        "network-group": ["network_group_commands"],
+        "network-group-tunnel": ["network_group_commands"],
+        "project": ["project_commands"],
+        "runbook": ["runbook_commands"],
+    },
+    "download": {"action_runlog": ["app_commands"]},
+    "format": {
+        "bp": ["bp_commands"],
+        "endpoint": ["endpoint_commands"],
+        "runbook": ["runbook_commands"],
+    },
+    "get": {
+        "accounts": ["account_commands"],
+        "acps": ["acp_commands"],
+        "app_icons": ["app_icon_commands"],
+        "apps": ["app_commands"],
+        "bps": ["bp_commands"],
+        "brownfield": ["brownfield_commands"],
+        "directory_services": ["directory_service_commands"],
+        "endpoints": ["endpoint_commands"],
+        "environments": ["environment_commands"],
+        "groups": ["group_commands"],
+        "job_instances": ["scheduler_commands"],
+        "jobs": ["scheduler_commands"],
+        "library": ["library_tasks_commands"],
+        "marketplace": [
+            "marketplace_bp_commands",
+            "marketplace_item_commands",
+            "marketplace_runbook_commands",
+        ],
+        "network-group-tunnels": ["network_group_commands"],
+        "network-groups": ["network_group_commands"],
+        "projects": ["project_commands"],
+        "protection-policies": ["protection_policy_commands"],
+        "roles": ["role_commands"],
+        "runbook_executions": ["runbook_commands"],
+        "runbooks": ["runbook_commands"],
+        "secrets": ["secret_commands"],
+        "users": ["user_commands"],
+        "vm-recovery-points": ["vm_recovery_point_commands"],
+    },
+    "import": {"library": ["library_tasks_commands"]},
+    "init": {
+        "bp": ["init_command"],
+        "dsl": ["init_command"],
+        "runbook": ["init_command"],
+    },
+    "launch": {
+        "bp": ["bp_commands"],
+        "marketplace": ["marketplace_bp_commands", "marketplace_item_commands"],
+    },
+    "pause": {"runbook_execution": ["runbook_commands"]},
+    "publish": {
+        "bp": ["marketplace_bp_commands"],
+        "marketplace": ["marketplace_bp_commands", "marketplace_runbook_commands"],
+        "runbook": ["marketplace_runbook_commands"],
+    },
+    "reject": {
+        "marketplace": ["marketplace_bp_commands", "marketplace_runbook_commands"]
+    },
+    "reset": {"network-group-tunnel-vm": ["network_group_commands"]},
+    "resume": {"runbook_execution": ["runbook_commands"]},
+    "run": {
+        "action": ["app_commands"],
+        "marketplace": ["marketplace_item_commands", "marketplace_runbook_commands"],
+        "runbook": ["runbook_commands"],
+    },
+    "set": {"config": ["init_command"]},
+    "show": {"cache": ["cache_commands"], "config": ["config_commands"]},
+    "sync": {"account": ["account_commands"]},
+    "unpublish": {
+        "marketplace": ["marketplace_bp_commands", "marketplace_item_commands"]
+    },
+    "update": {
+        "acp": ["acp_commands"],
+        "app": ["app_commands"],
+        "cache": ["cache_commands"],
+        "environment": ["environment_commands"],
+        "marketplace": ["marketplace_bp_commands", "marketplace_runbook_commands"],
+        "project": ["project_commands"],
+        "runbook": ["runbook_commands"],
+        "secret": ["secret_commands"],
+    },
+    "watch": {
+        "action_runlog": ["app_commands"],
+        "app": ["app_commands"],
+        "apps": ["app_commands"],
+        "runbook_execution": ["runbook_commands"],
+        "runbook_executions": ["runbook_commands"],
+        "task": ["task_commands"],
+    },
+}
+
+
+def load_command_modules(modules=None):
+    """imports given command modules, all of them if modules is None"""
+
+    if modules is None:
+        modules = COMMAND_MODULES
+
+    for module in modules:
+        importlib.import_module("{}.{}".format(__package__, module))
+
+
+def get_command_modules(group_path, cmd_name):
+    """returns command modules registering cmd_name subcommand of group"""
+
+    return LAZY_COMMAND_MAP.get(group_path, {}).get(cmd_name, [])
+
+
+def _get_command_tree_modules(cmd):
+    """returns command modules registering cmd and its subcommands.
+    Subcommands of lazy groups are skipped, as those groups load them"""
+
+    from .utils import LazyCommandsMixin
+
+    modules = set()
+    callback = getattr(cmd, "callback", None)
+    if callback:
+        module = callback.__module__.rsplit(".", 1)[-1]
+        if module in COMMAND_MODULES:
+            modules.add(module)
+
+    if not isinstance(cmd, LazyCommandsMixin):
+        for sub_cmd in getattr(cmd, "commands", {}).values():
+            modules |= _get_command_tree_modules(sub_cmd)
+
+    return modules
+
+
+def generate_lazy_command_map():
+    """returns LAZY_COMMAND_MAP built from the fully loaded command tree"""
+
+    from .main import main
+    from .utils import LazyCommandsMixin
+
+    load_command_modules()
+
+    lazy_groups = [("", main)]
+    for cmd_name, cmd in main.commands.items():
+        if isinstance(cmd, LazyCommandsMixin):
+            lazy_groups.append((cmd_name, cmd))
+
+    command_map = {}
+    for group_path, group in lazy_groups:
+        group_map = {}
+        for cmd_name, cmd in group.commands.items():
+            modules = _get_command_tree_modules(cmd)
+            if modules:
+                group_map[cmd_name] = sorted(
+                    modules, key=lambda module: COMMAND_MODULES.index(module)
+                )
+
+        if group_map:
+            command_map[group_path] = dict(sorted(group_map.items()))
+
+    return command_map
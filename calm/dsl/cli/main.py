@@ -5,19 +5,28 @@ import copy
 
 import click_completion
 import click_completion.core
-from click_repl import repl
 from prettytable import PrettyTable
 
 # TODO - move providers to separate file
 from calm.dsl.providers import get_provider, get_provider_types
-from calm.dsl.api import get_api_client, get_resource_api
+from calm.dsl.api import (
+    get_api_client,
+    get_resource_api,
+    ConnectionMetrics,
+    add_metrics_hook,
+)
 from calm.dsl.log import get_logging_handle
 from calm.dsl.config import get_context
 from calm.dsl.store import Cache
 
 from .version_validator import validate_version
 from .click_options import simple_verbosity_option, show_trace_option
-from .utils import FeatureFlagGroup, highlight_text
+from .utils import (
+    FeatureFlagGroup,
+    LazyFeatureFlagGroup,
+    highlight_text,
+    show_connection_stats,
+)
 
 CONTEXT_SETTINGS = dict(help_option_names=["-h", "--help"])
 
@@ -25,7 +34,7 @@ click_completion.init()
 LOG = get_logging_handle(__name__)
 
 
-@click.group(cls=FeatureFlagGroup, context_settings=CONTEXT_SETTINGS)
+@click.group(cls=LazyFeatureFlagGroup, context_settings=CONTEXT_SETTINGS)
 @simple_verbosity_option(LOG)
 @show_trace_option(LOG)
 @click.option(
@@ -44,9 +53,23 @@ LOG = get_logging_handle(__name__)
     default=False,
     help="Update cache before running command",
 )
+@click.option(
+    "--stats",
+    "stats",
+    is_flag=True,
+    default=False,
+    help="Print stats of server calls made by command at exit",
+)
+@click.option(
+    "--stats_file",
+    "stats_file",
+    default=None,
+    type=click.Path(file_okay=True, dir_okay=False, writable=True),
+    help="Path of file to write stats of server calls as json",
+)
 @click.version_option("3.6.1")
 @click.pass_context
-def main(ctx, config_file, sync):
+def main(ctx, config_file, sync, stats, stats_file):
     """Calm CLI
 
     \b
@@ -67,6 +90,15 @@ def main(ctx, config_file, sync):
       calm create endpoint -f sample_ep.py --name Sample-Endpoint -> Upload a new endpoint from a python DSL file"""
     ctx.ensure_object(dict)
     ctx.obj["verbose"] = True
+    if stats or stats_file:
+        metrics = ConnectionMetrics()
+        add_metrics_hook(metrics)
+        ctx.call_on_close(
+            lambda: show_connection_stats(
+                metrics.get_summary(), print_summary=stats, stats_file=stats_file
+            )
+        )
+
     try:
         validate_version()
     except Exception:
@@ -79,7 +111,7 @@ def main(ctx, config_file, sync):
         Cache.sync()
 
 
-@main.group(cls=FeatureFlagGroup)
+@main.group(cls=LazyFeatureFlagGroup)
 def validate():
     """Validate provider specs"""
     pass
@@ -118,13 +150,13 @@ def validate_provider_spec(spec_file, provider_type):
         raise Exception(ee.message)
 
 
-@main.group(cls=FeatureFlagGroup)
+@main.group(cls=LazyFeatureFlagGroup)
 def get():
     """Get various things like blueprints, apps: `get apps`, `get bps`, `get endpoints` and `get runbooks` are the primary ones."""
     pass
 
 
-@main.group(cls=FeatureFlagGroup)
+@main.group(cls=LazyFeatureFlagGroup)
 @click.pass_context
 def show(ctx):
     """Shows the cached data(Dynamic data) etc."""
@@ -236,13 +268,13 @@ def show_all_commands(ctx):
     click.echo(table)
 
 
-@main.group(cls=FeatureFlagGroup)
+@main.group(cls=LazyFeatureFlagGroup)
 def clear():
     """Clear the data stored in local db: cache, secrets etc."""
     pass
 
 
-@main.group(cls=FeatureFlagGroup)
+@main.group(cls=LazyFeatureFlagGroup)
 def init():
     """Initializes the dsl for basic configs and bp directory etc."""
     pass
@@ -284,103 +316,103 @@ def get_server_status():
         LOG.info("PC Version: {}".format(pc_version))
 
 
-@main.group(cls=FeatureFlagGroup)
+@main.group(cls=LazyFeatureFlagGroup)
 def format():
     """Format blueprint using black"""
     pass
 
 
-@main.group(cls=FeatureFlagGroup)
+@main.group(cls=LazyFeatureFlagGroup)
 def compile():
     """Compile blueprint to json / yaml"""
     pass
 
 
-@main.group(cls=FeatureFlagGroup)
+@main.group(cls=LazyFeatureFlagGroup)
 def decompile():
     """ """
     pass
 
 
-@main.group(cls=FeatureFlagGroup)
+@main.group(cls=LazyFeatureFlagGroup)
 def create():
     """Create entities in Calm (blueprint, project, endpoint, runbook)"""
     pass
 
 
-@main.group(cls=FeatureFlagGroup)
+@main.group(cls=LazyFeatureFlagGroup)
 def delete():
     """Delete entities"""
     pass
 
 
-@main.group(cls=FeatureFlagGroup)
+@main.group(cls=LazyFeatureFlagGroup)
 def launch():
     """Launch blueprints to create Apps"""
     pass
 
 
-@main.group(cls=FeatureFlagGroup)
+@main.group(cls=LazyFeatureFlagGroup)
 def publish():
     """Publish blueprints to marketplace"""
     pass
 
 
-@main.group(cls=FeatureFlagGroup)
+@main.group(cls=LazyFeatureFlagGroup)
 def approve():
     """Approve blueprints in marketplace manager"""
     pass
 
 
-@main.group(cls=FeatureFlagGroup)
+@main.group(cls=LazyFeatureFlagGroup)
 def unpublish():
     """Unpublish blueprints from marketplace"""
     pass
 
 
-@main.group(cls=FeatureFlagGroup)
+@main.group(cls=LazyFeatureFlagGroup)
 def reject():
     """Reject blueprints from marketplace manager"""
     pass
 
 
-@main.group(cls=FeatureFlagGroup)
+@main.group(cls=LazyFeatureFlagGroup)
 def describe():
     """Describe apps, blueprints, projects, accounts, endpoints, runbooks"""
     pass
 
 
-@main.group(cls=FeatureFlagGroup)
+@main.group(cls=LazyFeatureFlagGroup)
 def run():
     """Run actions in an app or runbooks"""
     pass
 
 
-@main.group(cls=FeatureFlagGroup)
+@main.group(cls=LazyFeatureFlagGroup)
 def watch():
     """Track actions running on apps or runbook executions"""
     pass
 
 
-@main.group(cls=FeatureFlagGroup)
+@main.group(cls=LazyFeatureFlagGroup)
 def pause():
     """Pause running runbook executions"""
     pass
 
 
-@main.group(cls=FeatureFlagGroup)
+@main.group(cls=LazyFeatureFlagGroup)
 def resume():
     """resume paused runbook executions"""
     pass
 
 
-@main.group(cls=FeatureFlagGroup)
+@main.group(cls=LazyFeatureFlagGroup)
 def abort():
     """Abort runbook executions"""
     pass
 
 
-@main.group(cls=FeatureFlagGroup)
+@main.group(cls=LazyFeatureFlagGroup)
 def reset():
     """Reset entity"""
 
@@ -401,13 +433,13 @@ def create_provider_spec(provider_type):
     Provider.create_spec()
 
 
-@main.group(cls=FeatureFlagGroup)
+@main.group(cls=LazyFeatureFlagGroup)
 def update():
     """Update entities"""
     pass
 
 
-@main.group(cls=FeatureFlagGroup)
+@main.group(cls=LazyFeatureFlagGroup)
 def download():
     """Download entities"""
     pass
@@ -424,7 +456,7 @@ Default type: auto
 )
 
 
-@main.group(cls=FeatureFlagGroup, help=completion_cmd_help)
+@main.group(cls=LazyFeatureFlagGroup, help=completion_cmd_help)
 def completion():
     pass
 
@@ -448,16 +480,19 @@ def calmrepl():
       :exit, :q, :quit  exits the repl
 
       :?, :h, :help     displays general help information"""
+
+    from click_repl import repl
+
     repl(click.get_current_context())
 
 
-@main.group(cls=FeatureFlagGroup)
+@main.group(cls=LazyFeatureFlagGroup)
 def set():
     """Sets the entities"""
     pass
 
 
-@main.group("import", cls=FeatureFlagGroup)
+@main.group("import", cls=LazyFeatureFlagGroup)
 def calm_import():
     """Import entities in Calm (task library)"""
     pass
@@ -493,7 +528,7 @@ def library_delete():
     pass
 
 
-@main.group(cls=FeatureFlagGroup)
+@main.group(cls=LazyFeatureFlagGroup)
 def sync():
     """Sync platform account"""
     pass
@@ -0,0 +1,242 @@
+import sys
+import time
+import json
+import random
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+import click
+from prettytable import PrettyTable
+
+from calm.dsl.log import get_logging_handle
+
+from .constants import POLL
+
+LOG = get_logging_handle(__name__)
+
+
+class PollScheduler:
+    """Schedules polls with exponential backoff and jitter.
+
+    Delay starts at min_interval and grows by backoff factor up to max_interval
+    while polled state stays the same. It resets to min_interval whenever the
+    state changes. Jitter keeps parallel watchers from polling in lockstep.
+    """
+
+    def __init__(
+        self,
+        min_interval=POLL.MIN_INTERVAL,
+        max_interval=POLL.MAX_INTERVAL,
+        backoff=POLL.BACKOFF,
+        jitter=POLL.JITTER,
+        max_wait=None,
+    ):
+        self.max_interval = max_interval
+        self.min_interval = min(min_interval, max_interval)
+        self.backoff = backoff
+        self.jitter = jitter
+        self.max_wait = max_wait
+        self.interval = self.min_interval
+        self.start_time = time.time()
+        self.last_state = None
+
+    def update(self, state):
+        """updates schedule using latest polled state. Returns True if state changed"""
+
+        changed = state != self.last_state
+        self.last_state = state
+
+        if changed:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.interval * self.backoff, self.max_interval)
+
+        return changed
+
+    def next_delay(self):
+        """returns delay before next poll"""
+
+        spread = self.interval * self.jitter
+        return max(0, self.interval + random.uniform(-spread, spread))
+
+    def is_expired(self):
+        """returns True if max_wait time has passed since start"""
+
+        if self.max_wait is None:
+            return False
+
+        return time.time() - self.start_time >= self.max_wait
+
+    def wait(self):
+        delay = self.next_delay()
+        LOG.debug("Next poll in {:.2f}s".format(delay))
+        time.sleep(delay)
+
+
+def get_response_state(response):
+    """returns fingerprint of polled response, used to detect state changes"""
+
+    entities = response.get("entities", response)
+    data = json.dumps(entities, sort_keys=True)
+    return hashlib.sha1(data.encode("utf-8")).hexdigest()
+
+
+def poll_until_complete(
+    poll_func, completion_func, poll_interval=POLL.MAX_INTERVAL, max_wait=None, **kwargs
+):
+    """polls using poll_func till completion_func marks response as completed.
+
+    completion_func (which renders the response) is called only if response
+    changed since last poll, or poll_interval has passed since its last call.
+    Returns (completed, msg) of last completion_func call, (False, "") on timeout.
+    """
+
+    scheduler = PollScheduler(max_interval=poll_interval, max_wait=max_wait)
+    last_check_time = None
+    while True:
+        res, err = poll_func()
+        if err:
+            raise Exception("[{}] - {}".format(err["code"], err["error"]))
+        response = res.json()
+
+        changed = scheduler.update(get_response_state(response))
+        if (
+            changed
+            or last_check_time is None
+            or time.time() - last_check_time >= poll_interval
+        ):
+            (completed, msg) = completion_func(response, **kwargs)
+            last_check_time = time.time()
+            if completed:
+                return (completed, msg)
+
+        if scheduler.is_expired():
+            return (False, "")
+
+        scheduler.wait()
+
+
+class WatchTarget:
+    """Entity tracked by MultiWatcher.
+
+    status_func receives polled response and returns (state, completed, failed)
+    """
+
+    def __init__(
+        self,
+        name,
+        poll_func,
+        status_func,
+        poll_interval=POLL.MAX_INTERVAL,
+        max_errors=POLL.MAX_ERRORS,
+    ):
+        self.name = name
+        self.poll_func = poll_func
+        self.status_func = status_func
+        self.scheduler = PollScheduler(max_interval=poll_interval)
+        self.state = "-"
+        self.completed = False
+        self.failed = False
+        self.next_poll_time = 0
+        self.last_change_time = time.time()
+        self.max_errors = max_errors
+        self.errors = 0
+
+    def poll(self):
+        """polls the entity once. Returns True if its state changed.
+
+        Failed polls are retried with backoff, target is marked failed only
+        after max_errors consecutive failures"""
+
+        try:
+            res, err = self.poll_func()
+            if err:
+                raise Exception("[{}] - {}".format(err["code"], err["error"]))
+            response = res.json()
+
+        except Exception as exp:
+            LOG.debug("Failed to poll {}: {}".format(self.name, exp))
+            self.errors += 1
+            state = "ERROR ({}/{}): {}".format(self.errors, self.max_errors, exp)
+            if self.errors >= self.max_errors:
+                self.completed, self.failed = True, True
+
+            # Last polled state is kept, so that poll interval grows
+            self.scheduler.update(self.scheduler.last_state)
+
+        else:
+            self.errors = 0
+            self.scheduler.update(get_response_state(response))
+            state, self.completed, self.failed = self.status_func(response)
+
+        changed = state != self.state
+        if changed:
+            self.state = state
+            self.last_change_time = time.time()
+
+        self.next_poll_time = time.time() + self.scheduler.next_delay()
+        return changed
+
+
+class MultiWatcher:
+    """Watches multiple entities from a single process.
+
+    Polls of all targets share the api client connection pool, and at most
+    max_workers polls run in parallel. Each target backs off independently.
+    """
+
+    def __init__(self, targets, max_workers=POLL.MAX_WORKERS, max_wait=None):
+        self.targets = targets
+        self.max_workers = max(1, min(max_workers, len(targets) or 1))
+        self.max_wait = max_wait
+        self.start_time = time.time()
+
+    def is_expired(self):
+        if self.max_wait is None:
+            return False
+
+        return time.time() - self.start_time >= self.max_wait
+
+    def render(self):
+        """prints status table of targets"""
+
+        table = PrettyTable()
+        table.field_names = ["NAME", "STATE", "LAST CHANGE (s)"]
+        now = time.time()
+        for target in self.targets:
+            state = target.state
+            if target.completed:
+                state = click.style(state, fg="red" if target.failed else "green")
+
+            table.add_row(
+                [target.name, state, "{:.0f}".format(now - target.last_change_time)]
+            )
+        table.align["NAME"] = "l"
+
+        if sys.stdout.isatty():
+            click.clear()
+        click.echo(table)
+
+    def run(self):
+        """watches targets till all of them complete or max_wait passes.
+        Returns list of targets that did not succeed"""
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while not self.is_expired():
+                pending = [target for target in self.targets if not target.completed]
+                if not pending:
+                    break
+
+                now = time.time()
+                due = [target for target in pending if target.next_poll_time <= now]
+                if not due:
+                    time.sleep(min(target.next_poll_time for target in pending) - now)
+                    continue
+
+                changes = list(executor.map(lambda target: target.poll(), due))
+                if any(changes):
+                    self.render()
+
+        return [
+            target for target in self.targets if target.failed or not target.completed
+        ]
@@ -1,3 +1,4 @@
+import sys
 import click
 
 from calm.dsl.log import get_logging_handle
@@ -27,10 +28,13 @@ from .runbooks import (
     format_runbook_command,
     compile_runbook_command,
     watch_runbook_execution,
+    watch_runbook_executions,
     resume_runbook_execution,
     pause_runbook_execution,
     abort_runbook_execution,
 )
+from .utils import get_args_from_stdin
+from .constants import POLL
 
 LOG = get_logging_handle(__name__)
 
@@ -239,6 +243,49 @@ def _watch_runbook_execution(runlog_uuid):
     watch_runbook_execution(runlog_uuid)
 
 
+@watch.command("runbook_executions", feature_min_version="3.0.0", experimental=True)
+@click.argument("runlog_uuids", nargs=-1, required=True)
+@click.option(
+    "--poll-interval",
+    "poll_interval",
+    "-p",
+    type=int,
+    default=10,
+    show_default=True,
+    help="Maximum polling interval per runbook execution",
+)
+@click.option(
+    "--concurrency",
+    "-c",
+    type=int,
+    default=POLL.MAX_WORKERS,
+    show_default=True,
+    help="Maximum number of parallel polls",
+)
+@click.option(
+    "--timeout",
+    "-t",
+    type=int,
+    default=None,
+    help="Stop watching after given seconds",
+)
+def _watch_runbook_executions(runlog_uuids, poll_interval, concurrency, timeout):
+    """Watch multiple runbook executions using runlog UUIDs. Use '-' to read UUIDs from stdin"""
+
+    runlog_uuids = get_args_from_stdin(runlog_uuids)
+    failed_runlogs = watch_runbook_executions(
+        runlog_uuids,
+        poll_interval=poll_interval,
+        max_workers=concurrency,
+        max_wait=timeout,
+    )
+    if failed_runlogs:
+        LOG.error("Runbook executions did not succeed: {}".format(failed_runlogs))
+        sys.exit(-1)
+
+    LOG.info("Runbook executions completed")
+
+
 @pause.command("runbook_execution", feature_min_version="3.0.0", experimental=True)
 @click.argument("runlog_uuid", required=True)
 def _pause_runbook_execution(runlog_uuid):
@@ -25,8 +25,9 @@ from .utils import (
     get_states_filter,
     import_var_from_file,
 )
-from .constants import RUNBOOK, RUNLOG
+from .constants import RUNBOOK, RUNLOG, POLL
 from .runlog import get_completion_func, get_runlog_status
+from .polling import poll_until_complete, WatchTarget, MultiWatcher
 from .endpoints import get_endpoint
 
 from anytree import NodeMixin, RenderTree
@@ -698,6 +699,44 @@ def watch_runbook_execution(runlog_uuid):
     Display.wrapper(render_runbook_execution, True)
 
 
+def get_runbook_execution_watch_status(response):
+    """returns (state, completed, failed) of a runbook execution"""
+
+    state = response["status"]["state"]
+    return (
+        state,
+        state in RUNLOG.TERMINAL_STATES,
+        state in RUNLOG.FAILURE_STATES,
+    )
+
+
+def watch_runbook_executions(
+    runlog_uuids, poll_interval=10, max_workers=POLL.MAX_WORKERS, max_wait=None
+):
+    """Watch multiple runbook executions. Returns runlog uuids that did not succeed"""
+
+    client = get_api_client()
+    max_workers = min(max_workers, client.connection._pool_maxsize)
+
+    targets = []
+    for runlog_uuid in runlog_uuids:
+
+        def poll_func(runlog_uuid=runlog_uuid):
+            return client.runbook.poll_action_run(runlog_uuid)
+
+        targets.append(
+            WatchTarget(
+                runlog_uuid,
+                poll_func,
+                get_runbook_execution_watch_status,
+                poll_interval=poll_interval,
+            )
+        )
+
+    watcher = MultiWatcher(targets, max_workers=max_workers, max_wait=max_wait)
+    return [target.name for target in watcher.run()]
+
+
 def watch_runbook(runlog_uuid, runbook, screen, poll_interval=10, input_data={}):
 
     client = get_api_client()
@@ -920,23 +959,17 @@ def abort_runbook_execution(runlog_uuid):
 
 
 def poll_action(poll_func, completion_func, poll_interval=10, **kwargs):
-    # Poll every 10 seconds on the runlog status, for 10 mins
+    # Poll on the runlog status, backing off up to poll_interval, for 10 mins
     maxWait = 10 * 60
-    count = 0
-    while count < maxWait:
-        # call status api
-        res, err = poll_func()
-        if err:
-            raise Exception("[{}] - {}".format(err["code"], err["error"]))
-        response = res.json()
-        (completed, msg) = completion_func(response, **kwargs)
-        if completed:
-            # click.echo(msg)
-            if msg:
-                return False
-            break
-        count += poll_interval
-        time.sleep(poll_interval)
+    (completed, msg) = poll_until_complete(
+        poll_func,
+        completion_func,
+        poll_interval=poll_interval,
+        max_wait=maxWait,
+        **kwargs,
+    )
+    if completed and msg:
+        return False
     return True
 
 
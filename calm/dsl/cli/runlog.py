@@ -18,14 +18,17 @@ from asciimatics.exceptions import StopApplication
 import time
 from time import sleep
 from datetime import timedelta
-import itertools
+from concurrent.futures import ThreadPoolExecutor
 
-from anytree import NodeMixin, RenderTree
+from anytree import NodeMixin, PreOrderIter, RenderTree
 import datetime
 
 from .constants import RUNLOG, SINGLE_INPUT
 from calm.dsl.api import get_api_client
 
+# Upper bound on parallel task runlog output requests
+RUNLOG_OUTPUT_MAX_WORKERS = 8
+
 
 def parse_machine_name(runlog_id, machine_name):
     if not machine_name:
@@ -184,38 +187,60 @@ class ConfirmFrame(Frame):
         raise StopApplication("User requested exit")
 
 
-def displayRunLogTree(screen, root, completed_tasks, total_tasks, msg=None):
-    screen.clear()
-    if total_tasks:
-        progress = "{0:.2f}".format(completed_tasks / total_tasks * 100)
-        screen.print_at("Progress: {}%".format(progress), 0, 0)
+class RunlogOutputCache:
+    """Caches outputs of task runlogs of a runbook execution.
+    Outputs of tasks in terminal state don't change, so they are fetched
+    only once. Outputs of running tasks are fetched concurrently on every call"""
 
-    runlog_state = root.children[0].runlog["status"]["state"]
-    colour = 3  # yellow for pending state
-    if runlog_state == RUNLOG.STATUS.SUCCESS:
-        colour = 2  # green for success
-    elif runlog_state in RUNLOG.FAILURE_STATES:
-        colour = 1  # red for failure
-    elif runlog_state == RUNLOG.STATUS.RUNNING:
-        colour = 4  # blue for running state
-    elif runlog_state == RUNLOG.STATUS.INPUT:
-        colour = 6  # cyan for input state
+    def __init__(self, client, runlog_uuid, max_workers=RUNLOG_OUTPUT_MAX_WORKERS):
+        self.client = client
+        self.runlog_uuid = runlog_uuid
+        self.max_workers = max_workers
+        self.outputs = {}
 
-    screen.print_at(
-        runlog_state,
-        screen.width - len(runlog_state) - 5 if hasattr(screen, "width") else 0,
-        0,
-        colour=colour,
-        attr=Screen.A_UNDERLINE,
-    )
-    line = 1
-    for pre, fill, node in RenderTree(root):
-        line = displayRunLog(screen, node, pre, fill, line)
-    if msg:
-        screen.print_at(msg, 0, line, colour=6)
-    line = line + 1
-    screen.refresh()
-    return line
+    def fetch_output(self, task_runlog_uuid):
+        """returns output of task runlog, None if there is no output"""
+
+        res, err = self.client.runbook.runlog_output(self.runlog_uuid, task_runlog_uuid)
+        if err:
+            raise Exception("\n[{}] - {}".format(err["code"], err["error"]))
+
+        output_list = res.json()["status"]["output_list"]
+        if len(output_list) > 0:
+            return output_list[0]["output"]
+
+        return None
+
+    def get_outputs(self, task_runlogs):
+        """returns map of task runlog uuid to its output"""
+
+        outputs = {}
+        pending_runlogs = []
+        for runlog in task_runlogs:
+            uuid = runlog["metadata"]["uuid"]
+            state = runlog["status"]["state"]
+            # Task may run again on rerun, so its state is checked as well
+            if uuid in self.outputs and state in RUNLOG.TERMINAL_STATES:
+                outputs[uuid] = self.outputs[uuid]
+            else:
+                pending_runlogs.append(runlog)
+
+        if not pending_runlogs:
+            return outputs
+
+        max_workers = min(self.max_workers, len(pending_runlogs))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            fetched_outputs = executor.map(
+                lambda runlog: self.fetch_output(runlog["metadata"]["uuid"]),
+                pending_runlogs,
+            )
+            for runlog, output in zip(pending_runlogs, fetched_outputs):
+                uuid = runlog["metadata"]["uuid"]
+                outputs[uuid] = output
+                if runlog["status"]["state"] in RUNLOG.TERMINAL_STATES:
+                    self.outputs[uuid] = output
+
+        return outputs
 
 
 class RunlogNode(NodeMixin):
@@ -236,11 +261,39 @@ class RunlogNode(NodeMixin):
         if children:
             self.children = children
 
+        # Lines displaying the node are rebuilt only if node is dirty
+        self.dirty = True
+        self.lines = None
+        self.lines_key = None
 
-def displayRunLog(screen, obj, pre, fill, line):
 
-    if not isinstance(obj, RunlogNode):
-        return super().default(obj)
+def get_state_colour(state):
+    """returns screen colour of runlog state"""
+
+    colour = 3  # yellow for pending state
+    if state == RUNLOG.STATUS.SUCCESS:
+        colour = 2  # green for success
+    elif state in RUNLOG.FAILURE_STATES:
+        colour = 1  # red for failure
+    elif state == RUNLOG.STATUS.RUNNING:
+        colour = 4  # blue for running state
+    elif state == RUNLOG.STATUS.INPUT:
+        colour = 6  # cyan for input state
+    return colour
+
+
+def get_task_name(obj):
+    """returns display name of task runlog node"""
+
+    name = obj.runlog["status"]["task_reference"]["name"]
+    if obj.machine:
+        name = "{} ['{}']".format(name, obj.machine)
+    return name
+
+
+def displayRunLog(obj, pre, fill):
+    """returns lines displaying runlog node. Each line is a tuple of
+    (text, x, print options) items to be printed on it"""
 
     metadata = obj.runlog["metadata"]
     status = obj.runlog["status"]
@@ -248,8 +301,6 @@ def displayRunLog(screen, obj, pre, fill, line):
     output = ""
     reason_list = ""
 
-    idx = itertools.count(start=line, step=1).__next__
-
     if status["type"] == "task_runlog":
         name = status["task_reference"]["name"]
         for out in obj.outputs:
@@ -264,11 +315,9 @@ def displayRunLog(screen, obj, pre, fill, line):
     elif status["type"] == "action_runlog" and "action_reference" in status:
         name = status["action_reference"]["name"]
     elif status["type"] == "app":
-        screen.print_at("{}{}".format(pre, status["name"]), 0, idx())
-        return idx()
+        return [(("{}{}".format(pre, status["name"]), 0, ()),)]
     else:
-        screen.print_at("{}root".format(pre), 0, idx())
-        return idx()
+        return [(("{}root".format(pre), 0, ()),)]
 
     # TODO - Fix KeyError for action_runlog
 
@@ -289,59 +338,371 @@ def displayRunLog(screen, obj, pre, fill, line):
         time_stats = "[Started: {}]".format(time.ctime(creation_time))
 
     prefix = "{}{} (Status:".format(pre, name)
-    screen.print_at("{} {}) {}".format(prefix, state, time_stats), 0, line)
-    colour = 3  # yellow for pending state
-    if state == RUNLOG.STATUS.SUCCESS:
-        colour = 2  # green for success
-    elif state in RUNLOG.FAILURE_STATES:
-        colour = 1  # red for failure
-    elif state == RUNLOG.STATUS.RUNNING:
-        colour = 4  # blue for running state
-    elif state == RUNLOG.STATUS.INPUT:
-        colour = 6  # cyan for input state
+    state_line = [("{} {}) {}".format(prefix, state, time_stats), 0, ())]
     if os.isatty(sys.stdout.fileno()):
-        screen.print_at("{}".format(state), len(prefix) + 1, idx(), colour=colour)
+        state_line.append(
+            (
+                "{}".format(state),
+                len(prefix) + 1,
+                (("colour", get_state_colour(state)),),
+            )
+        )
+    lines = [tuple(state_line)]
 
     if obj.children:
         fill = fill + "\u2502"
 
     if status["type"] == "action_runlog":
-        screen.print_at("{}\t Runlog UUID: {}".format(fill, metadata["uuid"]), 0, idx())
+        lines.append((("{}\t Runlog UUID: {}".format(fill, metadata["uuid"]), 0, ()),))
 
     if username:
-        screen.print_at("{}\t Run by: {}".format(fill, username), 0, idx())
+        lines.append((("{}\t Run by: {}".format(fill, username), 0, ()),))
 
     if output:
-        screen.print_at("{}\t Output :".format(fill), 0, idx())
-        output_lines = output.splitlines()
-        for line in output_lines:
-            y_coord = idx()
-            screen.print_at("{}\t  {}".format(fill, line), 0, y_coord, colour=5, attr=1)
-            screen.print_at(fill, 0, y_coord)
+        lines.append((("{}\t Output :".format(fill), 0, ()),))
+        for line in output.splitlines():
+            lines.append(
+                (
+                    ("{}\t  {}".format(fill, line), 0, (("colour", 5), ("attr", 1))),
+                    (fill, 0, ()),
+                )
+            )
 
     if reason_list:
-        screen.print_at("{}\t Reasons :".format(fill), 0, idx())
-        reason_lines = reason_list.splitlines()
-        for line in reason_lines:
-            y_coord = idx()
-            screen.print_at("{}\t  {}".format(fill, line), 0, y_coord, colour=1, attr=1)
-            screen.print_at(fill, 0, y_coord)
-
-    if status["type"] == "task_runlog" and state == RUNLOG.STATUS.INPUT:
-        attrs = status.get("attrs", None)
-        if not isinstance(attrs, dict):
-            return idx()
-
-        input_tasks.append(
-            {"name": name, "uuid": metadata["uuid"], "inputs": attrs.get("inputs", [])}
+        lines.append((("{}\t Reasons :".format(fill), 0, ()),))
+        for line in reason_list.splitlines():
+            lines.append(
+                (
+                    ("{}\t  {}".format(fill, line), 0, (("colour", 1), ("attr", 1))),
+                    (fill, 0, ()),
+                )
+            )
+
+    return lines
+
+
+class RunlogTree:
+    """Runlog tree of a runbook execution. Runlogs of every poll are merged into
+    the existing tree using their uuids, and only nodes changed since last poll
+    are marked dirty for redrawing"""
+
+    def __init__(self, runlog_uuid, task_type_map, top_level_tasks):
+        self.runlog_uuid = runlog_uuid
+        self.task_type_map = task_type_map
+        self.top_level_tasks = top_level_tasks
+        self.root = None
+        self.nodes = {}
+        self.runlog_map = {}
+
+        # (creation time, arrival order) of runlogs, used for sorting
+        self.runlog_order = {}
+
+        # Runlogs in failure or non terminal states
+        self.unfinished_runlogs = set()
+
+        # Non terminal runlogs of each started top level task
+        self.running_task_runlogs = {}
+
+        # Nodes of task runlogs having output
+        self.output_runlogs = set()
+
+        # Nodes of task runlogs waiting for user input or confirmation
+        self.waiting_runlogs = set()
+
+    @property
+    def total_tasks(self):
+        return len(self.top_level_tasks)
+
+    @property
+    def completed_tasks(self):
+        return len(
+            [
+                task_id
+                for task_id, runlogs in self.running_task_runlogs.items()
+                if not runlogs
+            ]
         )
 
-    if status["type"] == "task_runlog" and state == RUNLOG.STATUS.CONFIRM:
-        confirm_tasks.append({"name": name, "uuid": metadata["uuid"]})
-    return idx()
+    def merge(self, entities):
+        """merges runlogs of poll response into the tree"""
+
+        new_runlogs = []
+        for runlog in entities:
+            # Create root node
+            # TODO - Get details of root node
+            if not self.root:
+                root_uuid = str(runlog["status"]["root_reference"]["uuid"])
+                root_runlog = {
+                    "metadata": {"uuid": root_uuid},
+                    "status": {"type": "action_runlog", "state": ""},
+                }
+                self.runlog_map[root_uuid] = root_runlog
+                self.root = RunlogNode(root_runlog)
+                self.nodes[root_uuid] = self.root
+
+            uuid = str(runlog["metadata"]["uuid"])
+            machine_name = runlog["status"].get("machine_name", None)
+            machine = parse_machine_name(self.runlog_uuid, machine_name)
+            if machine and len(machine) == 1:
+                # this runlog corresponds to endpoint loop
+                runlog["status"]["machine_name"] = "-"
+
+            self.runlog_map[uuid] = runlog
+            self._update_runlog_state(uuid, runlog)
+
+            node = self.nodes.get(uuid, None)
+            if node is None:
+                new_runlogs.append(runlog)
+            elif node.runlog != runlog:
+                node.runlog = runlog
+                node.reasons = runlog["status"].get("reason_list", [])
+                node.dirty = True
+
+        if new_runlogs:
+            self._add_nodes(new_runlogs)
+
+    def _update_runlog_state(self, uuid, runlog):
+        """updates progress and completion state using runlog state"""
+
+        if uuid not in self.runlog_order:
+            self.runlog_order[uuid] = (
+                int(runlog["metadata"]["creation_time"]),
+                len(self.runlog_order),
+            )
+
+        state = runlog["status"]["state"]
+        if state in RUNLOG.FAILURE_STATES or state not in RUNLOG.TERMINAL_STATES:
+            self.unfinished_runlogs.add(uuid)
+        else:
+            self.unfinished_runlogs.discard(uuid)
+
+        if runlog["status"]["type"] != "task_runlog":
+            return
+
+        task_id = runlog["status"]["task_reference"]["uuid"]
+        if task_id in self.top_level_tasks:
+            running_runlogs = self.running_task_runlogs.setdefault(task_id, set())
+            if state in RUNLOG.TERMINAL_STATES:
+                running_runlogs.discard(uuid)
+            else:
+                running_runlogs.add(uuid)
+
+        if uuid in self.nodes:
+            if state in [RUNLOG.STATUS.INPUT, RUNLOG.STATUS.CONFIRM]:
+                self.waiting_runlogs.add(uuid)
+            else:
+                self.waiting_runlogs.discard(uuid)
+
+    def _add_nodes(self, runlogs):
+        """creates nodes of new runlogs and attaches them to their parents"""
+
+        runlogs = sorted(
+            runlogs,
+            key=lambda runlog: self.runlog_order[str(runlog["metadata"]["uuid"])],
+        )
+
+        new_nodes = []
+        for runlog in runlogs:
+            uuid = str(runlog["metadata"]["uuid"])
+            status = runlog["status"]
+            machine = parse_machine_name(self.runlog_uuid, status.get("machine_name"))
+            if machine and len(machine) == 1:
+                continue  # this runlog corresponds to endpoint loop
+            elif machine:
+                machine = "{} ({})".format(machine[1], machine[0])
+
+            if status["type"] == "task_runlog":
+                task_type = self.task_type_map[status["task_reference"]["uuid"]]
+                if task_type == "META":
+                    continue  # don't add metatask's trl in runlogTree
+
+                # Output is not valid for input, confirm and while_loop tasks
+                if task_type not in ["INPUT", "CONFIRM", "WHILE_LOOP"]:
+                    self.output_runlogs.add(uuid)
+
+                if status["state"] in [RUNLOG.STATUS.INPUT, RUNLOG.STATUS.CONFIRM]:
+                    self.waiting_runlogs.add(uuid)
+
+            node = RunlogNode(
+                runlog, machine=machine, reasons=status.get("reason_list", [])
+            )
+            self.nodes[uuid] = node
+            new_nodes.append((uuid, node))
+
+        # Attach parent to nodes
+        for uuid, node in new_nodes:
+            parent = self.nodes[self._get_parent_uuid(node.runlog)]
+            siblings = parent.children
+            node.parent = parent
+            parent.dirty = True
+
+            # Keep siblings sorted on creation time
+            if siblings and self.runlog_order[uuid] < self._get_order(siblings[-1]):
+                parent.children = sorted(parent.children, key=self._get_order)
+
+    def _get_order(self, node):
+        return self.runlog_order[str(node.runlog["metadata"]["uuid"])]
+
+    def _get_parent_uuid(self, runlog):
+        """returns uuid of parent node, skipping runlogs not present in tree"""
+
+        parent_uuid = str(runlog["status"]["parent_reference"]["uuid"])
+        parent_runlog = self.runlog_map[parent_uuid]
+        parent_type = parent_runlog["status"]["type"]
+        while (
+            parent_type == "task_runlog"
+            and self.task_type_map[parent_runlog["status"]["task_reference"]["uuid"]]
+            == "META"
+        ) or parent_runlog["status"].get("machine_name", None) == "-":
+            parent_uuid = str(parent_runlog["status"]["parent_reference"]["uuid"])
+            parent_runlog = self.runlog_map[parent_uuid]
+            parent_type = parent_runlog["status"]["type"]
+
+        return parent_uuid
+
+    def set_outputs(self, task_outputs):
+        """sets outputs of task runlog nodes"""
+
+        for uuid, output in task_outputs.items():
+            node = self.nodes[str(uuid)]
+            outputs = [output] if output is not None else []
+            if node.outputs != outputs:
+                node.outputs = outputs
+                node.dirty = True
+
+    def get_output_runlogs(self):
+        """returns task runlogs whose output is to be displayed"""
+
+        return [self.nodes[uuid].runlog for uuid in self.output_runlogs]
+
+    def get_waiting_tasks(self):
+        """returns tasks waiting for user input and confirmation"""
+
+        input_tasks = []
+        confirm_tasks = []
+        if not self.waiting_runlogs:
+            return input_tasks, confirm_tasks
+
+        for node in PreOrderIter(self.root):
+            uuid = str(node.runlog["metadata"]["uuid"])
+            if uuid not in self.waiting_runlogs:
+                continue
+
+            status = node.runlog["status"]
+            if status["state"] == RUNLOG.STATUS.INPUT:
+                attrs = status.get("attrs", None)
+                if isinstance(attrs, dict):
+                    input_tasks.append(
+                        {
+                            "name": get_task_name(node),
+                            "uuid": uuid,
+                            "inputs": attrs.get("inputs", []),
+                        }
+                    )
+            else:
+                confirm_tasks.append({"name": get_task_name(node), "uuid": uuid})
+
+        return input_tasks, confirm_tasks
+
+    def get_first_unfinished_runlog(self):
+        """returns earliest created runlog in failure or non terminal state"""
+
+        if not self.unfinished_runlogs:
+            return None
+
+        uuid = min(self.unfinished_runlogs, key=self.runlog_order.__getitem__)
+        return self.runlog_map[uuid]
+
+    def get_lines(self):
+        """returns lines displaying the tree. Lines of unchanged nodes are reused"""
+
+        lines = []
+        for pre, fill, node in RenderTree(self.root):
+            lines_key = (pre, fill, bool(node.children))
+            if node.dirty or node.lines_key != lines_key:
+                node.lines = displayRunLog(node, pre, fill)
+                node.lines_key = lines_key
+                node.dirty = False
+            lines.extend(node.lines)
+
+        return lines
+
+
+class RunlogScreen:
+    """Draws lines on screen. On terminal, only lines changed since last draw are
+    redrawn instead of clearing and redrawing the whole screen"""
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.lines = []
+
+    def invalidate(self):
+        """clears screen, used when it is overwritten (e.g. by popups)"""
+
+        self.lines = []
+        self.screen.clear()
+
+    def _print_line(self, ops, y):
+        for text, x, options in ops:
+            self.screen.print_at(text, x, y, **dict(options))
+
+    def draw(self, lines):
+        if not isinstance(self.screen, Screen):
+            self.screen.clear()
+            for y, ops in enumerate(lines):
+                self._print_line(ops, y)
+            self.screen.refresh()
+            return
+
+        for y in range(max(len(lines), len(self.lines))):
+            ops = lines[y] if y < len(lines) else ()
+            if y < len(self.lines):
+                if self.lines[y] == ops:
+                    continue
+
+                # Blank out the previous content of line
+                self.screen.print_at(" " * self.screen.width, 0, y)
+
+            self._print_line(ops, y)
+
+        self.lines = lines
+        self.screen.refresh()
+
+
+def displayRunLogTree(screen, tree, msg=None):
+    """draws runlog tree on RunlogScreen, returns line next to it"""
+
+    header = []
+    if tree.total_tasks:
+        progress = "{0:.2f}".format(tree.completed_tasks / tree.total_tasks * 100)
+        header.append(("Progress: {}%".format(progress), 0, ()))
+
+    runlog_state = tree.root.children[0].runlog["status"]["state"]
+    header.append(
+        (
+            runlog_state,
+            screen.screen.width - len(runlog_state) - 5
+            if hasattr(screen.screen, "width")
+            else 0,
+            (("colour", get_state_colour(runlog_state)), ("attr", Screen.A_UNDERLINE)),
+        )
+    )
+
+    lines = [tuple(header)] + tree.get_lines()
+    line = len(lines)
+    if msg:
+        lines.append(((msg, 0, (("colour", 6),)),))
+    screen.draw(lines)
+    return line + 1
 
 
 def get_completion_func(screen):
+
+    # Runlog trees and task runlog output caches of watched runlogs
+    trees = {}
+    output_caches = {}
+    runlog_screen = RunlogScreen(screen)
+
     def is_action_complete(
         response,
         task_type_map=[],
@@ -352,13 +713,9 @@ def get_completion_func(screen):
     ):
 
         client = get_api_client()
-        global input_tasks
         global input_payload
-        global confirm_tasks
         global confirm_payload
         global rerun
-        input_tasks = []
-        confirm_tasks = []
         entities = response["entities"]
         if len(entities):
 
@@ -367,112 +724,25 @@ def get_completion_func(screen):
             if hasattr(screen, "get_event"):
                 interrupt = screen.get_event()
 
-            # Sort entities based on creation time
-            sorted_entities = sorted(
-                entities, key=lambda x: int(x["metadata"]["creation_time"])
-            )
+            # Merge runlogs into the runlog tree built by previous polls
+            tree = trees.get(runlog_uuid)
+            if tree is None:
+                tree = RunlogTree(runlog_uuid, task_type_map, top_level_tasks)
+                trees[runlog_uuid] = tree
+            tree.merge(entities)
 
-            # Create nodes of runlog tree and a map based on uuid
-            root = None
-            nodes = {}
-            runlog_map = {}
-            for runlog in sorted_entities:
-                # Create root node
-                # TODO - Get details of root node
-                if not root:
-                    root_uuid = runlog["status"]["root_reference"]["uuid"]
-                    root_runlog = {
-                        "metadata": {"uuid": root_uuid},
-                        "status": {"type": "action_runlog", "state": ""},
-                    }
-                    runlog_map[str(root_uuid)] = root_runlog
-                    root = RunlogNode(root_runlog)
-                    nodes[str(root_uuid)] = root
+            # Fetch outputs of task runlogs, reusing outputs of completed ones
+            output_runlogs = tree.get_output_runlogs()
+            if output_runlogs:
+                output_cache = output_caches.get(runlog_uuid)
+                if output_cache is None:
+                    output_cache = RunlogOutputCache(client, runlog_uuid)
+                    output_caches[runlog_uuid] = output_cache
 
-                uuid = runlog["metadata"]["uuid"]
-                runlog_map[str(uuid)] = runlog
-                reasons = runlog["status"].get("reason_list", [])
-                outputs = []
-                machine_name = runlog["status"].get("machine_name", None)
-                machine = parse_machine_name(runlog_uuid, machine_name)
-                if machine and len(machine) == 1:
-                    runlog["status"]["machine_name"] = "-"
-                    continue  # this runlog corresponds to endpoint loop
-                elif machine:
-                    machine = "{} ({})".format(machine[1], machine[0])
-
-                if runlog["status"]["type"] == "task_runlog":
-
-                    task_id = runlog["status"]["task_reference"]["uuid"]
-                    if task_type_map[task_id] == "META":
-                        continue  # don't add metatask's trl in runlogTree
-
-                    # Output is not valid for input, confirm and while_loop tasks
-                    if task_type_map[task_id] not in ["INPUT", "CONFIRM", "WHILE_LOOP"]:
-                        res, err = client.runbook.runlog_output(runlog_uuid, uuid)
-                        if err:
-                            raise Exception(
-                                "\n[{}] - {}".format(err["code"], err["error"])
-                            )
-                        runlog_output = res.json()
-                        output_list = runlog_output["status"]["output_list"]
-                        if len(output_list) > 0:
-                            outputs.append(output_list[0]["output"])
-
-                nodes[str(uuid)] = RunlogNode(
-                    runlog,
-                    parent=root,
-                    outputs=outputs,
-                    machine=machine,
-                    reasons=reasons,
-                )
+                tree.set_outputs(output_cache.get_outputs(output_runlogs))
 
-            # Attach parent to nodes
-            for runlog in sorted_entities:
-                uuid = runlog["metadata"]["uuid"]
-                if nodes.get(str(uuid), None) is None:
-                    continue
-                parent_uuid = runlog["status"]["parent_reference"]["uuid"]
-                parent_runlog = runlog_map[str(parent_uuid)]
-                parent_type = parent_runlog["status"]["type"]
-                while (
-                    parent_type == "task_runlog"
-                    and task_type_map[parent_runlog["status"]["task_reference"]["uuid"]]
-                    == "META"
-                ) or parent_runlog["status"].get("machine_name", None) == "-":
-                    parent_uuid = parent_runlog["status"]["parent_reference"]["uuid"]
-                    parent_runlog = runlog_map[str(parent_uuid)]
-                    parent_type = parent_runlog["status"]["type"]
-
-                node = nodes[str(uuid)]
-                node.parent = nodes[str(parent_uuid)]
-
-            # Show Progress
-            # TODO - Draw progress bar
-            total_tasks = len(top_level_tasks)
-            task_status_map = {}
-            completed_tasks = 0
-            for runlog in sorted_entities:
-                runlog_type = runlog["status"]["type"]
-                if runlog_type == "task_runlog":
-                    task_id = runlog["status"]["task_reference"]["uuid"]
-                    state = runlog["status"]["state"]
-                    if (
-                        state in RUNLOG.TERMINAL_STATES
-                        and task_id in top_level_tasks
-                        and not task_status_map.get(task_id, None)
-                    ):
-                        task_status_map[task_id] = "COMPLETED"
-                    elif (
-                        state not in RUNLOG.TERMINAL_STATES
-                        and task_id in top_level_tasks
-                    ):
-                        task_status_map[task_id] = "RUNNING"
-            for key, val in task_status_map.items():
-                if val == "COMPLETED":
-                    completed_tasks += 1
-
-            line = displayRunLogTree(screen, root, completed_tasks, total_tasks)
+            line = displayRunLogTree(runlog_screen, tree)
+            input_tasks, confirm_tasks = tree.get_waiting_tasks()
 
             # Check if any tasks is in INPUT state
             if len(input_tasks) > 0:
@@ -514,15 +784,13 @@ def get_completion_func(screen):
                                 )
                             ]
                         )
+                        runlog_screen.invalidate()
                     if client is not None:
                         client.runbook.resume(
                             runlog_uuid, task_uuid, {"properties": input_payload}
                         )
-                input_tasks = []
                 msg = "Sending resume for input tasks with input values"
-                line = displayRunLogTree(
-                    screen, root, completed_tasks, total_tasks, msg=msg
-                )
+                line = displayRunLogTree(runlog_screen, tree, msg=msg)
 
             # Check if any tasks is in CONFIRM state
             if len(confirm_tasks) > 0:
@@ -532,13 +800,11 @@ def get_completion_func(screen):
                     task_uuid = confirm_task.get("uuid", "")
                     confirm_payload = {}
                     screen.play([Scene([ConfirmFrame(name, screen)], -1)])
+                    runlog_screen.invalidate()
                     if client is not None:
                         client.runbook.resume(runlog_uuid, task_uuid, confirm_payload)
-                confirm_tasks = []
                 msg = "Sending resume for confirm tasks with confirmation"
-                line = displayRunLogTree(
-                    screen, root, completed_tasks, total_tasks, msg=msg
-                )
+                line = displayRunLogTree(runlog_screen, tree, msg=msg)
 
             if (
                 interrupt
@@ -554,7 +820,7 @@ def get_completion_func(screen):
                 and interrupt.key_code == 32
             ):
                 # on space pause/play runbook based on current state
-                runlog_state = root.children[0].runlog["status"]["state"]
+                runlog_state = tree.root.children[0].runlog["status"]["state"]
 
                 if runlog_state in [
                     RUNLOG.STATUS.RUNNING,
@@ -566,35 +832,31 @@ def get_completion_func(screen):
                 elif runlog_state in [RUNLOG.STATUS.PAUSED]:
                     client.runbook.play(runlog_uuid)
                     msg = "Triggered play on the paused Runbook Execution"
-                line = displayRunLogTree(
-                    screen, root, completed_tasks, total_tasks, msg=msg
-                )
+                line = displayRunLogTree(runlog_screen, tree, msg=msg)
 
             rerun = {}
-            for runlog in sorted_entities:
+            runlog = tree.get_first_unfinished_runlog()
+            if runlog:
                 state = runlog["status"]["state"]
-                if state in RUNLOG.FAILURE_STATES:
-                    sleep(2)
-                    msg = "Action failed."
-                    if os.isatty(sys.stdout.fileno()):
-                        msg += " Exit screen?"
-                        screen.play([Scene([RerunFrame(state, screen)], -1)])
-                        if rerun.get("rerun", False):
-                            client.runbook.rerun(runlog_uuid)
-                            msg = "Triggered rerun for the Runbook Runlog"
-                            displayRunLogTree(
-                                screen, root, completed_tasks, total_tasks, msg=msg
-                            )
-                            return (False, "")
-                        displayRunLogTree(
-                            screen, root, completed_tasks, total_tasks, msg=msg
-                        )
-                        return (True, msg)
-                    else:
-                        return (True, msg)
-                if state not in RUNLOG.TERMINAL_STATES:
+                if state not in RUNLOG.FAILURE_STATES:
                     return (False, "")
 
+                sleep(2)
+                msg = "Action failed."
+                if os.isatty(sys.stdout.fileno()):
+                    msg += " Exit screen?"
+                    screen.play([Scene([RerunFrame(state, screen)], -1)])
+                    runlog_screen.invalidate()
+                    if rerun.get("rerun", False):
+                        client.runbook.rerun(runlog_uuid)
+                        msg = "Triggered rerun for the Runbook Runlog"
+                        displayRunLogTree(runlog_screen, tree, msg=msg)
+                        return (False, "")
+                    displayRunLogTree(runlog_screen, tree, msg=msg)
+                    return (True, msg)
+                else:
+                    return (True, msg)
+
             msg = "Action ran successfully."
             if os.isatty(sys.stdout.fileno()):
                 msg += " Exit screen?"
@@ -21,10 +21,16 @@ from .secrets import (
     confirmation_prompt=True,
     help="Value for secret",
 )
-def _create_secret(name, value):
+@click.option(
+    "--kdf_cost",
+    type=int,
+    default=None,
+    help="scrypt cost (power of 2) used for deriving key of secret (default: 16384)",
+)
+def _create_secret(name, value, kdf_cost):
     """Creates a secret"""
 
-    create_secret(name, value)
+    create_secret(name, value, kdf_cost=kdf_cost)
 
 
 @get.command("secrets")
@@ -48,13 +54,19 @@ def _delete_secret(name):
 @update.command("secret")
 @click.argument("name", nargs=1)
 @click.option("--value", "-v", prompt=True, hide_input=True, confirmation_prompt=True)
-def _update_secret(name, value):
+@click.option(
+    "--kdf_cost",
+    type=int,
+    default=None,
+    help="scrypt cost (power of 2) used for deriving key of secret (default: existing cost)",
+)
+def _update_secret(name, value, kdf_cost):
     """Updates a secret
 
     NAME is the alias for your secret
     """
 
-    update_secret(name, value)
+    update_secret(name, value, kdf_cost=kdf_cost)
 
 
 @clear.command("secrets")
@@ -6,12 +6,13 @@ from prettytable import PrettyTable
 from .utils import highlight_text
 
 from calm.dsl.store import Secret
+from calm.dsl.crypto import Crypto
 from calm.dsl.log import get_logging_handle
 
 LOG = get_logging_handle(__name__)
 
 
-def create_secret(name, value):
+def create_secret(name, value, kdf_cost=None):
     """Creates the secret"""
 
     secrets = get_secrets_names()
@@ -19,8 +20,11 @@ def create_secret(name, value):
         LOG.error("Secret {} already present !!!".format(name))
         return
 
+    if kdf_cost and not _is_valid_kdf_cost(kdf_cost):
+        return
+
     LOG.debug("Creating secret {}".format(name))
-    Secret.create(name, value)
+    Secret.create(name, value, kdf_cost=kdf_cost)
     LOG.info(highlight_text("Secret {} created".format(name)))
 
 
@@ -70,7 +74,7 @@ def delete_secret(name):
     Secret.delete(name)
 
 
-def update_secret(name, value):
+def update_secret(name, value, kdf_cost=None):
     """Updates the secret"""
 
     secrets = get_secrets_names()
@@ -78,8 +82,11 @@ def update_secret(name, value):
         LOG.error("Secret {} not present !!!".format(name))
         return
 
+    if kdf_cost and not _is_valid_kdf_cost(kdf_cost):
+        return
+
     LOG.info("Updating secret {}".format(name))
-    Secret.update(name, value)
+    Secret.update(name, value, kdf_cost=kdf_cost)
 
 
 def find_secret(name, pass_phrase=""):
@@ -89,6 +96,24 @@ def find_secret(name, pass_phrase=""):
     return secret_val
 
 
+def find_secrets(names, pass_phrase=""):
+    """Gives you the values stored corresponding to secrets, as {name: value}.
+    Secrets not present are skipped"""
+
+    return Secret.find_many(names, pass_phrase)
+
+
+def _is_valid_kdf_cost(kdf_cost):
+
+    try:
+        Crypto.validate_kdf_cost(kdf_cost)
+    except ValueError as exp:
+        LOG.error(str(exp))
+        return False
+
+    return True
+
+
 def get_secrets_names():
     """To find the names stored in db"""
 
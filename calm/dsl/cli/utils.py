@@ -1,17 +1,23 @@
 import click
+import json
 import sys
 import os
+from contextlib import closing
 from functools import reduce
 from asciimatics.screen import Screen
 from click_didyoumean import DYMMixin
+from prettytable import PrettyTable
 from distutils.version import LooseVersion as LV
 
 from calm.dsl.tools import get_module_from_file
 from calm.dsl.api import get_api_client
+from calm.dsl.api.json_stream import STREAM_CHUNK_SIZE, iter_list_entities
 from calm.dsl.constants import PROVIDER_ACCOUNT_TYPE_MAP
 from calm.dsl.store import Version
 from calm.dsl.log import get_logging_handle
 
+from .lazy_commands import load_command_modules, get_command_modules
+
 LOG = get_logging_handle(__name__)
 
 
@@ -52,6 +58,19 @@ def import_var_from_file(file, var, default_value=None):
         return default_value
 
 
+def get_args_from_stdin(args):
+    """returns args replacing '-' with whitespace separated values read from stdin"""
+
+    values = []
+    for arg in args:
+        if arg == "-":
+            values.extend(click.get_text_stream("stdin").read().split())
+        else:
+            values.append(arg)
+
+    return values
+
+
 class Display:
     @classmethod
     def wrapper(cls, func, watch=False):
@@ -134,6 +153,56 @@ class FeatureFlagGroup(FeatureFlagMixin, DYMMixin, click.Group):
     pass
 
 
+class LazyCommandsMixin:
+    """Imports the modules registering subcommands of the group only when
+    those subcommands are looked up, keeping cli startup fast.
+    Modules are looked up in LAZY_COMMAND_MAP using the command path of the group.
+    """
+
+    @staticmethod
+    def get_group_path(ctx):
+        """returns command path of the group, excluding root command"""
+
+        names = []
+        while ctx.parent is not None:
+            names.append(ctx.info_name)
+            ctx = ctx.parent
+
+        return " ".join(reversed(names))
+
+    def load_commands(self, ctx, cmd_name):
+        """imports modules registering cmd_name subcommand"""
+
+        group_path = self.get_group_path(ctx)
+        load_command_modules(get_command_modules(group_path, cmd_name))
+
+        # Subcommand missing in map, import all modules
+        if cmd_name not in self.commands:
+            load_command_modules()
+
+    def get_command(self, ctx, cmd_name):
+        self.load_commands(ctx, cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def list_commands(self, ctx):
+        load_command_modules()
+        return super().list_commands(ctx)
+
+    def invoke(self, ctx):
+
+        # Feature flags of subcommand are registered while loading its module
+        if ctx.protected_args:
+            self.load_commands(ctx, ctx.protected_args[0])
+
+        return super().invoke(ctx)
+
+
+class LazyFeatureFlagGroup(LazyCommandsMixin, FeatureFlagGroup):
+    """FeatureFlagGroup whose subcommands are loaded lazily"""
+
+    pass
+
+
 class FeatureDslOption(click.ParamType):
 
     name = "feature-dsl-option"
@@ -231,3 +300,109 @@ def get_account_details(
         "project": {"name": project_name, "uuid": project_uuid},
         "account": {"name": account_name, "uuid": account_uuid},
     }
+
+
+def show_entity_names(res, limit, entity_type):
+    """prints names of entities in streamed list response. Entities are
+    reduced to their names while being decoded, so that large pages are not
+    kept in memory"""
+
+    # Metadata may follow the entities in response, so names are printed after it is read
+    info = {}
+    with closing(res):
+        names = [
+            entity["status"]["name"]
+            for entity in iter_list_entities(
+                res.iter_content(STREAM_CHUNK_SIZE), fields=["status.name"], info=info
+            )
+        ]
+
+    total_matches = info.get("metadata", {}).get("total_matches", 0)
+    if total_matches > limit:
+        LOG.warning(
+            "Displaying {} out of {} entities. Please use --limit and --offset option for more results.".format(
+                limit, total_matches
+            )
+        )
+
+    if not names:
+        click.echo(highlight_text("No {} found !!!\n".format(entity_type)))
+        return
+
+    for name in names:
+        click.echo(highlight_text(name))
+
+
+def show_profile(profiler, trace_file=None, min_duration=0.001):
+    """prints timing tree and category summary of profiler to stderr, and
+    writes its chrome trace to trace_file, if given"""
+
+    click.echo(highlight_text("\nTiming tree:"), err=True)
+    for line in profiler.get_tree_lines(min_duration=min_duration):
+        click.echo(line, err=True)
+
+    click.echo(highlight_text("\nSelf time per category:"), err=True)
+    summary = profiler.get_category_summary()
+    for category, (duration, count) in sorted(
+        summary.items(), key=lambda item: item[1][0], reverse=True
+    ):
+        click.echo(
+            "{}: {:.2f} ms  spans: {}".format(category, duration * 1000, count),
+            err=True,
+        )
+
+    if trace_file:
+        with open(trace_file, "w") as fd:
+            json.dump(profiler.get_chrome_trace(), fd)
+        LOG.info("Chrome trace written to {}".format(trace_file))
+
+
+def show_connection_stats(summary, print_summary=True, stats_file=None):
+    """prints stats of server calls per endpoint to stderr, and writes them
+    as json to stats_file, if given"""
+
+    if print_summary:
+        table = PrettyTable()
+        table.field_names = [
+            "METHOD",
+            "ENDPOINT",
+            "CALLS",
+            "ERRORS",
+            "RETRIES",
+            "TOTAL (ms)",
+            "AVG (ms)",
+            "MAX (ms)",
+            "POOL WAIT (ms)",
+            "SENT (bytes)",
+            "RECEIVED (bytes)",
+        ]
+        for stats in summary["endpoints"]:
+            table.add_row(
+                [
+                    stats["method"],
+                    stats["endpoint"],
+                    stats["calls"],
+                    stats["errors"],
+                    stats["retries"],
+                    "{:.1f}".format(stats["total_ms"]),
+                    "{:.1f}".format(stats["avg_ms"]),
+                    "{:.1f}".format(stats["max_ms"]),
+                    "{:.1f}".format(stats["pool_wait_ms"]),
+                    stats["bytes_sent"],
+                    stats["bytes_received"],
+                ]
+            )
+
+        click.echo(
+            highlight_text(
+                "\nServer calls: {}, total time: {:.1f} ms".format(
+                    summary["total_calls"], summary["total_ms"]
+                )
+            ),
+            err=True,
+        )
+        click.echo(table, err=True)
+
+    if stats_file:
+        with open(stats_file, "w") as fd:
+            json.dump(summary, fd, indent=4, separators=(",", ": "))
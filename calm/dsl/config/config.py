@@ -70,11 +70,11 @@ class ConfigFileParser:
         connection_config = {}
         if "CONNECTION" in self._CONFIG_PARSER_OBJECT:
             for k, v in self._CONFIG_PARSER_OBJECT.items("CONNECTION"):
-                if k == "retries_enabled":
+                if k in ["retries_enabled", "response_cache_enabled"]:
                     connection_config[k] = self._CONFIG_PARSER_OBJECT[
                         "CONNECTION"
                     ].getboolean(k)
-                elif k in ["connection_timeout", "read_timeout"]:
+                elif k in ["connection_timeout", "read_timeout", "response_cache_size"]:
                     connection_config[k] = self._CONFIG_PARSER_OBJECT[
                         "CONNECTION"
                     ].getint(k)
@@ -143,6 +143,10 @@ class ConfigHandle:
         retries_enabled,
         connection_timeout,
         read_timeout,
+        response_cache_enabled,
+        response_cache_size,
+        log_format=None,
+        log_file=None,
         schema_file="config.ini.jinja2",
     ):
         """renders the config template"""
@@ -157,9 +161,13 @@ class ConfigHandle:
             password=password,
             project_name=project_name,
             log_level=log_level,
+            log_format=log_format,
+            log_file=log_file,
             retries_enabled=retries_enabled,
             connection_timeout=connection_timeout,
             read_timeout=read_timeout,
+            response_cache_enabled=response_cache_enabled,
+            response_cache_size=response_cache_size,
         )
         return text.strip() + os.linesep
 
@@ -176,6 +184,10 @@ class ConfigHandle:
         retries_enabled,
         connection_timeout,
         read_timeout,
+        response_cache_enabled,
+        response_cache_size,
+        log_format=None,
+        log_file=None,
     ):
         """Updates the config file data"""
 
@@ -191,6 +203,10 @@ class ConfigHandle:
             retries_enabled,
             connection_timeout,
             read_timeout,
+            response_cache_enabled,
+            response_cache_size,
+            log_format=log_format,
+            log_file=log_file,
         )
 
         LOG.debug("Writing configuration to '{}'".format(config_file))
@@ -217,6 +233,10 @@ def set_dsl_config(
     retries_enabled,
     connection_timeout,
     read_timeout,
+    response_cache_enabled,
+    response_cache_size,
+    log_format=None,
+    log_file=None,
 ):
 
     """
@@ -244,4 +264,8 @@ def set_dsl_config(
         retries_enabled=retries_enabled,
         connection_timeout=connection_timeout,
         read_timeout=read_timeout,
+        response_cache_enabled=response_cache_enabled,
+        response_cache_size=response_cache_size,
+        log_format=log_format,
+        log_file=log_file,
     )
@@ -10,6 +10,8 @@ LOG = get_logging_handle(__name__)
 DEFAULT_RETRIES_ENABLED = True
 DEFAILT_CONNECTION_TIMEOUT = 5
 DEFAULT_READ_TIMEOUT = 30
+DEFAULT_RESPONSE_CACHE_ENABLED = False
+DEFAULT_RESPONSE_CACHE_SIZE = 64  # In MiB
 
 
 class Context:
@@ -116,6 +118,10 @@ class Context:
             config["connection_timeout"] = DEFAILT_CONNECTION_TIMEOUT
         if "read_timeout" not in config:
             config["read_timeout"] = DEFAULT_READ_TIMEOUT
+        if "response_cache_enabled" not in config:
+            config["response_cache_enabled"] = DEFAULT_RESPONSE_CACHE_ENABLED
+        if "response_cache_size" not in config:
+            config["response_cache_size"] = DEFAULT_RESPONSE_CACHE_SIZE
 
         return config
 
@@ -179,9 +185,13 @@ class Context:
             password="xxxxxxxx",  # Do not render password
             project_name=project_config["name"],
             log_level=log_config["level"],
+            log_format=log_config.get("format"),
+            log_file=log_config.get("file"),
             retries_enabled=connection_config["retries_enabled"],
             connection_timeout=connection_config["connection_timeout"],
             read_timeout=connection_config["read_timeout"],
+            response_cache_enabled=connection_config["response_cache_enabled"],
+            response_cache_size=connection_config["response_cache_size"],
         )
 
         print(config_str)
@@ -211,4 +221,6 @@ def get_default_connection_config():
         "connection_timeout": DEFAILT_CONNECTION_TIMEOUT,
         "read_timeout": DEFAULT_READ_TIMEOUT,
         "retries_enabled": DEFAULT_RETRIES_ENABLED,
+        "response_cache_enabled": DEFAULT_RESPONSE_CACHE_ENABLED,
+        "response_cache_size": DEFAULT_RESPONSE_CACHE_SIZE,
     }
@@ -8,6 +8,8 @@ class EnvConfig:
     pc_password = os.environ.get("CALM_DSL_PC_PASSWORD") or ""
     default_project = os.environ.get("CALM_DSL_DEFAULT_PROJECT") or ""
     log_level = os.environ.get("CALM_DSL_LOG_LEVEL") or ""
+    log_format = os.environ.get("CALM_DSL_LOG_FORMAT") or ""
+    log_file = os.environ.get("CALM_DSL_LOG_FILE") or ""
 
     config_file_location = os.environ.get("CALM_DSL_CONFIG_FILE_LOCATION") or ""
     local_dir_location = os.environ.get("CALM_DSL_LOCAL_DIR_LOCATION") or ""
@@ -47,6 +49,12 @@ class EnvConfig:
         if cls.log_level:
             config["level"] = cls.log_level
 
+        if cls.log_format:
+            config["format"] = cls.log_format
+
+        if cls.log_file:
+            config["file"] = cls.log_file
+
         return config
 
     @classmethod
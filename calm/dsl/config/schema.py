@@ -9,7 +9,11 @@ config_schema_dict = {
         Optional("pc_password"): And(Use(str)),
     },
     Optional("PROJECT"): {Optional("name"): And(Use(str))},
-    Optional("LOG"): {Optional("level"): And(Use(str))},
+    Optional("LOG"): {
+        Optional("level"): And(Use(str)),
+        Optional("format"): And(Use(str)),
+        Optional("file"): And(Use(str)),
+    },
     Optional("CATEGORIES"): {},
 }
 
@@ -1,3 +1,3 @@
-from .crypto import Crypto
+from .crypto import Crypto, DEFAULT_KDF_COST
 
-__all__ = ["Crypto"]
+__all__ = ["Crypto", "DEFAULT_KDF_COST"]
@@ -1,14 +1,32 @@
+from collections import OrderedDict
+import hashlib
+import threading
+
 from Crypto.Cipher import AES
 import scrypt
 import os
 
 
+# Default scrypt cost (N) used for deriving keys
+DEFAULT_KDF_COST = 16384
+
+# Maximum number of derived keys cached in process
+KEY_CACHE_SIZE = 256
+
+
 # Crypto class for encryption/decryption
 
 
 class Crypto:
+
+    # {(salt, password digest, N, r, p, buflen): key}, in least recently used order
+    _KEY_CACHE = OrderedDict()
+    _KEY_CACHE_LOCK = threading.Lock()
+
     @staticmethod
-    def encrypt_AES_GCM(msg, password, kdf_salt=None, nonce=None):
+    def encrypt_AES_GCM(
+        msg, password, kdf_salt=None, nonce=None, kdf_cost=DEFAULT_KDF_COST
+    ):
         """Used for encryption of msg"""
 
         kdf_salt = kdf_salt or os.urandom(16)
@@ -16,21 +34,23 @@ class Crypto:
 
         # Encoding of message
         msg = msg.encode()
-        secret_key = Crypto.generate_key(kdf_salt, password)
+        secret_key = Crypto.generate_key(kdf_salt, password, iterations=kdf_cost)
         aes_cipher = AES.new(secret_key, AES.MODE_GCM, nonce=nonce)
         ciphertext, auth_tag = aes_cipher.encrypt_and_digest(msg)
 
         return (kdf_salt, ciphertext, nonce, auth_tag)
 
     @staticmethod
-    def decrypt_AES_GCM(encryptedMsg, password, kdf_salt=None, nonce=None):
+    def decrypt_AES_GCM(
+        encryptedMsg, password, kdf_salt=None, nonce=None, kdf_cost=DEFAULT_KDF_COST
+    ):
         """Used for decryption of msg"""
 
         (stored_kdf_salt, ciphertext, stored_nonce, auth_tag) = encryptedMsg
         kdf_salt = kdf_salt or stored_kdf_salt
         nonce = nonce or stored_nonce
 
-        secret_key = Crypto.generate_key(kdf_salt, password)
+        secret_key = Crypto.generate_key(kdf_salt, password, iterations=kdf_cost)
         aes_cipher = AES.new(secret_key, AES.MODE_GCM, nonce=nonce)
         plaintext = aes_cipher.decrypt_and_verify(ciphertext, auth_tag)
 
@@ -40,10 +60,54 @@ class Crypto:
         return plaintext
 
     @staticmethod
-    def generate_key(kdf_salt, password, iterations=16384, r=8, p=1, buflen=32):
-        """Generates the key that is used for encryption/decryption"""
+    def validate_kdf_cost(kdf_cost):
+        """Raises ValueError if kdf_cost can not be used as scrypt cost"""
+
+        if not isinstance(kdf_cost, int) or kdf_cost < 2 or kdf_cost & (kdf_cost - 1):
+            raise ValueError(
+                "KDF cost must be a power of 2 greater than 1, got {}".format(kdf_cost)
+            )
+
+    @staticmethod
+    def generate_key(
+        kdf_salt, password, iterations=DEFAULT_KDF_COST, r=8, p=1, buflen=32
+    ):
+        """Generates the key that is used for encryption/decryption.
+        Keys are cached in process, so repeated lookups of a secret skip scrypt"""
 
+        if isinstance(password, str):
+            password = password.encode()
+
+        # Cache holds digest of password, not the password itself
+        cache_key = (
+            bytes(kdf_salt),
+            hashlib.sha256(password).digest(),
+            iterations,
+            r,
+            p,
+            buflen,
+        )
+        with Crypto._KEY_CACHE_LOCK:
+            secret_key = Crypto._KEY_CACHE.get(cache_key)
+            if secret_key is not None:
+                Crypto._KEY_CACHE.move_to_end(cache_key)
+                return secret_key
+
+        Crypto.validate_kdf_cost(iterations)
         secret_key = scrypt.hash(
             password, kdf_salt, N=iterations, r=r, p=p, buflen=buflen
         )
+
+        with Crypto._KEY_CACHE_LOCK:
+            Crypto._KEY_CACHE[cache_key] = secret_key
+            while len(Crypto._KEY_CACHE) > KEY_CACHE_SIZE:
+                Crypto._KEY_CACHE.popitem(last=False)
+
         return secret_key
+
+    @staticmethod
+    def clear_key_cache():
+        """Removes the derived keys cached in process"""
+
+        with Crypto._KEY_CACHE_LOCK:
+            Crypto._KEY_CACHE.clear()
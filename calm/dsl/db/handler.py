@@ -1,8 +1,11 @@
 import atexit
 import os
 
+from playhouse.migrate import SqliteMigrator, migrate
+
 from calm.dsl.config import get_context
 from .table_config import dsl_database, SecretTable, DataTable, VersionTable
+from .table_config import CacheSyncStateTable
 from .table_config import CacheTableBase
 from calm.dsl.log import get_logging_handle
 
@@ -32,7 +35,9 @@ class Database:
         self.connect()
         self.secret_table = self.set_and_verify(SecretTable)
         self.data_table = self.set_and_verify(DataTable)
+        self.add_missing_columns(DataTable)
         self.version_table = self.set_and_verify(VersionTable)
+        self.sync_state_table = self.set_and_verify(CacheSyncStateTable)
 
         for table_type, table in CacheTableBase.tables.items():
             setattr(self, table_type, self.set_and_verify(table))
@@ -51,6 +56,27 @@ class Database:
 
         return table_cls
 
+    def add_missing_columns(self, table_cls):
+        """Adds columns of table_cls missing in db table, created by older
+        versions. Existing rows get default value of the field"""
+
+        table_name = table_cls._meta.table_name
+        columns = [column.name for column in self.db.get_columns(table_name)]
+
+        operations = []
+        migrator = SqliteMigrator(self.db)
+        for field in table_cls._meta.sorted_fields:
+            if field.column_name not in columns:
+                LOG.debug(
+                    "Adding column {} to table {}".format(field.column_name, table_name)
+                )
+                operations.append(
+                    migrator.add_column(table_name, field.column_name, field)
+                )
+
+        if operations:
+            migrate(*operations)
+
     def is_closed(self):
         """return True if db connection is closed else False"""
 
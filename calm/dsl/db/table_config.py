@@ -9,7 +9,9 @@ from peewee import (
     CompositeKey,
     DoesNotExist,
     IntegerField,
+    BigIntegerField,
 )
+from concurrent.futures import ThreadPoolExecutor
 import datetime
 import click
 import arrow
@@ -21,11 +23,20 @@ from calm.dsl.api import get_resource_api, get_api_client
 from calm.dsl.config import get_context
 from calm.dsl.log import get_logging_handle
 from calm.dsl.constants import CACHE
+from calm.dsl.crypto import DEFAULT_KDF_COST
 
 LOG = get_logging_handle(__name__)
 # Proxy database
 dsl_database = SqliteDatabase(None)
 
+# Max host parameters allowed in a single sqlite statement (older sqlite builds)
+SQLITE_MAX_VARIABLES = 999
+
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+# Upper bound on parallel subnet/cluster/vpc calls for nutanix_pc accounts
+PC_ACCOUNT_FETCH_MAX_WORKERS = 8
+
 
 class BaseModel(Model):
     class Meta:
@@ -55,10 +66,52 @@ class DataTable(BaseModel):
     auth_tag = BlobField()
     pass_phrase = BlobField()
 
+    # scrypt cost used for deriving key of secret
+    kdf_cost = IntegerField(default=DEFAULT_KDF_COST)
+
     def generate_enc_msg(self):
         return (self.kdf_salt, self.ciphertext, self.iv, self.auth_tag)
 
 
+class CacheSyncStateTable(BaseModel):
+    """Stores the high-water mark of last sync for cache tables supporting delta sync"""
+
+    name = CharField(primary_key=True)
+    schema = CharField()
+    high_water_mark = BigIntegerField(default=0)
+    total_matches = IntegerField(default=0)
+    last_update_time = DateTimeField(default=datetime.datetime.now())
+
+    def get_detail_dict(self):
+        return {
+            "name": self.name,
+            "schema": self.schema,
+            "high_water_mark": self.high_water_mark,
+            "total_matches": self.total_matches,
+            "last_update_time": self.last_update_time,
+        }
+
+
+class CacheSyncData:
+    """Data fetched from server for a cache table sync
+
+    Args:
+        entries (list): kwargs to be supplied to create_entry helper
+        changed_uuids (list): uuids of entities changed since last sync.
+            None denotes that entries replace the whole table data.
+        sync_state (dict): high-water mark details to be stored after sync
+    """
+
+    def __init__(self, entries, changed_uuids=None, sync_state=None):
+        self.entries = entries
+        self.changed_uuids = changed_uuids
+        self.sync_state = sync_state
+
+    @property
+    def is_delta(self):
+        return self.changed_uuids is not None
+
+
 class CacheTableBase(BaseModel):
     tables = {}
 
@@ -100,9 +153,8 @@ class CacheTableBase(BaseModel):
     @classmethod
     def clear(cls):
         """removes entire data from table"""
-        raise NotImplementedError(
-            "clear helper not implemented for {} table".format(cls.get_cache_type())
-        )
+
+        cls.delete().execute()
 
     @classmethod
     def show_data(cls):
@@ -111,19 +163,258 @@ class CacheTableBase(BaseModel):
         )
 
     @classmethod
-    def sync(cls):
-        raise NotImplementedError(
-            "sync helper not implemented for {} table".format(cls.get_cache_type())
-        )
+    def get_list_api(cls):
+        """returns (ResourceAPI object, base list params) used to list the
+        entities of this table. Tables listing entities from a single v3 list
+        api (supporting `_last_update_time_usecs` filter) can do delta sync"""
+
+        return None
 
     @classmethod
-    def create_entry(cls, name, uuid, **kwargs):
+    def supports_delta_sync(cls):
+        """returns True if only entities changed since last sync can be fetched.
+        Tables whose rows depend on data of other entities must sync fully"""
+
+        return bool(cls.get_list_api())
+
+    @classmethod
+    def get_list_fields(cls):
+        """returns dotted field paths of entities used by get_entries helper.
+        Listed entities are reduced to these while being decoded, so that
+        memory used by sync does not grow with entity size. None keeps all"""
+
+        return None
+
+    @classmethod
+    def get_entries(cls, entities):
+        """returns kwargs for create_entry helper for supplied server entities"""
+
         raise NotImplementedError(
-            "create_entry helper not implemented for {} table".format(
+            "get_entries helper not implemented for {} table".format(
                 cls.get_cache_type()
             )
         )
 
+    @classmethod
+    def fetch_data(cls):
+        """fetches the table data from server without touching the db.
+        Returns list of kwargs to be supplied to create_entry helper"""
+
+        list_api = cls.get_list_api()
+        if not list_api:
+            raise NotImplementedError(
+                "fetch_data helper not implemented for {} table".format(
+                    cls.get_cache_type()
+                )
+            )
+
+        Obj, params = list_api
+        return cls.get_entries(
+            Obj.list_all(base_params=params, fields=cls.get_list_fields())
+        )
+
+    @classmethod
+    def get_schema_signature(cls):
+        """returns signature of table columns. Delta sync state stored with
+        different signature is discarded"""
+
+        return ",".join(sorted(cls._meta.fields.keys()))
+
+    @classmethod
+    def get_sync_state(cls):
+        """returns stored delta sync state of table, None if it is not usable"""
+
+        if not cls.supports_delta_sync():
+            return None
+
+        try:
+            state = CacheSyncStateTable.get(
+                CacheSyncStateTable.name == cls.get_cache_type()
+            )
+        except DoesNotExist:
+            return None
+
+        if state.schema != cls.get_schema_signature():
+            LOG.debug(
+                "Schema changed for {} table, delta sync not possible".format(
+                    cls.get_cache_type()
+                )
+            )
+            return None
+
+        return state.get_detail_dict()
+
+    @classmethod
+    def fetch_sync_data(cls, sync_state=None):
+        """fetches the table data from server. If sync_state is supplied, only
+        entities changed since last sync are fetched where possible.
+        Returns CacheSyncData object"""
+
+        if not cls.supports_delta_sync():
+            return CacheSyncData(cls.fetch_data())
+
+        Obj, params = cls.get_list_api()
+        if sync_state:
+            sync_data = cls.fetch_delta_sync_data(Obj, params, sync_state)
+            if sync_data:
+                return sync_data
+
+            LOG.debug(
+                "Delta sync not possible for {} table, doing full sync".format(
+                    cls.get_cache_type()
+                )
+            )
+
+        entities = Obj.list_all(base_params=params, fields=cls.get_list_fields())
+        return CacheSyncData(
+            cls.get_entries(entities),
+            sync_state={
+                "high_water_mark": max(
+                    [get_entity_time_usecs(e, "last_update_time") for e in entities],
+                    default=0,
+                ),
+                "total_matches": len(entities),
+            },
+        )
+
+    @classmethod
+    def fetch_delta_sync_data(cls, Obj, params, sync_state):
+        """fetches entities updated since the stored high-water mark.
+        Returns None if server can't filter them or entities got deleted since
+        last sync, as deletions can't be listed by update time"""
+
+        high_water_mark = sync_state["high_water_mark"]
+        base_filter = params.get("filter", "")
+        delta_filter = "_last_update_time_usecs=ge={}".format(high_water_mark)
+
+        delta_params = params.copy()
+        delta_params["filter"] = ";".join(filter(None, [base_filter, delta_filter]))
+        entities, err = Obj.list_all(
+            base_params=delta_params, ignore_error=True, fields=cls.get_list_fields()
+        )
+        if err:
+            LOG.debug("Failed to list updated entities: {}".format(err))
+            return None
+
+        # Servers not supporting the filter return entities not updated since last sync
+        entity_times = [get_entity_time_usecs(e, "last_update_time") for e in entities]
+        if any(_t < high_water_mark for _t in entity_times):
+            return None
+
+        count_params = {"length": 1, "offset": 0}
+        if base_filter:
+            count_params["filter"] = base_filter
+        res, err = Obj.list(count_params, ignore_error=True)
+        if err:
+            return None
+
+        total_matches = res.json()["metadata"]["total_matches"]
+        new_entities = [
+            e
+            for e in entities
+            if get_entity_time_usecs(e, "creation_time") > high_water_mark
+        ]
+        if total_matches != sync_state["total_matches"] + len(new_entities):
+            LOG.debug(
+                "Entities deleted since last sync of {} table".format(
+                    cls.get_cache_type()
+                )
+            )
+            return None
+
+        return CacheSyncData(
+            cls.get_entries(entities) if entities else [],
+            changed_uuids=[e["metadata"]["uuid"] for e in entities],
+            sync_state={
+                "high_water_mark": max(entity_times + [high_water_mark]),
+                "total_matches": total_matches,
+            },
+        )
+
+    @classmethod
+    def apply_data(cls, entries):
+        """replaces the table data with supplied entries in one transaction"""
+
+        cls.apply_sync_data(CacheSyncData(entries))
+
+    @classmethod
+    def apply_sync_data(cls, sync_data):
+        """writes the CacheSyncData to table in one transaction"""
+
+        with dsl_database.atomic():
+            if sync_data.is_delta:
+                # Rows of changed entities are replaced by latest data
+                for i in range(0, len(sync_data.changed_uuids), SQLITE_MAX_VARIABLES):
+                    chunk = sync_data.changed_uuids[i : i + SQLITE_MAX_VARIABLES]
+                    cls.delete().where(cls.uuid.in_(chunk)).execute()
+            else:
+                cls.clear()
+
+            cls.create_entries(sync_data.entries)
+
+            cls.update_sync_state(sync_data.sync_state)
+
+    @classmethod
+    def update_sync_state(cls, sync_state):
+        """stores the delta sync state for table. Removes it if not supplied"""
+
+        CacheSyncStateTable.delete().where(
+            CacheSyncStateTable.name == cls.get_cache_type()
+        ).execute()
+
+        if sync_state:
+            CacheSyncStateTable.create(
+                name=cls.get_cache_type(),
+                schema=cls.get_schema_signature(),
+                high_water_mark=sync_state["high_water_mark"],
+                total_matches=sync_state["total_matches"],
+                last_update_time=datetime.datetime.now(),
+            )
+
+    @classmethod
+    def sync(cls):
+        """sync the table from server"""
+
+        cls.apply_sync_data(cls.fetch_sync_data())
+
+    @classmethod
+    def build_row(cls, name, uuid, **kwargs):
+        """returns the column values of table row for supplied entry"""
+
+        raise NotImplementedError(
+            "build_row helper not implemented for {} table".format(cls.get_cache_type())
+        )
+
+    @classmethod
+    def create_entry(cls, name, uuid, **kwargs):
+        """creates a single row in table"""
+
+        cls.create(**cls.build_row(name, uuid, **kwargs))
+
+    @classmethod
+    def create_entries(cls, entries, batch_size=None):
+        """creates rows for multiple entries using batched insert statements
+        inside a single transaction"""
+
+        fields = cls._meta.fields
+        rows = []
+        for entry in entries:
+            row = cls.build_row(**entry)
+
+            # insert_many needs same columns in every row
+            for field_name, field in fields.items():
+                if field_name not in row:
+                    default = field.default
+                    row[field_name] = default() if callable(default) else default
+
+            rows.append(row)
+
+        # Keep the statement within sqlite host parameters limit
+        batch_size = batch_size or max(1, SQLITE_MAX_VARIABLES // len(fields))
+        with dsl_database.atomic():
+            for i in range(0, len(rows), batch_size):
+                cls.insert_many(rows[i : i + batch_size]).execute()
+
     @classmethod
     def get_entity_data(cls, name, **kwargs):
         raise NotImplementedError(
@@ -192,12 +483,6 @@ class AccountCache(CacheTableBase):
             "last_update_time": self.last_update_time,
         }
 
-    @classmethod
-    def clear(cls):
-        """removes entire data from table"""
-        for db_entity in cls.select():
-            db_entity.delete_instance()
-
     @classmethod
     def show_data(cls):
         """display stored data in table"""
@@ -225,7 +510,7 @@ class AccountCache(CacheTableBase):
         click.echo(table)
 
     @classmethod
-    def create_entry(cls, name, uuid, **kwargs):
+    def build_row(cls, name, uuid, **kwargs):
         provider_type = kwargs.get("provider_type", "")
         if not provider_type:
             LOG.error("Provider type not supplied for fetching user {}".format(name))
@@ -235,7 +520,7 @@ class AccountCache(CacheTableBase):
         data = kwargs.get("data", "{}")
         state = kwargs.get("state", "")
 
-        super().create(
+        return dict(
             name=name,
             uuid=uuid,
             provider_type=provider_type,
@@ -245,11 +530,8 @@ class AccountCache(CacheTableBase):
         )
 
     @classmethod
-    def sync(cls):
-        """sync the table from server"""
-
-        # clear old data
-        cls.clear()
+    def fetch_data(cls):
+        """fetches the table data from server"""
 
         client = get_api_client()
         payload = {
@@ -260,6 +542,7 @@ class AccountCache(CacheTableBase):
         if err:
             raise Exception("[{}] - {}".format(err["code"], err["error"]))
 
+        entries = []
         res = res.json()
         for entity in res.get("entities", []):
             provider_type = entity["status"]["resources"]["type"]
@@ -293,7 +576,9 @@ class AccountCache(CacheTableBase):
                 ]
 
             query_obj["data"] = json.dumps(data)
-            cls.create_entry(**query_obj)
+            entries.append(query_obj)
+
+        return entries
 
     @classmethod
     def get_entity_data(cls, name, **kwargs):
@@ -344,12 +629,6 @@ class AhvClustersCache(CacheTableBase):
             "last_update_time": self.last_update_time,
         }
 
-    @classmethod
-    def clear(cls):
-        """removes entire data from table"""
-        for db_entity in cls.select():
-            db_entity.delete_instance()
-
     @classmethod
     def show_data(cls):
         """display stored data in table"""
@@ -383,20 +662,20 @@ class AhvClustersCache(CacheTableBase):
         click.echo(table)
 
     @classmethod
-    def sync(cls):
-        """sync the table from server"""
-
-        # clear old data
-        cls.clear()
+    def fetch_data(cls):
+        """fetches the table data from server"""
 
         client = get_api_client()
         payload = {"length": 250, "filter": "state==VERIFIED;type==nutanix_pc"}
-        account_name_uuid_map = client.account.get_name_uuid_map(payload)
+        pc_accounts = client.account.list_all(base_params=payload)
 
         AhvVmProvider = cls.get_provider_plugin("AHV_VM")
         AhvObj = AhvVmProvider.get_api_obj()
 
-        for pc_acc_name, pc_acc_uuid in account_name_uuid_map.items():
+        entries = []
+        for pc_account in pc_accounts:
+            pc_acc_name = pc_account["status"]["name"]
+            pc_acc_uuid = pc_account["metadata"]["uuid"]
             try:
                 res = AhvObj.clusters(account_uuid=pc_acc_uuid)
             except Exception:
@@ -407,10 +686,17 @@ class AhvClustersCache(CacheTableBase):
                 )
                 continue
 
-            # TODO the order of cache sync is how their model is defined in table_config.py file
-            account = AccountCache.get(uuid=pc_acc_uuid)
-            account_clusters_data = json.loads(account.data).get("clusters", {})
-            account_clusters_data_rev = {v: k for k, v in account_clusters_data.items()}
+            # Map cluster name to PE account uuid using the PC account's cluster references
+            account_clusters_data_rev = {}
+            for pe_acc in (
+                pc_account["status"]["resources"]
+                .get("data", {})
+                .get("cluster_account_reference_list", [])
+            ):
+                cluster_name = (
+                    pe_acc.get("resources", {}).get("data", {}).get("cluster_name", "")
+                )
+                account_clusters_data_rev[cluster_name] = pe_acc["uuid"]
 
             for entity in res.get("entities", []):
                 name = entity["status"]["name"]
@@ -438,17 +724,21 @@ class AhvClustersCache(CacheTableBase):
                     )
                     continue
 
-                cls.create_entry(
-                    name=name,
-                    uuid=uuid,
-                    pe_account_uuid=account_clusters_data_rev.get(name, ""),
-                    account_uuid=pc_acc_uuid,
+                entries.append(
+                    dict(
+                        name=name,
+                        uuid=uuid,
+                        pe_account_uuid=account_clusters_data_rev.get(name, ""),
+                        account_uuid=pc_acc_uuid,
+                    )
                 )
 
+        return entries
+
     @classmethod
-    def create_entry(cls, name, uuid, **kwargs):
+    def build_row(cls, name, uuid, **kwargs):
         """
-        Creates an entry for an AHV PE Cluster.
+        Returns the table row for an AHV PE Cluster.
 
         Args:
             name: Name of the AHV PE cluster.
@@ -464,8 +754,7 @@ class AhvClustersCache(CacheTableBase):
             LOG.error("PE Cluster UUID not supplied for AHV PE Cluster {}".format(name))
             sys.exit(-1)
 
-        # store data in table
-        super().create(
+        return dict(
             name=name,
             uuid=uuid,
             pe_account_uuid=pe_account_uuid,
@@ -534,12 +823,6 @@ class AhvVpcsCache(CacheTableBase):
             "last_update_time": self.last_update_time,
         }
 
-    @classmethod
-    def clear(cls):
-        """removes entire data from table"""
-        for db_entity in cls.select():
-            db_entity.delete_instance()
-
     @classmethod
     def show_data(cls):
         """display stored data in table"""
@@ -583,11 +866,8 @@ class AhvVpcsCache(CacheTableBase):
         click.echo(table)
 
     @classmethod
-    def sync(cls):
-        """sync the table from server"""
-
-        # clear old data
-        cls.clear()
+    def fetch_data(cls):
+        """fetches the table data from server"""
 
         client = get_api_client()
         payload = {"length": 250, "filter": "state==VERIFIED;type==nutanix_pc"}
@@ -597,6 +877,7 @@ class AhvVpcsCache(CacheTableBase):
 
         # Get all Calm vpcs and Tunnels
         calm_vpc_entities = client.network_group.list_all()
+        entries = []
         for pc_acc_name, pc_acc_uuid in account_name_uuid_map.items():
             try:
                 res = AhvObj.vpcs(account_uuid=pc_acc_uuid)
@@ -625,17 +906,21 @@ class AhvVpcsCache(CacheTableBase):
                     {},
                 )
 
-                cls.create_entry(
-                    name=name,
-                    uuid=uuid,
-                    account_uuid=pc_acc_uuid,
-                    tunnel_reference=tunnel_reference,
+                entries.append(
+                    dict(
+                        name=name,
+                        uuid=uuid,
+                        account_uuid=pc_acc_uuid,
+                        tunnel_reference=tunnel_reference,
+                    )
                 )
 
+        return entries
+
     @classmethod
-    def create_entry(cls, name, uuid, **kwargs):
+    def build_row(cls, name, uuid, **kwargs):
         """
-        Creates an entry for an AHV PE Cluster.
+        Returns the table row for an AHV PE Cluster.
 
         Args:
             name: Name of the AHV PE cluster.
@@ -651,8 +936,7 @@ class AhvVpcsCache(CacheTableBase):
             kwargs["tunnel_name"] = tunnel_reference.get("name", "")
             kwargs["tunnel_uuid"] = tunnel_reference.get("uuid", "")
 
-        # store data in table
-        super().create(**kwargs)
+        return kwargs
 
     @classmethod
     def get_entity_data(cls, name, **kwargs):
@@ -719,12 +1003,6 @@ class AhvSubnetsCache(CacheTableBase):
             details["vpc_uuid"] = self.vpc.uuid
         return details
 
-    @classmethod
-    def clear(cls):
-        """removes entire data from table"""
-        for db_entity in cls.select():
-            db_entity.delete_instance()
-
     @classmethod
     def show_data(cls):
         """display stored data in table"""
@@ -766,11 +1044,8 @@ class AhvSubnetsCache(CacheTableBase):
         click.echo(table)
 
     @classmethod
-    def sync(cls):
-        """sync the table from server"""
-
-        # clear old data
-        cls.clear()
+    def fetch_data(cls):
+        """fetches the table data from server"""
 
         client = get_api_client()
         payload = {"length": 250, "filter": "state==VERIFIED;type==nutanix_pc"}
@@ -779,6 +1054,7 @@ class AhvSubnetsCache(CacheTableBase):
         AhvVmProvider = cls.get_provider_plugin("AHV_VM")
         AhvObj = AhvVmProvider.get_api_obj()
 
+        entries = []
         for _, e_uuid in account_name_uuid_map.items():
             try:
                 res = AhvObj.subnets(account_uuid=e_uuid)
@@ -810,20 +1086,23 @@ class AhvSubnetsCache(CacheTableBase):
                         cluster_uuid, vpc_uuid, e_uuid, uuid
                     )
                 )
-                cls.create_entry(
-                    name=name,
-                    uuid=uuid,
-                    subnet_type=subnet_type,
-                    account_uuid=e_uuid,
-                    cluster_uuid=cluster_uuid,
-                    vpc_uuid=vpc_uuid,
+                entries.append(
+                    dict(
+                        name=name,
+                        uuid=uuid,
+                        subnet_type=subnet_type,
+                        account_uuid=e_uuid,
+                        cluster_uuid=cluster_uuid,
+                        vpc_uuid=vpc_uuid,
+                    )
                 )
 
         # For older version < 2.9.0
         # Add working for older versions too
+        return entries
 
     @classmethod
-    def create_entry(cls, name, uuid, **kwargs):
+    def build_row(cls, name, uuid, **kwargs):
         account_uuid = kwargs.get("account_uuid", "")
         if not account_uuid:
             LOG.error("Account UUID not supplied for subnet {}".format(name))
@@ -843,8 +1122,7 @@ class AhvSubnetsCache(CacheTableBase):
         elif vpc_uuid:
             kwargs["vpc"] = vpc_uuid
 
-        # store data in table
-        super().create(**kwargs)
+        return kwargs
 
     @classmethod
     def get_entity_data(cls, name, **kwargs):
@@ -914,12 +1192,6 @@ class AhvImagesCache(CacheTableBase):
             "last_update_time": self.last_update_time,
         }
 
-    @classmethod
-    def clear(cls):
-        """removes entire data from table"""
-        for db_entity in cls.select():
-            db_entity.delete_instance()
-
     @classmethod
     def show_data(cls):
         """display stored data in table"""
@@ -953,10 +1225,8 @@ class AhvImagesCache(CacheTableBase):
         click.echo(table)
 
     @classmethod
-    def sync(cls):
-        """sync the table data from server"""
-        # clear old data
-        cls.clear()
+    def fetch_data(cls):
+        """fetches the table data from server"""
 
         client = get_api_client()
         payload = {"length": 250, "filter": "state==VERIFIED;type==nutanix_pc"}
@@ -965,6 +1235,7 @@ class AhvImagesCache(CacheTableBase):
         AhvVmProvider = cls.get_provider_plugin("AHV_VM")
         AhvObj = AhvVmProvider.get_api_obj()
 
+        entries = []
         for _, e_uuid in account_name_uuid_map.items():
             try:
                 res = AhvObj.images(account_uuid=e_uuid)
@@ -981,20 +1252,26 @@ class AhvImagesCache(CacheTableBase):
                 uuid = entity["metadata"]["uuid"]
                 # TODO add proper validation for karbon images
                 image_type = entity["status"]["resources"].get("image_type", "")
-                cls.create_entry(
-                    name=name, uuid=uuid, image_type=image_type, account_uuid=e_uuid
+                entries.append(
+                    dict(
+                        name=name,
+                        uuid=uuid,
+                        image_type=image_type,
+                        account_uuid=e_uuid,
+                    )
                 )
 
+        return entries
+
     @classmethod
-    def create_entry(cls, name, uuid, **kwargs):
+    def build_row(cls, name, uuid, **kwargs):
         account_uuid = kwargs.get("account_uuid", "")
         if not account_uuid:
             LOG.error("Account UUID not supplied for image {}".format(name))
             sys.exit(-1)
 
         image_type = kwargs.get("image_type", "")
-        # store data in table
-        super().create(
+        return dict(
             name=name, uuid=uuid, image_type=image_type, account_uuid=account_uuid
         )
 
@@ -1064,12 +1341,6 @@ class ProjectCache(CacheTableBase):
             "last_update_time": self.last_update_time,
         }
 
-    @classmethod
-    def clear(cls):
-        """removes entire data from table"""
-        for db_entity in cls.select():
-            db_entity.delete_instance()
-
     @classmethod
     def show_data(cls):
         """display stored data in table"""
@@ -1094,12 +1365,30 @@ class ProjectCache(CacheTableBase):
         click.echo(table)
 
     @classmethod
-    def sync(cls):
-        """sync the table data from server"""
-        # clear old data
-        cls.clear()
+    def get_list_api(cls):
+        client = get_api_client()
+        return client.project, {}
+
+    @classmethod
+    def supports_delta_sync(cls):
+        # Rows depend on accounts and their subnets, clusters and vpcs, that
+        # change without updating the project
+        return False
+
+    @classmethod
+    def get_list_fields(cls):
+        return [
+            "metadata",
+            "status.name",
+            "status.resources",
+            "spec.resources.external_network_list",
+            "spec.resources.subnet_reference_list",
+        ]
+
+    @classmethod
+    def get_entries(cls, entities):
+        """returns the table entries for supplied project entities"""
 
-        # update by latest data
         client = get_api_client()
 
         payload = {"length": 200, "offset": 0, "filter": "state!=DELETED;type!=nutanix"}
@@ -1107,39 +1396,29 @@ class ProjectCache(CacheTableBase):
 
         # store subnets for nutanix_pc accounts in some map, else we had to subnets api
         # for each project (Speed very low in case of ~1000 projects)
-        ntnx_pc_account_subnet_map = dict()
-        ntnx_pc_account_vpc_map = dict()
-        ntnx_pc_account_cluster_map = dict()
+        pc_account_uuids = [
+            _acct_uuid
+            for _acct_uuid, _acct_type in account_uuid_type_map.items()
+            if _acct_type == "nutanix_pc"
+        ]
+        ntnx_pc_account_subnet_map = {_uuid: set() for _uuid in pc_account_uuids}
+        ntnx_pc_account_vpc_map = {_uuid: set() for _uuid in pc_account_uuids}
+        ntnx_pc_account_cluster_map = {_uuid: set() for _uuid in pc_account_uuids}
         ntnx_pc_subnet_cluster_map = dict()
         ntnx_pc_subnet_vpc_map = dict()
-        for _acct_uuid in account_uuid_type_map.keys():
-            if account_uuid_type_map[_acct_uuid] == "nutanix_pc":
-                ntnx_pc_account_subnet_map[_acct_uuid] = list()
-                ntnx_pc_account_vpc_map[_acct_uuid] = list()
-                ntnx_pc_account_cluster_map[_acct_uuid] = list()
 
-        # Get the subnets for each nutanix_pc account
-        AhvVmProvider = cls.get_provider_plugin("AHV_VM")
-        AhvObj = AhvVmProvider.get_api_obj()
-        for acct_uuid in ntnx_pc_account_subnet_map.keys():
-            LOG.debug(
-                "Fetching subnets for nutanix_pc account_uuid {}".format(acct_uuid)
-            )
-            res = {}
-            try:
-                res = AhvObj.subnets(account_uuid=acct_uuid)
-            except Exception as exp:
-                LOG.exception(exp)
-                LOG.warning(
-                    "Unable to fetch subnets for Nutanix_PC Account(uuid={})".format(
-                        acct_uuid
-                    )
-                )
+        # Get the subnets, clusters and vpcs for each nutanix_pc account
+        pc_account_data = cls.fetch_pc_accounts_data(pc_account_uuids)
+        for acct_uuid in pc_account_uuids:
+            subnets = pc_account_data[(acct_uuid, "subnets")]
+
+            # Clusters and vpcs are not whitelisted if subnets can't be fetched
+            if subnets is None:
                 continue
 
-            for row in res.get("entities", []):
+            for row in subnets:
                 _sub_uuid = row["metadata"]["uuid"]
-                ntnx_pc_account_subnet_map[acct_uuid].append(_sub_uuid)
+                ntnx_pc_account_subnet_map[acct_uuid].add(_sub_uuid)
                 if row["status"]["resources"]["subnet_type"] == "VLAN":
                     ntnx_pc_subnet_cluster_map[_sub_uuid] = row["status"][
                         "cluster_reference"
@@ -1149,42 +1428,14 @@ class ProjectCache(CacheTableBase):
                         "vpc_reference"
                     ]["uuid"]
 
-            LOG.debug(
-                "Fetching clusters for nutanix_pc account_uuid {}".format(acct_uuid)
-            )
-            res = {}
-            try:
-                res = AhvObj.clusters(account_uuid=acct_uuid)
-            except Exception as exp:
-                LOG.exception(exp)
-                LOG.warning(
-                    "Unable to fetch clusters for Nutanix_PC Account(uuid={})".format(
-                        acct_uuid
-                    )
-                )
-            for row in res.get("entities", []):
-                ntnx_pc_account_cluster_map[acct_uuid].append(row["metadata"]["uuid"])
-
-            LOG.debug("Fetching VPCs for nutanix_pc account_uuid {}".format(acct_uuid))
-            res = {}
-            try:
-                res = AhvObj.vpcs(account_uuid=acct_uuid)
-            except Exception as exp:
-                LOG.exception(exp)
-                LOG.warning(
-                    "Unable to fetch VPCs for Nutanix_PC Account(uuid={})".format(
-                        acct_uuid
-                    )
-                )
-            for row in res.get("entities", []):
-                ntnx_pc_account_vpc_map[acct_uuid].append(row["metadata"]["uuid"])
+            for row in pc_account_data[(acct_uuid, "clusters")] or []:
+                ntnx_pc_account_cluster_map[acct_uuid].add(row["metadata"]["uuid"])
 
-        # Getting projects data
-        res_entities, err = client.project.list_all(ignore_error=True)
-        if err:
-            LOG.exception(err)
+            for row in pc_account_data[(acct_uuid, "VPCs")] or []:
+                ntnx_pc_account_vpc_map[acct_uuid].add(row["metadata"]["uuid"])
 
-        for entity in res_entities:
+        entries = []
+        for entity in entities:
             # populating a map to lookup the account to which a subnet belongs
             whitelisted_subnets = dict()
             whitelisted_clusters = dict()
@@ -1197,21 +1448,21 @@ class ProjectCache(CacheTableBase):
                 "account_reference_list", []
             )
 
-            cluster_uuids = [
+            cluster_uuids = {
                 cluster["uuid"]
                 for cluster in entity["status"]["resources"].get(
                     "cluster_reference_list", []
                 )
-            ]
-            vpc_uuids = [
+            }
+            vpc_uuids = {
                 vpc["uuid"]
                 for vpc in entity["status"]["resources"].get("vpc_reference_list", [])
-            ]
+            }
 
             project_subnets_ref_list = entity["spec"].get("resources", {}).get(
                 "external_network_list", []
             ) + entity["spec"].get("resources", {}).get("subnet_reference_list", [])
-            project_subnet_uuids = [item["uuid"] for item in project_subnets_ref_list]
+            project_subnet_uuids = {item["uuid"] for item in project_subnets_ref_list}
 
             account_map = {}
             for account in account_list:
@@ -1229,31 +1480,27 @@ class ProjectCache(CacheTableBase):
 
                 # for PC accounts add subnets to subnet_to_account_map. Will use it to populate whitelisted_subnets
                 if account_type == "nutanix_pc":
-                    whitelisted_subnets[account_uuid] = list(
-                        set(project_subnet_uuids)
-                        & set(ntnx_pc_account_subnet_map[account_uuid])
+                    account_subnet_uuids = (
+                        project_subnet_uuids & ntnx_pc_account_subnet_map[account_uuid]
                     )
+                    whitelisted_subnets[account_uuid] = list(account_subnet_uuids)
 
-                    for _subnet_uuid in whitelisted_subnets[account_uuid]:
+                    for _subnet_uuid in account_subnet_uuids:
                         _subnet_cluster_uuid = ntnx_pc_subnet_cluster_map.get(
                             _subnet_uuid
                         )
-                        if (
-                            _subnet_cluster_uuid
-                            and _subnet_cluster_uuid not in cluster_uuids
-                        ):
-                            cluster_uuids.append(_subnet_cluster_uuid)
+                        if _subnet_cluster_uuid:
+                            cluster_uuids.add(_subnet_cluster_uuid)
                         _subnet_vpc_uuid = ntnx_pc_subnet_vpc_map.get(_subnet_uuid)
-                        if _subnet_vpc_uuid and _subnet_vpc_uuid not in vpc_uuids:
-                            vpc_uuids.append(_subnet_vpc_uuid)
+                        if _subnet_vpc_uuid:
+                            vpc_uuids.add(_subnet_vpc_uuid)
 
                     whitelisted_vpcs[account_uuid] = list(
-                        set(vpc_uuids) & set(ntnx_pc_account_vpc_map[account_uuid])
+                        vpc_uuids & ntnx_pc_account_vpc_map[account_uuid]
                     )
 
                     whitelisted_clusters[account_uuid] = list(
-                        set(cluster_uuids)
-                        & set(ntnx_pc_account_cluster_map[account_uuid])
+                        cluster_uuids & ntnx_pc_account_cluster_map[account_uuid]
                     )
 
             accounts_data = json.dumps(account_map)
@@ -1261,22 +1508,26 @@ class ProjectCache(CacheTableBase):
             whitelisted_subnets = json.dumps(whitelisted_subnets)
             whitelisted_clusters = json.dumps(whitelisted_clusters)
             whitelisted_vpcs = json.dumps(whitelisted_vpcs)
-            cls.create_entry(
-                name=name,
-                uuid=uuid,
-                accounts_data=accounts_data,
-                whitelisted_subnets=whitelisted_subnets,
-                whitelisted_clusters=whitelisted_clusters,
-                whitelisted_vpcs=whitelisted_vpcs,
+            entries.append(
+                dict(
+                    name=name,
+                    uuid=uuid,
+                    accounts_data=accounts_data,
+                    whitelisted_subnets=whitelisted_subnets,
+                    whitelisted_clusters=whitelisted_clusters,
+                    whitelisted_vpcs=whitelisted_vpcs,
+                )
             )
 
+        return entries
+
     @classmethod
-    def create_entry(cls, name, uuid, **kwargs):
+    def build_row(cls, name, uuid, **kwargs):
         accounts_data = kwargs.get("accounts_data", "{}")
         whitelisted_subnets = kwargs.get("whitelisted_subnets", "[]")
         whitelisted_clusters = kwargs.get("whitelisted_clusters", "[]")
         whitelisted_vpcs = kwargs.get("whitelisted_vpcs", "[]")
-        super().create(
+        return dict(
             name=name,
             uuid=uuid,
             accounts_data=accounts_data,
@@ -1285,6 +1536,50 @@ class ProjectCache(CacheTableBase):
             whitelisted_vpcs=whitelisted_vpcs,
         )
 
+    @classmethod
+    def fetch_pc_accounts_data(cls, account_uuids):
+        """fetches subnets, clusters and vpcs of nutanix_pc accounts concurrently.
+        Returns map of (account_uuid, entity_type) to the list of entities,
+        None is stored for the calls that failed"""
+
+        AhvVmProvider = cls.get_provider_plugin("AHV_VM")
+        AhvObj = AhvVmProvider.get_api_obj()
+        fetch_helpers = {
+            "subnets": AhvObj.subnets,
+            "clusters": AhvObj.clusters,
+            "VPCs": AhvObj.vpcs,
+        }
+
+        def fetch(account_uuid, entity_type):
+            LOG.debug(
+                "Fetching {} for nutanix_pc account_uuid {}".format(
+                    entity_type, account_uuid
+                )
+            )
+            try:
+                res = fetch_helpers[entity_type](account_uuid=account_uuid)
+            except Exception as exp:
+                LOG.exception(exp)
+                LOG.warning(
+                    "Unable to fetch {} for Nutanix_PC Account(uuid={})".format(
+                        entity_type, account_uuid
+                    )
+                )
+                return None
+
+            return (res or {}).get("entities", [])
+
+        with ThreadPoolExecutor(max_workers=PC_ACCOUNT_FETCH_MAX_WORKERS) as executor:
+            futures = {
+                (account_uuid, entity_type): executor.submit(
+                    fetch, account_uuid, entity_type
+                )
+                for account_uuid in account_uuids
+                for entity_type in fetch_helpers
+            }
+
+        return {key: future.result() for key, future in futures.items()}
+
     @classmethod
     def get_entity_data(cls, name, **kwargs):
         query_obj = {"name": name}
@@ -1516,12 +1811,6 @@ class EnvironmentCache(CacheTableBase):
             "last_update_time": self.last_update_time,
         }
 
-    @classmethod
-    def clear(cls):
-        """removes entire data from table"""
-        for db_entity in cls.select():
-            db_entity.delete_instance()
-
     @classmethod
     def show_data(cls):
         """display stored data in table"""
@@ -1547,16 +1836,20 @@ class EnvironmentCache(CacheTableBase):
         click.echo(table)
 
     @classmethod
-    def sync(cls):
-        """sync the table data from server"""
-        # clear old data
-        cls.clear()
-
-        # update by latest data
+    def get_list_api(cls):
         client = get_api_client()
+        return client.environment, {}
 
-        env_list = client.environment.list_all()
-        for entity in env_list:
+    @classmethod
+    def get_list_fields(cls):
+        return ["metadata", "status.name", "status.resources.infra_inclusion_list"]
+
+    @classmethod
+    def get_entries(cls, entities):
+        """returns the table entries for supplied environment entities"""
+
+        entries = []
+        for entity in entities:
             name = entity["status"]["name"]
             uuid = entity["metadata"]["uuid"]
             project_uuid = (
@@ -1633,16 +1926,20 @@ class EnvironmentCache(CacheTableBase):
                 account_map[account_type].append(account_data)
 
             accounts_data = json.dumps(account_map)
-            cls.create_entry(
-                name=name,
-                uuid=uuid,
-                accounts_data=accounts_data,
-                project_uuid=project_uuid,
+            entries.append(
+                dict(
+                    name=name,
+                    uuid=uuid,
+                    accounts_data=accounts_data,
+                    project_uuid=project_uuid,
+                )
             )
 
+        return entries
+
     @classmethod
-    def create_entry(cls, name, uuid, **kwargs):
-        super().create(
+    def build_row(cls, name, uuid, **kwargs):
+        return dict(
             name=name,
             uuid=uuid,
             accounts_data=kwargs.get("accounts_data", "{}"),
@@ -1806,12 +2103,6 @@ class UsersCache(CacheTableBase):
             "last_update_time": self.last_update_time,
         }
 
-    @classmethod
-    def clear(cls):
-        """removes entire data from table"""
-        for db_entity in cls.select():
-            db_entity.delete_instance()
-
     @classmethod
     def show_data(cls):
         """display stored data in table"""
@@ -1845,7 +2136,7 @@ class UsersCache(CacheTableBase):
         click.echo(table)
 
     @classmethod
-    def create_entry(cls, name, uuid, **kwargs):
+    def build_row(cls, name, uuid, **kwargs):
         directory = kwargs.get("directory", "")
         if not directory:
             LOG.error(
@@ -1854,20 +2145,29 @@ class UsersCache(CacheTableBase):
             sys.exit(-1)
 
         display_name = kwargs.get("display_name") or ""
-        super().create(
+        return dict(
             name=name, uuid=uuid, directory=directory, display_name=display_name
         )
 
     @classmethod
-    def sync(cls):
-        """sync the table from server"""
+    def get_list_api(cls):
+        client = get_api_client()
+        return client.user, {"length": 500}
 
-        # clear old data
-        cls.clear()
+    @classmethod
+    def get_list_fields(cls):
+        return [
+            "metadata",
+            "status.name",
+            "status.resources.display_name",
+            "status.resources.directory_service_user",
+        ]
 
-        client = get_api_client()
-        entities = client.user.list_all(api_limit=500)
+    @classmethod
+    def get_entries(cls, entities):
+        """returns the table entries for supplied user entities"""
 
+        entries = []
         for entity in entities:
 
             name = entity["status"]["name"]
@@ -1882,13 +2182,17 @@ class UsersCache(CacheTableBase):
             directory_service_name = directory_service_ref.get("name", "LOCAL")
 
             if directory_service_name:
-                cls.create_entry(
-                    name=name,
-                    uuid=uuid,
-                    display_name=display_name,
-                    directory=directory_service_name,
+                entries.append(
+                    dict(
+                        name=name,
+                        uuid=uuid,
+                        display_name=display_name,
+                        directory=directory_service_name,
+                    )
                 )
 
+        return entries
+
     @classmethod
     def get_entity_data(cls, name, **kwargs):
 
@@ -1993,12 +2297,6 @@ class RolesCache(CacheTableBase):
             "last_update_time": self.last_update_time,
         }
 
-    @classmethod
-    def clear(cls):
-        """removes entire data from table"""
-        for db_entity in cls.select():
-            db_entity.delete_instance()
-
     @classmethod
     def show_data(cls):
         """display stored data in table"""
@@ -2024,15 +2322,12 @@ class RolesCache(CacheTableBase):
         click.echo(table)
 
     @classmethod
-    def create_entry(cls, name, uuid, **kwargs):
-        super().create(name=name, uuid=uuid)
+    def build_row(cls, name, uuid, **kwargs):
+        return dict(name=name, uuid=uuid)
 
     @classmethod
-    def sync(cls):
-        """sync the table from server"""
-
-        # clear old data
-        cls.clear()
+    def fetch_data(cls):
+        """fetches the table data from server"""
 
         client = get_api_client()
         Obj = get_resource_api("roles", client.connection)
@@ -2040,11 +2335,14 @@ class RolesCache(CacheTableBase):
         if err:
             raise Exception("[{}] - {}".format(err["code"], err["error"]))
 
+        entries = []
         res = res.json()
         for entity in res["entities"]:
             name = entity["status"]["name"]
             uuid = entity["metadata"]["uuid"]
-            cls.create_entry(name=name, uuid=uuid)
+            entries.append(dict(name=name, uuid=uuid))
+
+        return entries
 
     @classmethod
     def get_entity_data(cls, name, **kwargs):
@@ -2114,12 +2412,6 @@ class DirectoryServiceCache(CacheTableBase):
             "last_update_time": self.last_update_time,
         }
 
-    @classmethod
-    def clear(cls):
-        """removes entire data from table"""
-        for db_entity in cls.select():
-            db_entity.delete_instance()
-
     @classmethod
     def show_data(cls):
         """display stored data in table"""
@@ -2145,15 +2437,12 @@ class DirectoryServiceCache(CacheTableBase):
         click.echo(table)
 
     @classmethod
-    def create_entry(cls, name, uuid, **kwargs):
-        super().create(name=name, uuid=uuid)
+    def build_row(cls, name, uuid, **kwargs):
+        return dict(name=name, uuid=uuid)
 
     @classmethod
-    def sync(cls):
-        """sync the table from server"""
-
-        # clear old data
-        cls.clear()
+    def fetch_data(cls):
+        """fetches the table data from server"""
 
         client = get_api_client()
         Obj = get_resource_api("directory_services", client.connection)
@@ -2161,11 +2450,14 @@ class DirectoryServiceCache(CacheTableBase):
         if err:
             raise Exception("[{}] - {}".format(err["code"], err["error"]))
 
+        entries = []
         res = res.json()
         for entity in res["entities"]:
             name = entity["status"]["name"]
             uuid = entity["metadata"]["uuid"]
-            cls.create_entry(name=name, uuid=uuid)
+            entries.append(dict(name=name, uuid=uuid))
+
+        return entries
 
     @classmethod
     def get_entity_data(cls, name, **kwargs):
@@ -2210,12 +2502,6 @@ class UserGroupCache(CacheTableBase):
             "last_update_time": self.last_update_time,
         }
 
-    @classmethod
-    def clear(cls):
-        """removes entire data from table"""
-        for db_entity in cls.select():
-            db_entity.delete_instance()
-
     @classmethod
     def show_data(cls):
         """display stored data in table"""
@@ -2249,7 +2535,7 @@ class UserGroupCache(CacheTableBase):
         click.echo(table)
 
     @classmethod
-    def create_entry(cls, name, uuid, **kwargs):
+    def build_row(cls, name, uuid, **kwargs):
         directory = kwargs.get("directory", "")
         if not directory:
             LOG.error(
@@ -2258,25 +2544,31 @@ class UserGroupCache(CacheTableBase):
             sys.exit(-1)
 
         display_name = kwargs.get("display_name") or ""
-        super().create(
+        return dict(
             name=name, uuid=uuid, directory=directory, display_name=display_name
         )
 
     @classmethod
-    def sync(cls):
-        """sync the table from server"""
-
-        # clear old data
-        cls.clear()
-
+    def get_list_api(cls):
         client = get_api_client()
         Obj = get_resource_api("user_groups", client.connection)
-        res, err = Obj.list({"length": 1000})
-        if err:
-            raise Exception("[{}] - {}".format(err["code"], err["error"]))
+        return Obj, {"length": 1000}
 
-        res = res.json()
-        for entity in res["entities"]:
+    @classmethod
+    def get_list_fields(cls):
+        return [
+            "metadata",
+            "status.state",
+            "status.resources.display_name",
+            "status.resources.directory_service_user_group",
+        ]
+
+    @classmethod
+    def get_entries(cls, entities):
+        """returns the table entries for supplied user group entities"""
+
+        entries = []
+        for entity in entities:
             state = entity["status"]["state"]
             if state != "COMPLETE":
                 continue
@@ -2298,13 +2590,17 @@ class UserGroupCache(CacheTableBase):
             uuid = entity["metadata"]["uuid"]
 
             if directory_service_name and distinguished_name:
-                cls.create_entry(
-                    name=distinguished_name,
-                    uuid=uuid,
-                    display_name=display_name,
-                    directory=directory_service_name,
+                entries.append(
+                    dict(
+                        name=distinguished_name,
+                        uuid=uuid,
+                        display_name=display_name,
+                        directory=directory_service_name,
+                    )
                 )
 
+        return entries
+
     @classmethod
     def get_entity_data(cls, name, **kwargs):
 
@@ -2414,12 +2710,6 @@ class AhvNetworkFunctionChain(CacheTableBase):
             "last_update_time": self.last_update_time,
         }
 
-    @classmethod
-    def clear(cls):
-        """removes entire data from table"""
-        for db_entity in cls.select():
-            db_entity.delete_instance()
-
     @classmethod
     def show_data(cls):
         """display stored data in table"""
@@ -2445,26 +2735,27 @@ class AhvNetworkFunctionChain(CacheTableBase):
         click.echo(table)
 
     @classmethod
-    def sync(cls):
-        # clear old data
-        cls.clear()
+    def fetch_data(cls):
+        """fetches the table data from server"""
 
-        # update by latest data
         client = get_api_client()
         Obj = get_resource_api("network_function_chains", client.connection)
         res, err = Obj.list({"length": 1000})
         if err:
             raise Exception("[{}] - {}".format(err["code"], err["error"]))
 
+        entries = []
         res = res.json()
         for entity in res["entities"]:
             name = entity["status"]["name"]
             uuid = entity["metadata"]["uuid"]
-            cls.create_entry(name=name, uuid=uuid)
+            entries.append(dict(name=name, uuid=uuid))
+
+        return entries
 
     @classmethod
-    def create_entry(cls, name, uuid, **kwargs):
-        super().create(name=name, uuid=uuid)
+    def build_row(cls, name, uuid, **kwargs):
+        return dict(name=name, uuid=uuid)
 
     @classmethod
     def get_entity_data(cls, name, **kwargs):
@@ -2504,12 +2795,6 @@ class AppProtectionPolicyCache(CacheTableBase):
             "last_update_time": self.last_update_time,
         }
 
-    @classmethod
-    def clear(cls):
-        """removes entire data from table"""
-        for db_entity in cls.select():
-            db_entity.delete_instance()
-
     @classmethod
     def show_data(cls):
         """display stored data in table"""
@@ -2549,17 +2834,16 @@ class AppProtectionPolicyCache(CacheTableBase):
         click.echo(table)
 
     @classmethod
-    def sync(cls):
-        # clear old data
-        cls.clear()
+    def fetch_data(cls):
+        """fetches the table data from server"""
 
-        # update by latest data
         client = get_api_client()
         Obj = get_resource_api(
             "app_protection_policies", client.connection, calm_api=True
         )
         entities = Obj.list_all()
 
+        entries = []
         for entity in entities:
             name = entity["status"]["name"]
             uuid = entity["metadata"]["uuid"]
@@ -2583,18 +2867,22 @@ class AppProtectionPolicyCache(CacheTableBase):
                     )
                 rule_name = rule["name"]
                 rule_uuid = rule["uuid"]
-                cls.create_entry(
-                    name=name,
-                    uuid=uuid,
-                    rule_name=rule_name,
-                    rule_uuid=rule_uuid,
-                    project_name=project_reference.get("name", ""),
-                    rule_expiry=expiry,
-                    rule_type=rule_type,
+                entries.append(
+                    dict(
+                        name=name,
+                        uuid=uuid,
+                        rule_name=rule_name,
+                        rule_uuid=rule_uuid,
+                        project_name=project_reference.get("name", ""),
+                        rule_expiry=expiry,
+                        rule_type=rule_type,
+                    )
                 )
 
+        return entries
+
     @classmethod
-    def create_entry(cls, name, uuid, **kwargs):
+    def build_row(cls, name, uuid, **kwargs):
         rule_name = kwargs.get("rule_name", "")
         rule_uuid = kwargs.get("rule_uuid", "")
         rule_expiry = kwargs.get("rule_expiry", 0)
@@ -2607,7 +2895,7 @@ class AppProtectionPolicyCache(CacheTableBase):
                 )
             )
             sys.exit("Missing rule_uuid for protection policy")
-        super().create(
+        return dict(
             name=name,
             uuid=uuid,
             rule_name=rule_name,
@@ -2648,6 +2936,17 @@ class VersionTable(BaseModel):
         return {"name": self.name, "version": self.version}
 
 
+def get_entity_time_usecs(entity, key):
+    """returns metadata timestamp (creation_time/last_update_time) of entity in usecs"""
+
+    timestamp = entity["metadata"].get(key)
+    if not timestamp:
+        return 0
+
+    delta = arrow.get(timestamp).datetime - EPOCH
+    return delta // datetime.timedelta(microseconds=1)
+
+
 def highlight_text(text, **kwargs):
     """Highlight text in our standard format"""
     return click.style("{}".format(text), fg="blue", bold=False, **kwargs)
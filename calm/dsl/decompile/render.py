@@ -1,12 +1,81 @@
-from jinja2 import Environment, PackageLoader
+import os
+
+from jinja2 import Environment, PackageLoader, FileSystemBytecodeCache
+
+from calm.dsl.config import get_context
+from calm.dsl.log import get_logging_handle
+
+LOG = get_logging_handle(__name__)
+
+# Compiled templates are stored in this directory alongside the dsl db
+TEMPLATE_CACHE_DIR = "decompile_templates"
+
+_ENV = None
+
+
+class TemplateBytecodeCache(FileSystemBytecodeCache):
+    """bytecode cache safe to share across parallel runs. Partial or
+    unreadable cache files are treated as cache miss"""
+
+    def load_bytecode(self, bucket):
+        try:
+            super().load_bytecode(bucket)
+        except Exception as exp:
+            LOG.debug("Unable to load compiled template: {}".format(exp))
+            bucket.reset()
+
+    def dump_bytecode(self, bucket):
+        try:
+            cache_file = self._get_cache_filename(bucket)
+
+            # Write to a temporary file first, so that parallel runs never read partial files
+            tmp_file = "{}.{}".format(cache_file, os.getpid())
+            with open(tmp_file, "wb") as fd:
+                bucket.write_bytecode(fd)
+            os.replace(tmp_file, cache_file)
+
+        except Exception as exp:
+            LOG.debug("Unable to save compiled template: {}".format(exp))
+
+
+def _get_bytecode_cache():
+    """returns bytecode cache for templates, None if cache dir is not usable"""
+
+    try:
+        ContextObj = get_context()
+        init_obj = ContextObj.get_init_config()
+        cache_dir = os.path.join(
+            os.path.dirname(init_obj["DB"]["location"]), TEMPLATE_CACHE_DIR
+        )
+        os.makedirs(cache_dir, exist_ok=True)
+
+    except Exception as exp:
+        LOG.debug("Templates will not be cached: {}".format(exp))
+        return None
+
+    return TemplateBytecodeCache(cache_dir)
+
+
+def get_environment():
+    """returns jinja environment shared by all decompile templates. Templates
+    are parsed once per process, and compiled once per install"""
+
+    global _ENV
+    if _ENV is None:
+        _ENV = Environment(
+            loader=PackageLoader(__name__, "schemas"),
+            bytecode_cache=_get_bytecode_cache(),
+            # Templates are shipped with package, so they are not checked for updates
+            auto_reload=False,
+            cache_size=-1,
+        )
+
+    return _ENV
 
 
 def get_template(schema_file):
 
-    loader = PackageLoader(__name__, "schemas")
-    env = Environment(loader=loader)
-    template = env.get_template(schema_file)
-    return template
+    return get_environment().get_template(schema_file)
 
 
 def render_template(schema_file, obj):
@@ -1,10 +1,11 @@
 import logging
-import inspect
 
 from colorlog import ColoredFormatter
 import time
 import sys
 
+from .structured import get_structured_handler, start_structured_logging
+
 
 class StdErrFilter(logging.Filter):
     """Filter for Stderr stream handler"""
@@ -62,19 +63,28 @@ class CustomLogging:
 
         # add console to logger
         self._logger.addHandler(self._ch1)
+        self._handler = self._ch1
 
         # Add show trace option
         self.show_trace = False
 
-    @staticmethod
-    def __add_caller_info(msg):
-        stack = inspect.stack()
+    def __add_caller_info(self, msg, kwargs):
+        # Only the frame of function calling the log method is needed
+        frame = sys._getframe(2)
+
+        if self._handler is not self._ch1:
+            # Structured records keep the caller in separate fields
+            kwargs["extra"] = dict(
+                kwargs.get("extra") or {},
+                caller=(frame.f_code.co_filename, frame.f_code.co_name, frame.f_lineno),
+            )
+            return msg
 
-        # filename = stack[2][1]
-        # func = stack[2][3]
-        ln = stack[2][2]
+        ln = frame.f_lineno
         if CustomLogging.IS_RP_ENABLED:
-            ln = "{}-{}:{}".format(stack[2][1], stack[2][3], stack[2][2])
+            ln = "{}-{}:{}".format(
+                frame.f_code.co_filename, frame.f_code.co_name, frame.f_lineno
+            )
 
         return ":{}] {}".format(ln, msg)
 
@@ -86,9 +96,26 @@ class CustomLogging:
     def enable_show_trace(cls):
         cls._SHOW_TRACE = True
 
+    @classmethod
+    def enable_structured_logging(cls, log_file=None):
+        """writes records of all loggers as newline delimited json to log_file
+        (stderr by default), from a background thread"""
+
+        start_structured_logging(log_file)
+
     def get_logger(self):
-        self.set_logger_level(self._VERBOSE_LEVEL)
+        # Setting level clears the level cache of all loggers, so it is done only on change
+        if self._logger.level != self._VERBOSE_LEVEL:
+            self.set_logger_level(self._VERBOSE_LEVEL)
         self.show_trace = self._SHOW_TRACE
+
+        # Records go to json writer while structured logging is enabled
+        handler = get_structured_handler() or self._ch1
+        if handler is not self._handler:
+            self._logger.removeHandler(self._handler)
+            self._logger.addHandler(handler)
+            self._handler = handler
+
         return self._logger
 
     def get_logging_levels(self):
@@ -98,7 +125,7 @@ class CustomLogging:
         """sets the logger verbose level"""
         self._logger.setLevel(lvl)
 
-    def info(self, msg, nl=True, **kwargs):
+    def info(self, msg, *args, nl=True, **kwargs):
         """
         info log level
 
@@ -110,12 +137,15 @@ class CustomLogging:
             None
         """
         logger = self.get_logger()
+        if not logger.isEnabledFor(logging.INFO):
+            return
 
         if not nl:
             for handler in logger.handlers:
                 handler.terminator = " "
 
-        logger.info(self.__add_caller_info(msg), **kwargs)
+        msg = self.__add_caller_info(msg, kwargs)
+        logger.info(msg, *args, **kwargs)
 
         if not nl:
             for handler in logger.handlers:
@@ -133,7 +163,11 @@ class CustomLogging:
         """
 
         logger = self.get_logger()
-        return logger.warning(self.__add_caller_info(msg), *args, **kwargs)
+        if not logger.isEnabledFor(logging.WARNING):
+            return
+
+        msg = self.__add_caller_info(msg, kwargs)
+        return logger.warning(msg, *args, **kwargs)
 
     def error(self, msg, *args, **kwargs):
         """
@@ -147,9 +181,13 @@ class CustomLogging:
         """
 
         logger = self.get_logger()
+        if not logger.isEnabledFor(logging.ERROR):
+            return
+
         if self.show_trace:
             kwargs["stack_info"] = sys.exc_info()
-        return logger.error(self.__add_caller_info(msg), *args, **kwargs)
+        msg = self.__add_caller_info(msg, kwargs)
+        return logger.error(msg, *args, **kwargs)
 
     def exception(self, msg, *args, **kwargs):
         """
@@ -163,12 +201,14 @@ class CustomLogging:
         """
 
         logger = self.get_logger()
+        if not logger.isEnabledFor(logging.ERROR):
+            return
+
         exc_info = False
         if self.show_trace:
             exc_info = True
-        return logger.exception(
-            self.__add_caller_info(msg), exc_info=exc_info, *args, **kwargs
-        )
+        msg = self.__add_caller_info(msg, kwargs)
+        return logger.exception(msg, exc_info=exc_info, *args, **kwargs)
 
     def critical(self, msg, *args, **kwargs):
         """
@@ -182,9 +222,13 @@ class CustomLogging:
         """
 
         logger = self.get_logger()
+        if not logger.isEnabledFor(logging.CRITICAL):
+            return
+
         if self.show_trace:
             kwargs["stack_info"] = sys.exc_info()
-        return logger.critical(self.__add_caller_info(msg), *args, **kwargs)
+        msg = self.__add_caller_info(msg, kwargs)
+        return logger.critical(msg, *args, **kwargs)
 
     def debug(self, msg, *args, **kwargs):
         """
@@ -198,7 +242,11 @@ class CustomLogging:
         """
 
         logger = self.get_logger()
-        return logger.debug(self.__add_caller_info(msg), *args, **kwargs)
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+
+        msg = self.__add_caller_info(msg, kwargs)
+        return logger.debug(msg, *args, **kwargs)
 
     def __addCustomFormatter(self, ch):
         """
@@ -0,0 +1,206 @@
+import atexit
+import datetime
+import json
+import logging
+import queue
+import sys
+import threading
+from logging.handlers import QueueHandler
+
+
+# Maximum number of records waiting to be written. Records logged while the
+# queue is full are dropped, and counted in a record written at exit
+MAX_QUEUED_RECORDS = 10000
+
+# Maximum number of records written to stream at once
+MAX_BATCH_SIZE = 500
+
+LOG_FORMATS = ["text", "json"]
+
+
+class JSONFormatter(logging.Formatter):
+    """formats records as single line json objects"""
+
+    def format(self, record):
+        data = {
+            "time": datetime.datetime.fromtimestamp(
+                record.created, tz=datetime.timezone.utc
+            ).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+
+        caller = getattr(record, "caller", None)
+        if caller:
+            data["file"], data["func"], data["line"] = caller
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data["exc"] = record.exc_text
+        if record.stack_info:
+            data["stack"] = self.formatStack(record.stack_info)
+
+        return json.dumps(data, default=str)
+
+
+class BoundedQueueHandler(QueueHandler):
+    """queue handler that drops records instead of blocking the caller when
+    the writer can not keep up"""
+
+    def __init__(self, record_queue):
+        super().__init__(record_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Only the message is built in caller thread, json encoding is done by
+        # writer. Other handlers get the same message from updated record
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class StructuredLogWriter:
+    """writes records as newline delimited json from a background thread.
+    Records waiting in queue are written together, with a single flush"""
+
+    _STOP = object()
+
+    def __init__(self, log_file=None, max_queued_records=MAX_QUEUED_RECORDS):
+        self.log_file = log_file
+        self.formatter = JSONFormatter()
+        self.handler = BoundedQueueHandler(queue.Queue(max_queued_records))
+        self._stream = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+
+            if self.log_file:
+                self._stream = open(self.log_file, "a", encoding="utf-8")
+            else:
+                self._stream = sys.stderr
+
+            self._thread = threading.Thread(
+                target=self._run, name="calm-log-writer", daemon=True
+            )
+            self._thread.start()
+
+    def _format(self, record):
+        try:
+            return self.formatter.format(record)
+        except Exception as exp:
+            return json.dumps(
+                {"level": "ERROR", "message": "Unable to format record: {}".format(exp)}
+            )
+
+    def _run(self):
+        record_queue = self.handler.queue
+        stopped = False
+        while not stopped:
+            batch = [record_queue.get()]
+            while len(batch) < MAX_BATCH_SIZE:
+                try:
+                    batch.append(record_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            lines = []
+            for record in batch:
+                if record is self._STOP:
+                    stopped = True
+                else:
+                    lines.append(self._format(record))
+
+            if lines:
+                self._write(lines)
+
+    def _write(self, lines):
+        try:
+            self._stream.write("\n".join(lines) + "\n")
+            self._stream.flush()
+        except Exception:
+            # Logs can not be reported anywhere, if their stream is broken
+            pass
+
+    def stop(self):
+        """writes the queued records and closes the writer"""
+
+        with self._lock:
+            thread, self._thread = self._thread, None
+            if thread is None:
+                return
+
+            # Blocking put, as writer is emptying the queue
+            self.handler.queue.put(self._STOP)
+            thread.join()
+
+            if self.handler.dropped:
+                self._write(
+                    [
+                        self._format(
+                            logging.makeLogRecord(
+                                {
+                                    "name": __name__,
+                                    "levelno": logging.WARNING,
+                                    "levelname": "WARNING",
+                                    "msg": "Dropped {} log records as queue was full".format(
+                                        self.handler.dropped
+                                    ),
+                                }
+                            )
+                        )
+                    ]
+                )
+
+            if self._stream is not sys.stderr:
+                self._stream.close()
+            self._stream = None
+
+
+_WRITER = None
+
+
+def start_structured_logging(log_file=None):
+    """starts the json log writer, returns the handler to be added to loggers.
+    Queued records are written at exit"""
+
+    global _WRITER
+    if _WRITER is None:
+        _WRITER = StructuredLogWriter(log_file)
+        _WRITER.start()
+
+        # Registered once, even if writer is started again after stopping
+        atexit.unregister(stop_structured_logging)
+        atexit.register(stop_structured_logging)
+
+    return _WRITER.handler
+
+
+def get_structured_handler():
+    """returns handler of running json log writer, None if it is not running"""
+
+    writer = _WRITER
+    return writer.handler if writer is not None else None
+
+
+def stop_structured_logging():
+    """writes the queued records and stops the json log writer"""
+
+    global _WRITER
+    writer, _WRITER = _WRITER, None
+    if writer is not None:
+        writer.stop()
@@ -1,15 +1,20 @@
 from collections import OrderedDict
 from io import StringIO
 import json
+import threading
 
 from ruamel import yaml
 from jinja2 import Environment, PackageLoader
 import jsonref
-from calm.dsl.tools import StrictDraft7Validator
+from calm.dsl.tools import get_validator
 from calm.dsl.log import get_logging_handle
+from .plugins import get_plugins, load_plugin, PROVIDER_PLUGINS
 
 LOG = get_logging_handle(__name__)
 
+# Guards lazy initialisation of provider spec and validator across threads
+_INIT_LOCK = threading.RLock()
+
 
 class ProviderBase:
 
@@ -22,10 +27,7 @@ class ProviderBase:
 
         if provider_type:
 
-            # Init Provider
-            cls._init()
-
-            # Register Provider
+            # Register Provider. Spec and validator are built on first use
             cls.providers[provider_type] = cls
 
 
@@ -51,15 +53,29 @@ class Provider(ProviderBase):
         tdict = jsonref.loads(json.dumps(tdict))
 
         # TODO - Check if keys are present
-        cls.provider_spec = tdict["components"]["schemas"]["provider_spec"]
-        cls.Validator = StrictDraft7Validator(cls.provider_spec)
+        provider_spec = tdict["components"]["schemas"]["provider_spec"]
+
+        # provider_spec marks the provider initialised, so it is set last
+        cls.Validator = get_validator(provider_spec)
+        cls.provider_spec = provider_spec
+
+    @classmethod
+    def _init_once(cls):
+        if "provider_spec" in cls.__dict__:
+            return
+
+        with _INIT_LOCK:
+            if "provider_spec" not in cls.__dict__:
+                cls._init()
 
     @classmethod
     def get_provider_spec(cls):
+        cls._init_once()
         return cls.provider_spec
 
     @classmethod
     def get_validator(cls):
+        cls._init_once()
         return cls.Validator
 
     @classmethod
@@ -87,6 +103,11 @@ class Provider(ProviderBase):
 
 def get_provider(provider_type):
 
+    if provider_type not in ProviderBase.providers:
+        # Import plugin of provider, all plugins if it is not a known one
+        if not load_plugin(provider_type):
+            get_plugins()
+
     if provider_type not in ProviderBase.providers:
         LOG.debug("Registered providers: {}".format(ProviderBase.providers))
         raise Exception("provider not registered")
@@ -95,11 +116,19 @@ def get_provider(provider_type):
 
 
 def get_providers():
+    get_plugins()
     return ProviderBase.providers
 
 
 def get_provider_types():
-    return ProviderBase.providers.keys()
+    """returns provider types without importing their plugins"""
+
+    provider_types = list(PROVIDER_PLUGINS.keys())
+    for provider_type in ProviderBase.providers.keys():
+        if provider_type not in provider_types:
+            provider_types.append(provider_type)
+
+    return provider_types
 
 
 def get_provider_interface():
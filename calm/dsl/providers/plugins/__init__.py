@@ -4,6 +4,18 @@ import pkgutil
 
 _PLUGINS = None
 
+# Provider types and the plugin packages registering them. Plugins are imported
+# only when their provider is used, so that all of them are not loaded at startup
+PROVIDER_PLUGINS = {
+    "AHV_VM": "ahv_vm",
+    "AWS_VM": "aws_vm",
+    "AZURE_VM": "azure_vm",
+    "EXISTING_VM": "existing_vm",
+    "GCP_VM": "gcp_vm",
+    "K8S_POD": "k8s",
+    "VMWARE_VM": "vmware_vm",
+}
+
 
 def get_plugins():
     global _PLUGINS
@@ -12,6 +24,18 @@ def get_plugins():
     return _PLUGINS
 
 
+def load_plugin(provider_type):
+    """imports plugin registering given provider type. Returns False if
+    provider type is unknown"""
+
+    plugin = PROVIDER_PLUGINS.get(provider_type, None)
+    if not plugin:
+        return False
+
+    importlib.import_module("{}.{}".format(__name__, plugin))
+    return True
+
+
 def _import_plugins(name=__name__):
     """Load all plugins under '.plugins' package"""
 
@@ -26,4 +50,4 @@ def _import_plugins(name=__name__):
     return results
 
 
-__all__ = ["get_plugins"]
+__all__ = ["get_plugins", "load_plugin", "PROVIDER_PLUGINS"]
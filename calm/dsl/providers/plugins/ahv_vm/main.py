@@ -10,7 +10,7 @@ from collections import OrderedDict
 
 from calm.dsl.api import get_resource_api, get_api_client
 from calm.dsl.providers import get_provider_interface
-from calm.dsl.tools import StrictDraft7Validator
+from calm.dsl.tools import get_validator
 from calm.dsl.log import get_logging_handle
 
 from .constants import AHV as AhvConstants
@@ -1806,7 +1806,7 @@ def find_schema(schema, path, option):
 def validate_field(schema, path, options, spec):
 
     keySchema = find_schema(schema, path, options)
-    return StrictDraft7Validator(keySchema).is_valid(spec)
+    return get_validator(keySchema).is_valid(spec)
 
 
 def get_field(schema, path, options, type=str, default=None, msg=None):
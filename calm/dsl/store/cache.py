@@ -1,14 +1,19 @@
 import click
+import copy
 import sys
 import traceback
 from peewee import OperationalError, IntegrityError
 from distutils.version import LooseVersion as LV
 
+from prettytable import PrettyTable
+
 from .version import Version
+from .sync_engine import CacheSyncEngine
 from calm.dsl.config import get_context
 from calm.dsl.db import get_db_handle, init_db_handle
 from calm.dsl.log import get_logging_handle
 from calm.dsl.api import get_client_handle_obj
+from calm.dsl.tools import profile_span
 
 LOG = get_logging_handle(__name__)
 
@@ -18,13 +23,16 @@ CALM_VERSION = Version.get_version("Calm")
 class Cache:
     """Cache class Implementation"""
 
+    # Per-process memo of db lookups, keyed on (entity_type, lookup, kwargs)
+    _entity_data_memo = {}
+
+    # Per-process memo of cache tables, keyed on calm version
+    _cache_tables_memo = {}
+
     @classmethod
     def get_cache_tables(cls, sync_version=False):
         """returns tables used for cache purpose"""
 
-        db = get_db_handle()
-        db_tables = db.registered_tables
-
         # Get calm version from api only if necessary
         calm_version = CALM_VERSION
         if sync_version or (not calm_version):
@@ -41,19 +49,54 @@ class Cache:
                 sys.exit(err["error"])
             calm_version = res.content.decode("utf-8")
 
-        cache_tables = {}
+        if calm_version not in cls._cache_tables_memo:
+            db = get_db_handle()
+            cache_tables = {}
+            for table in db.registered_tables:
+                if hasattr(table, "__cache_type__") and (
+                    LV(calm_version) >= LV(table.feature_min_version)
+                ):
+                    cache_tables[table.__cache_type__] = table
+
+            cls._cache_tables_memo[calm_version] = cache_tables
+
+        return dict(cls._cache_tables_memo[calm_version])
+
+    @classmethod
+    def clear_memo(cls):
+        """clears memoized entity data. Called whenever cache tables are modified"""
+
+        cls._entity_data_memo.clear()
+
+    @classmethod
+    def _memoized_lookup(cls, key, lookup):
+        """returns result of lookup() memoized on key. Results are copied, so
+        that callers modifying them don't corrupt the memo"""
+
+        try:
+            res = cls._entity_data_memo[key]
+        except KeyError:
+            res = cls._entity_data_memo[key] = lookup()
+        except TypeError:
+            # unhashable kwargs, skip memoization
+            return lookup()
 
-        for table in db_tables:
-            if hasattr(table, "__cache_type__") and (
-                LV(calm_version) >= LV(table.feature_min_version)
-            ):
-                cache_tables[table.__cache_type__] = table
-        return cache_tables
+        return copy.deepcopy(res)
 
     @classmethod
     def get_entity_data(cls, entity_type, name, **kwargs):
         """returns entity data corresponding to supplied entry using entity name"""
 
+        key = (entity_type, "name", name, tuple(sorted(kwargs.items())))
+        with profile_span("cache", "{} {}".format(entity_type, name)):
+            return cls._memoized_lookup(
+                key, lambda: cls._get_entity_data(entity_type, name, **kwargs)
+            )
+
+    @classmethod
+    def _get_entity_data(cls, entity_type, name, **kwargs):
+        """queries db for entity data using entity name"""
+
         db_cls = cls.get_entity_db_table_object(entity_type)
 
         try:
@@ -80,6 +123,17 @@ class Cache:
     def get_entity_data_using_uuid(cls, entity_type, uuid, *args, **kwargs):
         """returns entity data corresponding to supplied entry using entity uuid"""
 
+        key = (entity_type, "uuid", uuid, tuple(sorted(kwargs.items())))
+        with profile_span("cache", "{} {}".format(entity_type, uuid)):
+            return cls._memoized_lookup(
+                key,
+                lambda: cls._get_entity_data_using_uuid(entity_type, uuid, **kwargs),
+            )
+
+    @classmethod
+    def _get_entity_data_using_uuid(cls, entity_type, uuid, **kwargs):
+        """queries db for entity data using entity uuid"""
+
         db_cls = cls.get_entity_db_table_object(entity_type)
 
         try:
@@ -124,6 +178,7 @@ class Cache:
 
         db_obj = cls.get_entity_db_table_object(entity_type)
         db_obj.add_one(uuid, **kwargs)
+        cls.clear_memo()
 
     @classmethod
     def delete_one(cls, entity_type, uuid, **kwargs):
@@ -131,6 +186,7 @@ class Cache:
 
         db_obj = cls.get_entity_db_table_object(entity_type)
         db_obj.delete_one(uuid, **kwargs)
+        cls.clear_memo()
 
     @classmethod
     def update_one(cls, entity_type, uuid, **kwargs):
@@ -138,34 +194,69 @@ class Cache:
 
         db_obj = cls.get_entity_db_table_object(entity_type)
         db_obj.update_one(uuid, **kwargs)
+        cls.clear_memo()
 
     @classmethod
-    def sync(cls):
-        """Sync cache by latest data"""
+    def sync(cls, incremental=False):
+        """Sync cache by latest data. Returns per-table sync results
 
-        def sync_tables(tables):
-            for table in tables:
-                table.sync()
-                click.echo(".", nl=False, err=True)
+        Args:
+            incremental (bool): fetch only entities changed since last sync for
+                tables supporting it, others are synced fully
+        """
 
         cache_table_map = cls.get_cache_tables(sync_version=True)
-        tables = list(cache_table_map.values())
+        engine = CacheSyncEngine(
+            list(cache_table_map.values()), incremental=incremental
+        )
 
-        # Inserting version table at start
-        tables.insert(0, Version)
+        def sync_tables():
+            # Version table is synced first, as other tables depend on it
+            Version.sync()
+            click.echo(".", nl=False, err=True)
+            return engine.run()
 
         try:
             LOG.info("Updating cache", nl=False)
-            sync_tables(tables)
+            results = sync_tables()
 
         except (OperationalError, IntegrityError):
             click.echo(" [Fail]")
             # init db handle once (recreating db if some schema changes are there)
             LOG.info("Removing existing db and updating cache again")
             init_db_handle()
+            engine.reset()
             LOG.info("Updating cache", nl=False)
-            sync_tables(tables)
+            results = sync_tables()
+        cls.clear_memo()
         click.echo(" [Done]", err=True)
+        return results
+
+    @classmethod
+    def show_sync_timings(cls, results):
+        """Display time taken by each table in last sync"""
+
+        table = PrettyTable()
+        table.field_names = [
+            "TABLE",
+            "SYNC TYPE",
+            "ENTRIES",
+            "FETCH (s)",
+            "UPDATE (s)",
+            "TOTAL (s)",
+        ]
+        for result in sorted(results, key=lambda r: r.total_time, reverse=True):
+            table.add_row(
+                [
+                    result.cache_type,
+                    "delta" if result.is_delta else "full",
+                    len(result.entries),
+                    "{:.2f}".format(result.fetch_time),
+                    "{:.2f}".format(result.apply_time),
+                    "{:.2f}".format(result.total_time),
+                ]
+            )
+        click.echo(table)
 
     @classmethod
     def sync_table(cls, cache_type):
@@ -185,12 +276,15 @@ class Cache:
             cache_table = cache_table_map[_ct]
             cache_table.sync()
 
+        cls.clear_memo()
+
     @classmethod
     def clear_entities(cls):
         """Clear data present in the cache tables"""
 
         # For now clearing means erasing all data. So reinitialising whole database
         init_db_handle()
+        cls.clear_memo()
 
     @classmethod
     def show_data(cls):
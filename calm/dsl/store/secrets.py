@@ -2,7 +2,7 @@ import datetime
 import uuid
 import peewee
 
-from ..crypto import Crypto
+from ..crypto import Crypto, DEFAULT_KDF_COST
 from calm.dsl.db import get_db_handle
 from calm.dsl.log import get_logging_handle
 
@@ -13,13 +13,17 @@ class Secret:
     """Secret class implementation"""
 
     @classmethod
-    def create(cls, name, value, pass_phrase="dslp4ssw0rd"):
-        """Stores the secret in db"""
+    def create(cls, name, value, pass_phrase="dslp4ssw0rd", kdf_cost=None):
+        """Stores the secret in db. kdf_cost is the scrypt cost used for
+        deriving its key (default: DEFAULT_KDF_COST)"""
 
         db = get_db_handle()
         pass_phrase = pass_phrase.encode()
+        kdf_cost = kdf_cost or DEFAULT_KDF_COST
+        Crypto.validate_kdf_cost(kdf_cost)
+
         LOG.debug("Encryting data")
-        encrypted_msg = Crypto.encrypt_AES_GCM(value, pass_phrase)
+        encrypted_msg = Crypto.encrypt_AES_GCM(value, pass_phrase, kdf_cost=kdf_cost)
 
         (kdf_salt, ciphertext, iv, auth_tag) = encrypted_msg
 
@@ -32,6 +36,7 @@ class Secret:
             iv=iv,
             auth_tag=auth_tag,
             pass_phrase=pass_phrase,
+            kdf_cost=kdf_cost,
         )
 
     @classmethod
@@ -54,17 +59,20 @@ class Secret:
         secret.delete_instance(recursive=True)
 
     @classmethod
-    def update(cls, name, value):
-        """Updates the secret in Database"""
+    def update(cls, name, value, kdf_cost=None):
+        """Updates the secret in Database. KDF cost of secret is retained,
+        if kdf_cost is not given"""
 
         db = get_db_handle()
         secret = cls.get_instance(name)
         secret_data = secret.data[0]  # using backref
 
         pass_phrase = secret_data.pass_phrase
+        kdf_cost = kdf_cost or secret_data.kdf_cost
+        Crypto.validate_kdf_cost(kdf_cost)
 
         LOG.debug("Encrypting new data")
-        encrypted_msg = Crypto.encrypt_AES_GCM(value, pass_phrase)
+        encrypted_msg = Crypto.encrypt_AES_GCM(value, pass_phrase, kdf_cost=kdf_cost)
 
         (kdf_salt, ciphertext, iv, auth_tag) = encrypted_msg
 
@@ -74,6 +82,7 @@ class Secret:
             iv=iv,
             auth_tag=auth_tag,
             pass_phrase=pass_phrase,
+            kdf_cost=kdf_cost,
         ).where(db.data_table.secret_ref == secret)
 
         query.execute()
@@ -103,6 +112,33 @@ class Secret:
         secret = cls.get_instance(name)
         secret_data = secret.data[0]  # using backref
 
+        return cls._decrypt(secret_data, pass_phrase)
+
+    @classmethod
+    def find_many(cls, names, pass_phrase=None):
+        """Find the values of secrets, using a single db query.
+        Returns {name: value} for the secrets present in db"""
+
+        db = get_db_handle()
+        names = list(names)
+        if not names:
+            return {}
+
+        # Name is the primary key of secret, so data rows are filtered directly
+        query = db.data_table.select().where(db.data_table.secret_ref.in_(names))
+
+        secret_values = {}
+        for secret_data in query:
+            secret_values[secret_data.secret_ref_id] = cls._decrypt(
+                secret_data, pass_phrase
+            )
+
+        return secret_values
+
+    @classmethod
+    def _decrypt(cls, secret_data, pass_phrase=None):
+        """returns the decrypted value of secret data"""
+
         if not pass_phrase:
             pass_phrase = secret_data.pass_phrase
         else:
@@ -110,7 +146,9 @@ class Secret:
 
         enc_msg = secret_data.generate_enc_msg()
         LOG.debug("Decrypting data")
-        secret_val = Crypto.decrypt_AES_GCM(enc_msg, pass_phrase)
+        secret_val = Crypto.decrypt_AES_GCM(
+            enc_msg, pass_phrase, kdf_cost=secret_data.kdf_cost
+        )
 
         return secret_val
 
@@ -0,0 +1,130 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import click
+
+from calm.dsl.db.table_config import dsl_database
+from calm.dsl.log import get_logging_handle
+
+LOG = get_logging_handle(__name__)
+
+# Upper bound on tables whose server data is fetched in parallel
+SYNC_MAX_WORKERS = 8
+
+
+class TableSyncResult:
+    """Holds the fetched data and timing details of a cache table sync"""
+
+    def __init__(self, table, sync_state=None):
+        self.table = table
+        self.sync_state = sync_state
+        self.sync_data = None
+        self.fetch_time = 0.0
+        self.apply_time = 0.0
+        self.error = None
+
+    @property
+    def cache_type(self):
+        return self.table.get_cache_type()
+
+    @property
+    def entries(self):
+        return self.sync_data.entries if self.sync_data else []
+
+    @property
+    def is_delta(self):
+        return bool(self.sync_data and self.sync_data.is_delta)
+
+    @property
+    def total_time(self):
+        return self.fetch_time + self.apply_time
+
+
+class CacheSyncEngine:
+    """Syncs multiple cache tables, fetching server data for all tables in
+    parallel and writing each table to the db in a single transaction.
+
+    If incremental is True, tables supporting delta sync fetch only the
+    entities changed since their last sync."""
+
+    def __init__(self, tables, max_workers=SYNC_MAX_WORKERS, incremental=False):
+        self.tables = tables
+        self.max_workers = max(1, min(max_workers, len(tables) or 1))
+        self.incremental = incremental
+        self.results = []
+
+    @staticmethod
+    def _fetch(result):
+        """fetches server data for a table. Runs on worker threads"""
+
+        start_time = time.time()
+        try:
+            result.sync_data = result.table.fetch_sync_data(result.sync_state)
+        except Exception as exc:
+            result.error = exc
+        finally:
+            result.fetch_time = time.time() - start_time
+
+            # peewee keeps connections per thread, close the one opened by worker (if any)
+            if not dsl_database.is_closed():
+                dsl_database.close()
+
+        return result
+
+    def fetch_all(self):
+        """fetches server data for all tables concurrently"""
+
+        # Sync states are read upfront, so that workers only talk to server
+        self.results = [
+            TableSyncResult(table, table.get_sync_state() if self.incremental else None)
+            for table in self.tables
+        ]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(self._fetch, res) for res in self.results]
+            for future in as_completed(futures):
+                result = future.result()
+                LOG.debug(
+                    "Fetched {} entries ({}) for {} table in {:.2f}s".format(
+                        len(result.entries),
+                        "delta" if result.is_delta else "full",
+                        result.cache_type,
+                        result.fetch_time,
+                    )
+                )
+                click.echo(".", nl=False, err=True)
+
+        for result in self.results:
+            if result.error:
+                raise result.error
+
+    def apply_all(self):
+        """writes fetched data to db, one transaction per table"""
+
+        for result in self.results:
+            start_time = time.time()
+            result.table.apply_sync_data(result.sync_data)
+            result.apply_time = time.time() - start_time
+            LOG.debug(
+                "Updated {} table in {:.2f}s".format(
+                    result.cache_type, result.apply_time
+                )
+            )
+
+    def run(self):
+        """sync all the tables. Returns list of TableSyncResult objects.
+        Server data is fetched only once, so run can be retried on db errors"""
+
+        if not self.results:
+            self.fetch_all()
+
+        self.apply_all()
+        return self.results
+
+    def reset(self):
+        """Discards fetched data if it can't be applied to a recreated db"""
+
+        if any(result.is_delta for result in self.results):
+            self.results = []
+
+        self.incremental = False
@@ -1,12 +1,18 @@
 from .ping import ping
-from .validator import StrictDraft7Validator
+from .validator import StrictDraft7Validator, get_validator
 from .utils import get_module_from_file, make_file_dir
+from .profiler import profile_span, start_profiling, stop_profiling, get_profiler
 
 
 __all__ = [
     "RenderJSON",
     "ping",
     "StrictDraft7Validator",
+    "get_validator",
     "get_module_from_file",
     "make_file_dir",
+    "profile_span",
+    "start_profiling",
+    "stop_profiling",
+    "get_profiler",
 ]
@@ -0,0 +1,171 @@
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+
+class ProfileSpan:
+    """timed section of work, with the sections nested in it as children"""
+
+    __slots__ = ("category", "name", "start", "end", "children", "thread_id")
+
+    def __init__(self, category, name, start, thread_id):
+        self.category = category
+        self.name = name
+        self.start = start
+        self.end = None
+        self.children = []
+        self.thread_id = thread_id
+
+    @property
+    def duration(self):
+        return (self.end or time.perf_counter()) - self.start
+
+    @property
+    def self_duration(self):
+        return self.duration - sum(child.duration for child in self.children)
+
+
+class Profiler:
+    """collects timing spans of the calls made while profiling is enabled.
+    Spans started in a thread are nested under the span running in it"""
+
+    def __init__(self):
+        self.start_time = time.perf_counter()
+        self.spans = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _get_stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = []
+            self._local.stack = stack
+        return stack
+
+    @contextmanager
+    def span(self, category, name):
+        stack = self._get_stack()
+        span = ProfileSpan(
+            category, name, time.perf_counter(), threading.current_thread().ident
+        )
+        if stack:
+            stack[-1].children.append(span)
+        else:
+            with self._lock:
+                self.spans.append(span)
+
+        stack.append(span)
+        try:
+            yield span
+        finally:
+            span.end = time.perf_counter()
+            stack.pop()
+
+    def iter_spans(self):
+        """yields (depth, span) for all spans, parents first"""
+
+        pending = [(0, span) for span in reversed(self.spans)]
+        while pending:
+            depth, span = pending.pop()
+            yield depth, span
+            pending.extend((depth + 1, child) for child in reversed(span.children))
+
+    def get_category_summary(self):
+        """returns self time and count of spans per category"""
+
+        summary = {}
+        for _, span in self.iter_spans():
+            duration, count = summary.get(span.category, (0, 0))
+            summary[span.category] = (duration + span.self_duration, count + 1)
+
+        return summary
+
+    def get_tree_lines(self, min_duration=0):
+        """returns lines of timing tree. Sibling spans with same category and
+        name are merged, and the ones taking less than min_duration are skipped"""
+
+        lines = []
+
+        def add_lines(spans, depth):
+            groups = {}
+            for span in spans:
+                groups.setdefault((span.category, span.name), []).append(span)
+
+            for (category, name), group in groups.items():
+                duration = sum(span.duration for span in group)
+                if duration < min_duration:
+                    continue
+
+                self_duration = sum(span.self_duration for span in group)
+                lines.append(
+                    "{}{} [{}]  total: {:.2f} ms  self: {:.2f} ms{}".format(
+                        "  " * depth,
+                        name,
+                        category,
+                        duration * 1000,
+                        self_duration * 1000,
+                        "  calls: {}".format(len(group)) if len(group) > 1 else "",
+                    )
+                )
+                children = [child for span in group for child in span.children]
+                add_lines(children, depth + 1)
+
+        add_lines(self.spans, 0)
+        return lines
+
+    def get_chrome_trace(self):
+        """returns spans in chrome trace event format"""
+
+        pid = os.getpid()
+        events = []
+        for _, span in self.iter_spans():
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": span.category,
+                    "ph": "X",
+                    "ts": round((span.start - self.start_time) * 1000000, 3),
+                    "dur": round(span.duration * 1000000, 3),
+                    "pid": pid,
+                    "tid": span.thread_id,
+                }
+            )
+
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+_PROFILER = None
+
+# Used for the blocks profiled while profiling is disabled
+_NULL_SPAN = nullcontext()
+
+
+def start_profiling():
+    """enables profiling, returns the profiler collecting the spans"""
+
+    global _PROFILER
+    _PROFILER = Profiler()
+    return _PROFILER
+
+
+def stop_profiling():
+    """disables profiling, returns the profiler used"""
+
+    global _PROFILER
+    profiler, _PROFILER = _PROFILER, None
+    return profiler
+
+
+def get_profiler():
+    return _PROFILER
+
+
+def profile_span(category, name):
+    """returns context manager timing the block, if profiling is enabled"""
+
+    profiler = _PROFILER
+    if profiler is None:
+        return _NULL_SPAN
+
+    return profiler.span(category, name)
@@ -2,6 +2,7 @@ from jsonschema import _utils
 from jsonschema import Draft7Validator, validators
 from jsonschema.exceptions import _Error
 from jsonschema._utils import ensure_list, types_msg, unbool
+import numbers
 import textwrap
 from ruamel import yaml
 import json
@@ -134,3 +135,304 @@ def extend_validator(ValidatorClass):
 
 
 StrictDraft7Validator = extend_validator(Draft7Validator)
+
+
+# Checks of json types, same as the ones of Draft7 type checker
+_TYPE_CHECKS = {
+    "array": lambda instance: isinstance(instance, list),
+    "boolean": lambda instance: isinstance(instance, bool),
+    "integer": lambda instance: (
+        isinstance(instance, int) and not isinstance(instance, bool)
+    )
+    or (isinstance(instance, float) and instance.is_integer()),
+    "null": lambda instance: instance is None,
+    "number": lambda instance: isinstance(instance, numbers.Number)
+    and not isinstance(instance, bool),
+    "object": lambda instance: isinstance(instance, dict),
+    "string": lambda instance: isinstance(instance, str),
+}
+
+
+class _NotCompilable(Exception):
+    pass
+
+
+# Compiled checks are called as check(instance, full) and return if instance is
+# valid. Validator stops at the first error, except inside anyOf where all errors
+# are collected. As "properties" sets defaults in the instance, checks evaluate
+# the whole instance only if full is True, and stop at first failure otherwise.
+
+
+def _compile_type(types, compile_subschema):
+    types = ensure_list(types)
+    for _type in types:
+        if _type not in _TYPE_CHECKS:
+            raise _NotCompilable("type {}".format(_type))
+
+    type_checks = [_TYPE_CHECKS[_type] for _type in types]
+    if len(type_checks) == 1:
+        type_check = type_checks[0]
+        return lambda instance, full: type_check(instance)
+
+    return lambda instance, full: any(
+        type_check(instance) for type_check in type_checks
+    )
+
+
+def _compile_properties(properties, compile_subschema):
+    checks = {
+        property: compile_subschema(subschema)
+        for property, subschema in properties.items()
+    }
+    defaults = [
+        (property, subschema["default"])
+        for property, subschema in properties.items()
+        if "default" in subschema
+    ]
+
+    def check(instance, full):
+        if not isinstance(instance, dict):
+            return True
+
+        # for managing defaults in the schema
+        for property, default in defaults:
+            instance.setdefault(property, default)
+
+        valid = True
+        for property, value in instance.items():
+            property_check = checks.get(property, None)
+            if property_check is None or not property_check(value, full):
+                if not full:
+                    return False
+                valid = False
+        return valid
+
+    return check
+
+
+def _compile_additional_properties(additional_properties, compile_subschema, schema):
+    if "patternProperties" in schema:
+        raise _NotCompilable("patternProperties")
+
+    properties = schema.get("properties", {})
+    if isinstance(additional_properties, dict):
+        additional_check = compile_subschema(additional_properties)
+
+        def check(instance, full):
+            if not isinstance(instance, dict):
+                return True
+
+            # Extras are checked in the same order as the validator does
+            extras = set(
+                property for property in instance if property not in properties
+            )
+            valid = True
+            for extra in extras:
+                if not additional_check(instance[extra], full):
+                    if not full:
+                        return False
+                    valid = False
+            return valid
+
+        return check
+
+    if additional_properties:
+        return None
+
+    return lambda instance, full: (
+        not isinstance(instance, dict)
+        or all(property in properties for property in instance)
+    )
+
+
+def _compile_items(items, compile_subschema):
+    if not isinstance(items, dict):
+        raise _NotCompilable("items {}".format(items))
+
+    item_check = compile_subschema(items)
+
+    def check(instance, full):
+        if not isinstance(instance, list):
+            return True
+
+        valid = True
+        for item in instance:
+            if not item_check(item, full):
+                if not full:
+                    return False
+                valid = False
+        return valid
+
+    return check
+
+
+def _compile_any_of(any_of, compile_subschema):
+    checks = [compile_subschema(subschema) for subschema in any_of]
+
+    # Subschemas are evaluated fully, till the first valid one
+    return lambda instance, full: any(check(instance, True) for check in checks)
+
+
+def _compile_enum(enums, compile_subschema):
+    def check(instance, full):
+        if instance == 0 or instance == 1:
+            unbooled = unbool(instance)
+            return any(unbooled == unbool(each) for each in enums)
+        return instance in enums
+
+    return check
+
+
+def _compile_required(required, compile_subschema):
+    return lambda instance, full: (
+        not isinstance(instance, dict)
+        or all(property in instance for property in required)
+    )
+
+
+def _compile_min_length(min_length, compile_subschema):
+    return lambda instance, full: (
+        not isinstance(instance, str) or len(instance) >= min_length
+    )
+
+
+def _compile_max_length(max_length, compile_subschema):
+    return lambda instance, full: (
+        not isinstance(instance, str) or len(instance) <= max_length
+    )
+
+
+def _compile_minimum(minimum, compile_subschema):
+    is_number = _TYPE_CHECKS["number"]
+    return lambda instance, full: not is_number(instance) or instance >= minimum
+
+
+def _compile_maximum(maximum, compile_subschema):
+    is_number = _TYPE_CHECKS["number"]
+    return lambda instance, full: not is_number(instance) or instance <= maximum
+
+
+_KEYWORD_COMPILERS = {
+    "type": _compile_type,
+    "properties": _compile_properties,
+    "items": _compile_items,
+    "anyOf": _compile_any_of,
+    "enum": _compile_enum,
+    "required": _compile_required,
+    "minLength": _compile_min_length,
+    "maxLength": _compile_max_length,
+    "minimum": _compile_minimum,
+    "maximum": _compile_maximum,
+    # Formats are not checked, as validators are created without format checker
+    "format": lambda value, compile_subschema: None,
+}
+
+
+def compile_schema(schema, ValidatorClass=None):
+    """returns function checking if an instance is valid against schema. It
+    behaves same as StrictDraft7Validator(schema).is_valid(), including defaults
+    set in the instance. Returns None if schema has keywords not supported"""
+
+    ValidatorClass = ValidatorClass or StrictDraft7Validator
+    compiled = {}
+
+    def compile_subschema(subschema):
+        if subschema is True:
+            return lambda instance, full: True
+        elif subschema is False:
+            return lambda instance, full: False
+        elif not isinstance(subschema, dict):
+            raise _NotCompilable("schema {}".format(subschema))
+
+        # Recursive schemas refer the check being compiled through a cell
+        key = id(subschema)
+        if key in compiled:
+            return compiled[key]
+
+        cell = []
+        compiled[key] = lambda instance, full: cell[0](instance, full)
+
+        if "$ref" in subschema:
+            raise _NotCompilable("$ref")
+
+        checks = []
+        for keyword, value in subschema.items():
+            if keyword == "additionalProperties":
+                check = _compile_additional_properties(
+                    value, compile_subschema, subschema
+                )
+            elif keyword in _KEYWORD_COMPILERS:
+                check = _KEYWORD_COMPILERS[keyword](value, compile_subschema)
+            elif keyword in ValidatorClass.VALIDATORS:
+                raise _NotCompilable(keyword)
+            else:
+                # Unknown keywords are ignored by validator
+                check = None
+
+            if check is not None:
+                checks.append(check)
+
+        if not checks:
+            check = lambda instance, full: True
+        elif len(checks) == 1:
+            check = checks[0]
+        else:
+            # Keywords are checked in schema order, same as the validator
+            def check(instance, full):
+                valid = True
+                for keyword_check in checks:
+                    if not keyword_check(instance, full):
+                        if not full:
+                            return False
+                        valid = False
+                return valid
+
+        cell.append(check)
+        compiled[key] = check
+        return check
+
+    try:
+        check = compile_subschema(schema)
+    except _NotCompilable:
+        return None
+
+    return lambda instance: check(instance, False)
+
+
+class CompiledValidator:
+    """Validator using checking function compiled from schema. Errors are
+    reported by StrictDraft7Validator, used only for invalid instances"""
+
+    def __init__(self, schema):
+        self.schema = schema
+        self.validator = StrictDraft7Validator(schema)
+        self.check = compile_schema(schema)
+
+    def is_valid(self, instance):
+        if self.check is None:
+            return self.validator.is_valid(instance)
+        return self.check(instance)
+
+    def validate(self, instance):
+        if self.check is None or not self.check(instance):
+            self.validator.validate(instance)
+
+    def iter_errors(self, instance):
+        return self.validator.iter_errors(instance)
+
+
+# Validators compiled from schemas, keyed on schema identity
+_VALIDATORS = {}
+
+
+def get_validator(schema):
+    """returns validator compiled from schema, cached per schema object"""
+
+    validator = _VALIDATORS.get(id(schema), None)
+
+    # Cached validator holds the schema, so its id is not reused by other objects
+    if validator is None or validator.schema is not schema:
+        validator = CompiledValidator(schema)
+        _VALIDATORS[id(schema)] = validator
+
+    return validator
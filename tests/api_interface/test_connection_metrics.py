@@ -0,0 +1,110 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from requests import Session
+from requests.packages.urllib3.util.retry import Retry
+
+from calm.dsl.api import ConnectionMetrics, add_metrics_hook, remove_metrics_hook
+from calm.dsl.api.connection import Connection, REQUEST
+from calm.dsl.api.metrics import TimedHTTPAdapter, get_endpoint_template
+
+BP_UUID = "6c0b1e6e-4bd9-4c38-9d35-2dfc1a3e2f7a"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    failures = {}
+
+    def _reply(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+
+        # First call on an endpoint fails with 503, to be retried
+        status = 200
+        if self.path not in self.failures:
+            self.failures[self.path] = True
+            status = 503
+
+        body = json.dumps({"path": self.path}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = _reply
+    do_POST = _reply
+
+    def log_message(self, *args):
+        pass
+
+
+class TestConnectionMetrics:
+    def test_endpoint_template(self):
+        assert (
+            get_endpoint_template("api/nutanix/v3/blueprints/{}/launch".format(BP_UUID))
+            == "api/nutanix/v3/blueprints/{uuid}/launch"
+        )
+        assert (
+            get_endpoint_template("api/nutanix/v3/apps/12/runlogs?limit=1")
+            == "api/nutanix/v3/apps/{id}/runlogs"
+        )
+
+    def test_call_metrics(self):
+        server = HTTPServer(("127.0.0.1", 0), _Handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+
+        connection = Connection(
+            "127.0.0.1", server.server_port, scheme=REQUEST.SCHEME.HTTP
+        )
+        connection.session = Session()
+        adapter = TimedHTTPAdapter(
+            max_retries=Retry(
+                total=3, status_forcelist=[503], method_whitelist=["GET", "POST"]
+            )
+        )
+        connection.session.mount("http://", adapter)
+
+        metrics = ConnectionMetrics()
+        add_metrics_hook(metrics)
+        try:
+            for _ in range(2):
+                res, err = connection._call(
+                    "api/nutanix/v3/blueprints/{}".format(BP_UUID),
+                    method=REQUEST.METHOD.GET,
+                    timeout=(5, 5),
+                )
+                assert err is None
+            res, err = connection._call(
+                "api/nutanix/v3/blueprints/list",
+                request_json={"length": 20},
+                timeout=(5, 5),
+            )
+            assert err is None
+        finally:
+            remove_metrics_hook(metrics)
+            server.shutdown()
+            server.server_close()
+
+        summary = metrics.get_summary()
+        assert summary["total_calls"] == 3
+
+        stats = {
+            (stats["method"], stats["endpoint"]): stats
+            for stats in summary["endpoints"]
+        }
+        get_stats = stats[("GET", "api/nutanix/v3/blueprints/{uuid}")]
+        assert get_stats["calls"] == 2
+        assert get_stats["errors"] == 0
+        assert get_stats["retries"] == 1
+        assert get_stats["bytes_received"] > 0
+        assert sum(get_stats["latency_buckets"]) == 2
+
+        post_stats = stats[("POST", "api/nutanix/v3/blueprints/list")]
+        assert post_stats["retries"] == 1
+        assert post_stats["bytes_sent"] == len(json.dumps({"length": 20}))
+        assert post_stats["pool_wait_ms"] >= 0
+
+        # No records after hook is removed
+        assert metrics.get_summary()["total_calls"] == 3
@@ -0,0 +1,173 @@
+import json
+import tracemalloc
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from calm.dsl.api.json_stream import iter_list_entities, project_fields
+from calm.dsl.api.resource import ResourceAPI
+from calm.dsl.cli import utils
+from calm.dsl.cli.utils import show_entity_names
+
+TOTAL_MATCHES = 1003
+
+
+def _entity(index):
+    return {
+        "status": {"name": "bp-{}-é".format(index), "resources": {"big": "x" * 100}},
+        "metadata": {"uuid": "uuid-{}".format(index), "spec_version": index},
+        "spec": {"resources": {"index": index / 3}},
+    }
+
+
+def _chunks(data, size):
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+def _list_response(offset, length):
+    body = json.dumps(
+        {
+            "entities": [
+                _entity(index)
+                for index in range(offset, min(offset + length, TOTAL_MATCHES))
+            ],
+            "metadata": {"total_matches": TOTAL_MATCHES, "offset": offset},
+        }
+    ).encode()
+
+    res = MagicMock()
+    res.json.return_value = json.loads(body)
+    res.iter_content.side_effect = lambda size: iter(_chunks(body, size))
+    return res
+
+
+def _mock_list(params, ignore_error=False, stream=False):
+    return _list_response(params["offset"], params["length"]), None
+
+
+class TestListStream:
+    def _get_resource_api(self):
+        resource = ResourceAPI(MagicMock(_pool_maxsize=20), "blueprints")
+        resource.list = MagicMock(side_effect=_mock_list)
+        return resource
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+    def test_iter_list_entities(self, chunk_size):
+        response = {
+            "api_version": "3.0",
+            "entities": [_entity(index) for index in range(20)] + [1.5e3, None],
+            "metadata": {"total_matches": 22, "kind": "blueprint"},
+        }
+        body = json.dumps(response, indent=2).encode()
+
+        info = {}
+        entities = list(iter_list_entities(_chunks(body, chunk_size), info=info))
+        assert entities == response["entities"]
+        assert info == {"api_version": "3.0", "metadata": response["metadata"]}
+
+    def test_iter_list_entities_empty(self):
+        info = {}
+        assert list(iter_list_entities([b'{"entities": [', b"]}"], info=info)) == []
+        assert list(iter_list_entities([b"{}"])) == []
+
+        with pytest.raises(ValueError):
+            list(iter_list_entities([b'{"entities": [{"a": 1}']))
+
+    def test_project_fields(self):
+        entity = _entity(3)
+        assert project_fields(
+            entity, ["status.name", "metadata.uuid", "status.resources.missing"]
+        ) == {
+            "status": {"name": entity["status"]["name"], "resources": {}},
+            "metadata": {"uuid": "uuid-3"},
+        }
+        assert project_fields(entity, ["spec.missing.name"]) == {"spec": {}}
+
+    def _show_entity_names(self, res, limit):
+        """returns output lines of show_entity_names, with warnings prefixed"""
+
+        output = []
+        with patch.object(
+            utils.click, "echo", side_effect=lambda msg: output.append(msg)
+        ), patch.object(utils, "LOG") as log:
+            log.warning.side_effect = lambda msg: output.append("WARNING " + msg)
+            show_entity_names(res, limit, "blueprint")
+
+        res.close.assert_called_once_with()
+        return [utils.click.unstyle(line) for line in output]
+
+    def test_show_entity_names(self):
+        warning = (
+            "WARNING Displaying 3 out of {} entities. Please use --limit and"
+            " --offset option for more results.".format(TOTAL_MATCHES)
+        )
+
+        # Warning is shown before names, though metadata follows entities in response
+        assert self._show_entity_names(_list_response(0, 3), 3) == [
+            warning,
+            "bp-0-é",
+            "bp-1-é",
+            "bp-2-é",
+        ]
+
+        # Page beyond the last entity
+        assert self._show_entity_names(_list_response(TOTAL_MATCHES, 3), 3) == [
+            warning,
+            "No blueprint found !!!\n",
+        ]
+
+        assert self._show_entity_names(
+            _list_response(TOTAL_MATCHES - 3, 3), TOTAL_MATCHES
+        ) == ["bp-1000-é", "bp-1001-é", "bp-1002-é"]
+
+        # Response without metadata
+        res = MagicMock()
+        res.iter_content.return_value = iter([b'{"entities": [', b"]}"])
+        assert self._show_entity_names(res, 3) == ["No blueprint found !!!\n"]
+
+    def test_list_all_fields(self):
+        resource = self._get_resource_api()
+
+        entities = resource.list_all(
+            api_limit=100, fields=["status.name", "metadata.uuid"]
+        )
+        assert len(entities) == TOTAL_MATCHES
+        assert entities[10] == {
+            "status": {"name": _entity(10)["status"]["name"]},
+            "metadata": {"uuid": "uuid-10"},
+        }
+        assert all(call[1]["stream"] for call in resource.list.call_args_list)
+
+    def test_list_iter(self):
+        resource = self._get_resource_api()
+
+        uuids = [
+            entity["metadata"]["uuid"]
+            for entity in resource.list_iter(api_limit=100, fields=["metadata.uuid"])
+        ]
+        assert uuids == ["uuid-{}".format(index) for index in range(TOTAL_MATCHES)]
+        assert resource.list.call_count == 11
+
+    def test_constant_memory(self):
+        """entities are decoded one at a time from the chunks of response"""
+
+        count = 10000
+
+        def chunks():
+            yield b'{"entities": ['
+            for index in range(count):
+                yield json.dumps(_entity(index)).encode()
+                yield b"," if index < count - 1 else b""
+            yield b'], "metadata": {"total_matches": 10000}}'
+
+        tracemalloc.start()
+        try:
+            names = 0
+            for entity in iter_list_entities(chunks(), fields=["status.name"]):
+                names += 1
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert names == count
+        assert peak < 1024 * 1024
@@ -0,0 +1,58 @@
+from unittest.mock import MagicMock
+
+from calm.dsl.api.resource import ResourceAPI
+from calm.dsl.log import get_logging_handle
+
+LOG = get_logging_handle(__name__)
+
+TOTAL_MATCHES = 1003
+
+
+def _list_response(offset, length):
+    res = MagicMock()
+    res.json.return_value = {
+        "entities": list(range(offset, min(offset + length, TOTAL_MATCHES))),
+        "metadata": {"total_matches": TOTAL_MATCHES},
+    }
+    return res
+
+
+def _mock_call(endpoint, request_json=None, **kwargs):
+    return _list_response(request_json["offset"], request_json["length"]), None
+
+
+class TestResourceListAll:
+    def _get_resource_api(self, call=_mock_call):
+        connection = MagicMock()
+        connection._pool_maxsize = 20
+        connection._call = MagicMock(side_effect=call)
+        return ResourceAPI(connection, "blueprints")
+
+    def test_list_all_concurrent_keeps_order(self):
+        resource = self._get_resource_api()
+
+        entities = resource.list_all(api_limit=50)
+        assert entities == list(range(TOTAL_MATCHES))
+        assert resource.connection._call.call_count == 21
+
+    def test_list_all_sequential(self):
+        resource = self._get_resource_api()
+
+        entities, err = resource.list_all(
+            api_limit=50, ignore_error=True, concurrent=False
+        )
+        assert err is None
+        assert entities == list(range(TOTAL_MATCHES))
+
+    def test_list_all_page_error(self):
+        err = {"error": "Internal error", "code": 500}
+
+        def call(endpoint, request_json=None, **kwargs):
+            if request_json["offset"] == 500:
+                return None, err
+            return _mock_call(endpoint, request_json=request_json)
+
+        resource = self._get_resource_api(call)
+        entities, res_err = resource.list_all(api_limit=50, ignore_error=True)
+        assert entities == []
+        assert res_err == err
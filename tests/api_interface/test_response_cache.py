@@ -0,0 +1,130 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from requests import Session
+
+from calm.dsl.api.connection import Connection, REQUEST
+from calm.dsl.api.response_cache import CachedResponse, ResponseCache
+
+BP_UUID = "6c0b1e6e-4bd9-4c38-9d35-2dfc1a3e2f7a"
+BP_ENDPOINT = "api/nutanix/v3/blueprints/{}".format(BP_UUID)
+APP_ENDPOINT = "api/nutanix/v3/apps/{}".format(BP_UUID)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    calls = []
+    version = 1
+
+    def _reply(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+
+        etag = '"v{}"'.format(self.version)
+        self.calls.append((self.command, self.path))
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        body = json.dumps({"path": self.path, "version": self.version}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = _reply
+    do_POST = _reply
+
+    def do_PUT(self):
+        type(self).version += 1
+        self._reply()
+
+    def log_message(self, *args):
+        pass
+
+
+class TestResponseCache:
+    def setup_method(self):
+        _Handler.calls = []
+        _Handler.version = 1
+        self.server = HTTPServer(("127.0.0.1", 0), _Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def teardown_method(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def get_connection(self, location):
+        connection = Connection(
+            "127.0.0.1", self.server.server_port, scheme=REQUEST.SCHEME.HTTP
+        )
+        connection.session = Session()
+        connection.response_cache = ResponseCache(str(location), 1024 * 1024)
+        return connection
+
+    def test_ttl(self, tmp_path):
+        cache = ResponseCache(str(tmp_path), 1024)
+        assert cache.get_ttl("get", BP_ENDPOINT) == 60
+        assert cache.get_ttl("get", APP_ENDPOINT) == 0
+        assert cache.get_ttl("post", "api/nutanix/v3/images/list") == 300
+        assert cache.get_ttl("post", "api/nutanix/v3/blueprints/list") is None
+        assert cache.get_ttl("put", BP_ENDPOINT) is None
+
+    def test_fresh_response_and_invalidation(self, tmp_path):
+        connection = self.get_connection(tmp_path)
+
+        for _ in range(2):
+            res, err = connection._call(
+                BP_ENDPOINT, method=REQUEST.METHOD.GET, timeout=(5, 5)
+            )
+            assert err is None
+            assert res.json()["version"] == 1
+
+        # Second call is served from cache
+        assert len(_Handler.calls) == 1
+
+        # Update of blueprint drops its cached responses
+        res, err = connection._call(BP_ENDPOINT, method=REQUEST.METHOD.PUT)
+        assert err is None
+        res, err = connection._call(BP_ENDPOINT, method=REQUEST.METHOD.GET)
+        assert res.json()["version"] == 2
+        assert len(_Handler.calls) == 3
+
+    def test_revalidation(self, tmp_path):
+        connection = self.get_connection(tmp_path)
+
+        for _ in range(2):
+            res, err = connection._call(
+                APP_ENDPOINT, method=REQUEST.METHOD.GET, timeout=(5, 5)
+            )
+            assert err is None
+            assert res.status_code == 200
+            assert res.json()["version"] == 1
+
+        # Server is asked every time, and second response is the cached one
+        assert len(_Handler.calls) == 2
+
+        # Modified app is downloaded again
+        _Handler.version = 2
+        res, err = connection._call(APP_ENDPOINT, method=REQUEST.METHOD.GET)
+        assert res.json()["version"] == 2
+
+    def test_lru_eviction(self, tmp_path):
+        cache = ResponseCache(str(tmp_path), 4000)
+        for index in range(4):
+            cached = CachedResponse("url", 200, {}, b"x" * 900, "utf-8", stored_at=0)
+            cache.put(
+                "post", "api/nutanix/v3/images/list", cached, body={"offset": index}
+            )
+
+            # Reading an entry makes it most recently used
+            cache.get("post", "api/nutanix/v3/images/list", body={"offset": 0})
+
+        assert cache.get("post", "api/nutanix/v3/images/list", body={"offset": 0})
+        assert not cache.get("post", "api/nutanix/v3/images/list", body={"offset": 1})
+        assert cache.get("post", "api/nutanix/v3/images/list", body={"offset": 3})
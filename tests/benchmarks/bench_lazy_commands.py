@@ -0,0 +1,48 @@
+"""Compares cold import time of cli with lazy commands and with all command
+modules imported. Exits with non-zero status if lazy import is not at least
+MIN_STARTUP_SAVING faster.
+
+Run from repo root: python -m tests.benchmarks.bench_lazy_commands
+"""
+
+import sys
+
+from tests.benchmarks.utils import run_script
+
+# Cold start with lazy commands must be at least this much faster than importing all commands
+MIN_STARTUP_SAVING = 0.2
+
+IMPORT_TIME_SCRIPT = """
+import time
+start = time.time()
+import calm.dsl.cli
+if {eager}:
+    from calm.dsl.cli.lazy_commands import load_command_modules
+    load_command_modules()
+print(time.time() - start)
+"""
+
+
+def get_import_time(eager, runs=3):
+    times = [
+        float(run_script(IMPORT_TIME_SCRIPT.format(eager=eager))) for _ in range(runs)
+    ]
+    return sorted(times)[runs // 2]
+
+
+def main():
+    lazy_time = get_import_time(eager=False)
+    eager_time = get_import_time(eager=True)
+    print("Import time: lazy {:.3f}s, eager {:.3f}s".format(lazy_time, eager_time))
+
+    if lazy_time > eager_time * (1 - MIN_STARTUP_SAVING):
+        print(
+            "Cold start regressed, lazy import must be {:.0%} faster".format(
+                MIN_STARTUP_SAVING
+            )
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
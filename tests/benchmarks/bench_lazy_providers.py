@@ -0,0 +1,40 @@
+"""Compares startup time of lazily initialised providers with initialising
+all providers.
+
+Run from repo root: python -m tests.benchmarks.bench_lazy_providers
+"""
+
+from tests.benchmarks.utils import run_script
+
+STARTUP_TIME_SCRIPT = """
+import time
+start = time.time()
+from calm.dsl.providers import get_provider, get_providers
+if {eager}:
+    for provider in get_providers().values():
+        provider.get_validator()
+else:
+    get_provider("AHV_VM").get_validator()
+print(time.time() - start)
+"""
+
+
+def get_startup_time(eager, runs=3):
+    times = [
+        float(run_script(STARTUP_TIME_SCRIPT.format(eager=eager))) for _ in range(runs)
+    ]
+    return sorted(times)[runs // 2]
+
+
+def main():
+    lazy_time = get_startup_time(eager=False)
+    eager_time = get_startup_time(eager=True)
+    print(
+        "Startup time: lazy {:.3f}s, all providers {:.3f}s".format(
+            lazy_time, eager_time
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Measures cost of disabled debug logs, compared to walking the stack, and
+time of compile and list paths issuing debug logs.
+
+Run from repo root: python -m tests.benchmarks.bench_log_overhead
+"""
+
+import inspect
+import logging
+import timeit
+from unittest.mock import MagicMock
+
+from calm.dsl.api.connection import Connection, REQUEST
+from calm.dsl.api.resource import ResourceAPI
+from calm.dsl.log import CustomLogging
+from tests.test_log_overhead import LOG, LoggedService, _list_response
+
+
+def main(runs=2000):
+    CustomLogging.set_verbose_level(logging.INFO)
+
+    disabled_time = timeit.timeit(
+        lambda: LOG.debug("Validating object: %s", {"a": 1}), number=runs
+    )
+    stack_time = timeit.timeit(lambda: inspect.stack(), number=runs)
+    print(
+        "Time per call: disabled debug log {:.2f}us, stack walk {:.2f}us".format(
+            disabled_time * 1000000 / runs, stack_time * 1000000 / runs
+        )
+    )
+
+    connection = Connection("127.0.0.1", 9440, scheme=REQUEST.SCHEME.HTTP)
+    connection.session = MagicMock()
+    connection.session.post.return_value = _list_response(0, 1000)
+    resource = ResourceAPI(connection, "blueprints")
+
+    compile_time = timeit.timeit(LoggedService.json_dumps, number=50)
+    list_time = timeit.timeit(lambda: resource.list_all(api_limit=1000), number=runs)
+    print(
+        "Compile time per run {:.2f}ms, list time per run {:.2f}us".format(
+            compile_time * 1000 / 50, list_time * 1000000 / runs
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
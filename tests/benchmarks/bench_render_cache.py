@@ -0,0 +1,32 @@
+"""Compares rendering a decompile template from the shared environment with
+creating an environment and parsing the template on every call.
+
+Run from repo root: python -m tests.benchmarks.bench_render_cache
+"""
+
+import timeit
+
+from calm.dsl.decompile.render import render_template
+from tests.decompile.test_render_cache import (
+    SCHEMA_FILE,
+    _render_without_cache,
+    _var_attrs,
+)
+
+
+def main(runs=200):
+    cached_time = timeit.timeit(
+        lambda: render_template(SCHEMA_FILE, _var_attrs(1)), number=runs
+    )
+    uncached_time = timeit.timeit(
+        lambda: _render_without_cache(SCHEMA_FILE, _var_attrs(1)), number=runs
+    )
+    print(
+        "Time per render: shared environment {:.2f}us, new environment {:.2f}us".format(
+            cached_time * 1000000 / runs, uncached_time * 1000000 / runs
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
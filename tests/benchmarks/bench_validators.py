@@ -0,0 +1,37 @@
+"""Compares validation time of provider specs using cached compiled
+validators and a new validator per call.
+
+Run from repo root: python -m tests.benchmarks.bench_validators
+"""
+
+import copy
+import timeit
+
+from calm.dsl.tools.validator import StrictDraft7Validator, get_validator
+from tests.providers.test_compiled_validators import get_example_specs
+
+
+def main(runs=50):
+    specs = get_example_specs()
+
+    def validate(get_spec_validator):
+        for schema, spec in specs:
+            get_spec_validator(schema).validate(copy.deepcopy(spec))
+
+    def validate_copies():
+        for schema, spec in specs:
+            copy.deepcopy(spec)
+
+    copy_time = timeit.timeit(validate_copies, number=runs)
+    old_time = timeit.timeit(lambda: validate(StrictDraft7Validator), number=runs)
+    new_time = timeit.timeit(lambda: validate(get_validator), number=runs)
+    old_time, new_time = old_time - copy_time, new_time - copy_time
+    print(
+        "Validation time per run: validator per call {:.3f}ms, compiled {:.3f}ms".format(
+            old_time * 1000 / runs, new_time * 1000 / runs
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,11 @@
+import sys
+import subprocess
+
+
+def run_script(script):
+    """runs python script in a fresh interpreter, returns last line of its output"""
+
+    res = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, check=True, text=True
+    )
+    return res.stdout.strip().splitlines()[-1]
@@ -0,0 +1,126 @@
+from unittest import mock
+
+import pytest
+
+from calm.dsl.api.blueprint import BlueprintAPI
+from calm.dsl.builtins.models.brownfield import BrownfieldVmIndex, get_bf_vm_data
+
+TOTAL_VMS = 600
+PAGE_LENGTH = 250
+
+
+class Response:
+    def __init__(self, data):
+        self.data = data
+
+    def json(self):
+        return self.data
+
+
+def get_vm_entity(index):
+    return {
+        "status": {
+            "resources": {
+                "instance_name": "vm-{}".format(index),
+                "instance_id": "id-{}".format(index),
+                "address": ["10.0.{}.{}".format(index // 256, index % 256)],
+                "public_ip_address": ["10.0.{}.{}".format(index // 256, index % 256)],
+            }
+        }
+    }
+
+
+def list_brownfield_vms(payload):
+    offset, length = payload["offset"], payload["length"]
+    entities = [
+        get_vm_entity(index) for index in range(offset, min(offset + length, TOTAL_VMS))
+    ]
+    return (
+        Response({"entities": entities, "metadata": {"total_matches": TOTAL_VMS}}),
+        None,
+    )
+
+
+class TestBrownfieldVmIndex:
+    @mock.patch("calm.dsl.builtins.models.brownfield.get_api_client")
+    def test_vms_listed_once_per_account(self, get_api_client):
+        client = get_api_client.return_value
+        client.blueprint.brownfield_vms.side_effect = list_brownfield_vms
+        client.blueprint.brownfield_vms_list_all.side_effect = (
+            lambda params: BlueprintAPI.brownfield_vms_list_all(
+                client.blueprint, params
+            )
+        )
+        BrownfieldVmIndex.reset()
+
+        for index in range(0, TOTAL_VMS, 2):
+            vm_data = get_bf_vm_data(
+                "AWS_VM", "project", "account", instance_name="vm-{}".format(index)
+            )
+            assert vm_data["instance_id"] == "id-{}".format(index)
+
+        # VMs beyond the first page are resolved using ip address and instance id
+        vm_data = get_bf_vm_data(
+            "AWS_VM", "project", "account", ip_address=["10.0.2.87"]
+        )
+        assert vm_data["instance_name"] == "vm-599"
+        vm_data = get_bf_vm_data("AWS_VM", "project", "account", instance_id="id-501")
+        assert vm_data["instance_name"] == "vm-501"
+
+        pages = (TOTAL_VMS + PAGE_LENGTH - 1) // PAGE_LENGTH
+        assert client.blueprint.brownfield_vms.call_count == pages
+
+    @mock.patch("calm.dsl.builtins.models.brownfield.get_api_client")
+    def test_azure_private_ip(self, get_api_client):
+        """Azure vms without public ip are matched on private ip"""
+
+        entities = []
+        for index, public_ips in enumerate([[], ["20.0.0.1"]]):
+            entities.append(
+                {
+                    "status": {
+                        "resources": {
+                            "instance_name": "vm-{}".format(index),
+                            "instance_id": "id-{}".format(index),
+                            "address": public_ips,
+                            "public_ip_address": public_ips,
+                            "private_ip_address": "10.0.0.{}".format(index),
+                            "resource_group": "rg-{}".format(index),
+                        }
+                    }
+                }
+            )
+        client = get_api_client.return_value
+        client.blueprint.brownfield_vms_list_all.return_value = (entities, None)
+        BrownfieldVmIndex.reset()
+
+        vm_data = get_bf_vm_data(
+            "AZURE_VM", "project", "account", ip_address=["10.0.0.0"]
+        )
+        assert vm_data == {
+            "instance_name": "vm-0",
+            "instance_id": "id-0",
+            "address": ["10.0.0.0"],
+            "platform_data": {"resource_group": "rg-0"},
+        }
+
+        vm_data = get_bf_vm_data("AZURE_VM", "project", "account", instance_name="vm-0")
+        assert vm_data["address"] == ["10.0.0.0"]
+
+        # Private ip is used only if vm has no public ip, and is not matched partially
+        for ip_address in ["10.0.0.1", "10.0.0"]:
+            with pytest.raises(SystemExit):
+                get_bf_vm_data(
+                    "AZURE_VM", "project", "account", ip_address=[ip_address]
+                )
+
+        vm_data = get_bf_vm_data(
+            "AZURE_VM", "project", "account", ip_address=["20.0.0.1"]
+        )
+        assert vm_data["instance_name"] == "vm-1"
+        assert vm_data["platform_data"] == {"resource_group": "rg-1"}
+
+        # Vms are listed once for all names, without instance_name filter
+        client.blueprint.brownfield_vms_list_all.assert_called_once_with(
+            {"filter": "project_uuid==project;account_uuid==account"}
+        )
@@ -0,0 +1,246 @@
+import copy
+import json
+import os
+from concurrent.futures import as_completed
+from unittest.mock import MagicMock, patch
+
+import click
+
+import pytest
+
+from calm.dsl.builtins import (
+    Service,
+    Package,
+    Substrate,
+    Deployment,
+    Profile,
+    Blueprint,
+    CalmTask,
+    CalmVariable,
+    action,
+    provider_spec,
+    ref,
+    get_valid_identifier,
+)
+from calm.dsl.cli import bps
+from calm.dsl.cli.constants import DECOMPILE
+
+
+class MySQL(Service):
+    """mysql service"""
+
+    PORT = CalmVariable.Simple.int("3306", is_mandatory=True)
+
+    @action
+    def __create__():
+        CalmTask.Exec.ssh(name="Task1", script="echo 'created'")
+
+
+class MySQLPackage(Package):
+    services = [ref(MySQL)]
+
+    @action
+    def __install__():
+        CalmTask.Exec.ssh(name="Task2", script="echo 'installed'")
+
+
+class MySQLSubstrate(Substrate):
+    provider_type = "EXISTING_VM"
+    provider_spec = provider_spec({"address": "10.0.0.1"})
+
+
+class MySQLDeployment(Deployment):
+    packages = [ref(MySQLPackage)]
+    substrate = ref(MySQLSubstrate)
+
+
+class Default(Profile):
+    deployments = [MySQLDeployment]
+
+
+class MySQLBlueprint(Blueprint):
+    """mysql blueprint"""
+
+    services = [MySQL]
+    packages = [MySQLPackage]
+    substrates = [MySQLSubstrate]
+    profiles = [Default]
+
+
+BP_RESOURCES = json.loads(MySQLBlueprint.json_dumps())
+BP_RESOURCES["client_attrs"] = {}
+
+
+def _bp_entity(bp_uuid, name, last_update_time):
+    return {
+        "status": {"name": name},
+        "metadata": {"uuid": bp_uuid, "last_update_time": last_update_time},
+    }
+
+
+def _get_client(entities, failed_uuids=(), invalid_uuids=()):
+    def export_file(bp_uuid):
+        if bp_uuid in failed_uuids:
+            return None, {"code": 500, "error": "export failed"}
+
+        name = next(
+            entity["status"]["name"]
+            for entity in entities
+            if entity["metadata"]["uuid"] == bp_uuid
+        )
+        resources = copy.deepcopy(BP_RESOURCES)
+        if bp_uuid in invalid_uuids:
+            # Decompile exits on reserved entity names
+            resources["service_definition_list"][0]["name"] = "Service"
+
+        res = MagicMock()
+        res.json.return_value = {
+            "spec": {
+                "name": name,
+                "description": "",
+                "resources": resources,
+            },
+            "metadata": {"kind": "blueprint", "uuid": bp_uuid, "name": name},
+        }
+        return res, None
+
+    client = MagicMock()
+    client.connection._pool_maxsize = 4
+    client.blueprint.list_all.return_value = entities
+    client.blueprint.export_file.side_effect = export_file
+    return client
+
+
+def _decompile_bps(client, export_dir, **kwargs):
+    with patch.object(bps, "get_api_client", return_value=client):
+        bps.decompile_bps(export_dir=export_dir, workers=2, **kwargs)
+
+
+def _read_state(export_dir):
+    with open(os.path.join(export_dir, DECOMPILE.STATE_FILE)) as fd:
+        return json.load(fd)
+
+
+class TestBulkDecompile:
+    def test_decompile_bps(self, tmp_path):
+        export_dir = str(tmp_path)
+        entities = [
+            _bp_entity("uuid-1-0000", "bp-1", "100"),
+            _bp_entity("uuid-2-0000", "bp 2", "100"),
+            _bp_entity("uuid-3-0000", "bp-1", "100"),
+        ]
+        client = _get_client(entities)
+        _decompile_bps(client, export_dir, name="bp")
+
+        params = client.blueprint.list_all.call_args[1]["base_params"]
+        assert params["filter"].startswith("(name==")
+        assert client.blueprint.export_file.call_count == 3
+
+        # Blueprints with same name are placed in separate directories
+        state = _read_state(export_dir)
+        assert sorted(entry["dir"] for entry in state.values()) == [
+            "bp1",
+            "bp1_uuid-3-0",
+            "bp2",
+        ]
+        for entry in state.values():
+            bp_file = os.path.join(export_dir, entry["dir"], "blueprint.py")
+            with open(bp_file) as fd:
+                assert (
+                    "class {}(Blueprint)".format(get_valid_identifier(entry["name"]))
+                    in fd.read()
+                )
+
+        # Only updated blueprints are exported again
+        entities[1]["metadata"]["last_update_time"] = "200"
+        client = _get_client(entities)
+        _decompile_bps(client, export_dir)
+        assert client.blueprint.export_file.call_args_list == [(("uuid-2-0000",), {})]
+        assert _read_state(export_dir)["uuid-2-0000"]["last_update_time"] == "200"
+
+        client = _get_client(entities)
+        _decompile_bps(client, export_dir, force=True)
+        assert client.blueprint.export_file.call_count == 3
+
+    def test_force_with_filter(self, tmp_path):
+        export_dir = str(tmp_path)
+        entities = [
+            _bp_entity("uuid-1-0000", "bp-1", "100"),
+            _bp_entity("uuid-2-0000", "other", "100"),
+        ]
+        _decompile_bps(_get_client(entities), export_dir)
+
+        # Forced export of filtered blueprints keeps records of other blueprints
+        client = _get_client(entities[1:])
+        _decompile_bps(client, export_dir, name="other", force=True)
+        assert client.blueprint.export_file.call_count == 1
+        assert sorted(_read_state(export_dir)) == ["uuid-1-0000", "uuid-2-0000"]
+
+        client = _get_client(entities)
+        _decompile_bps(client, export_dir)
+        assert client.blueprint.export_file.call_count == 0
+
+        # New blueprint with name of existing directory does not overwrite it
+        entities.append(_bp_entity("uuid-3-0000", "other", "100"))
+        client = _get_client(entities[2:])
+        _decompile_bps(client, export_dir, name="other", force=True)
+        assert _read_state(export_dir)["uuid-3-0000"]["dir"] == "other_uuid-3-0"
+        assert _read_state(export_dir)["uuid-2-0000"]["dir"] == "other"
+
+    def test_failed_bps(self, tmp_path):
+        export_dir = str(tmp_path)
+        entities = [
+            _bp_entity("uuid-1-0000", "bp-1", "100"),
+            _bp_entity("uuid-2-0000", "bp-2", "100"),
+        ]
+        client = _get_client(entities, failed_uuids=["uuid-2-0000"])
+        with pytest.raises(SystemExit):
+            _decompile_bps(client, export_dir)
+
+        # Failed blueprints are retried in next export
+        assert list(_read_state(export_dir)) == ["uuid-1-0000"]
+        client = _get_client(entities)
+        _decompile_bps(client, export_dir)
+        assert client.blueprint.export_file.call_args_list == [(("uuid-2-0000",), {})]
+
+    def test_failed_decompile(self, tmp_path, capsys):
+        export_dir = str(tmp_path)
+        entities = [
+            _bp_entity("uuid-1-0000", "bp-1", "100"),
+            _bp_entity("uuid-2-0000", "bp-2", "100"),
+            _bp_entity("uuid-3-0000", "bp-3", "100"),
+        ]
+        client = _get_client(entities, invalid_uuids=["uuid-2-0000"])
+        with pytest.raises(SystemExit):
+            _decompile_bps(client, export_dir)
+
+        # Other blueprints of the run are exported and recorded
+        assert "Exported 2 blueprints" in click.unstyle(capsys.readouterr().out)
+        assert sorted(_read_state(export_dir)) == ["uuid-1-0000", "uuid-3-0000"]
+
+        client = _get_client(entities)
+        _decompile_bps(client, export_dir)
+        assert client.blueprint.export_file.call_args_list == [(("uuid-2-0000",), {})]
+
+    def test_interrupted_export(self, tmp_path):
+        export_dir = str(tmp_path)
+        entities = [
+            _bp_entity("uuid-{}-0000".format(index), "bp-{}".format(index), "100")
+            for index in range(3)
+        ]
+        calls = []
+
+        def interrupted_as_completed(futures):
+            """interrupts the run after first blueprint is decompiled"""
+
+            calls.append(futures)
+            for index, future in enumerate(as_completed(futures)):
+                if len(calls) == 2 and index == 1:
+                    raise KeyboardInterrupt()
+                yield future
+
+        with patch.object(bps, "as_completed", new=interrupted_as_completed):
+            with pytest.raises(KeyboardInterrupt):
+                _decompile_bps(_get_client(entities), export_dir)
+
+        assert len(_read_state(export_dir)) == 1
@@ -0,0 +1,50 @@
+import json
+
+from calm.dsl.builtins import Service, CalmVariable
+from calm.dsl.tools import profile_span, start_profiling, stop_profiling
+
+
+class ProfiledService(Service):
+    """profiled service"""
+
+    PORT = CalmVariable.Simple("3306")
+
+
+class TestCompileProfile:
+    def test_profile_disabled(self):
+        assert stop_profiling() is None
+        with profile_span("phase", "compile") as span:
+            assert span is None
+
+    def test_profile_spans(self):
+        profiler = start_profiling()
+        try:
+            with profile_span("phase", "compile"):
+                with profile_span("file", "spec.yaml"):
+                    pass
+                ProfiledService.get_dict()
+        finally:
+            assert stop_profiling() is profiler
+
+        (root,) = profiler.spans
+        assert [(span.category, span.name) for span in root.children] == [
+            ("file", "spec.yaml"),
+            ("serialize", "ProfiledService"),
+        ]
+
+        # Entities are timed as they are compiled during serialization
+        compiled = [span.name for span in root.children[1].children]
+        assert compiled[:2] == ["Service ProfiledService", "Variable PORT"]
+
+        lines = profiler.get_tree_lines()
+        assert lines[0].startswith("compile [phase]")
+        assert lines[1].startswith("  spec.yaml [file]")
+
+        summary = profiler.get_category_summary()
+        assert summary["compile"][1] == len(compiled)
+
+        trace = json.loads(json.dumps(profiler.get_chrome_trace()))
+        events = trace["traceEvents"]
+        assert len(events) == len(compiled) + 3
+        assert all(event["ph"] == "X" for event in events)
+        assert events[0]["dur"] >= events[1]["dur"]
@@ -0,0 +1,51 @@
+import sys
+import json
+import subprocess
+
+from calm.dsl.cli.lazy_commands import (
+    COMMAND_MODULES,
+    LAZY_COMMAND_MAP,
+    generate_lazy_command_map,
+)
+
+LOADED_MODULES_SCRIPT = """
+import sys, json
+from calm.dsl.cli import main
+if {args} is not None:
+    try:
+        main({args}, standalone_mode=False)
+    except SystemExit:
+        pass
+print(json.dumps([m.rsplit(".", 1)[-1] for m in sys.modules if m.startswith("calm.dsl.cli.")]))
+"""
+
+
+def run_script(script):
+    res = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, check=True, text=True
+    )
+    return res.stdout.strip().splitlines()[-1]
+
+
+def get_loaded_command_modules(args):
+    modules = json.loads(run_script(LOADED_MODULES_SCRIPT.format(args=args)))
+    return set(modules) & set(COMMAND_MODULES)
+
+
+class TestLazyCommands:
+    def test_lazy_command_map(self):
+        """LAZY_COMMAND_MAP must be regenerated whenever commands change"""
+
+        assert generate_lazy_command_map() == LAZY_COMMAND_MAP
+
+    def test_no_command_module_loaded_on_import(self):
+        assert get_loaded_command_modules(None) == set()
+
+    def test_only_required_modules_loaded(self):
+        assert get_loaded_command_modules(["get", "apps", "--help"]) == {"app_commands"}
+        assert get_loaded_command_modules(["get", "library", "tasks", "--help"]) == {
+            "library_tasks_commands"
+        }
+
+    def test_all_modules_loaded_for_group_help(self):
+        assert get_loaded_command_modules(["get", "--help"]) == set(COMMAND_MODULES)
@@ -0,0 +1,132 @@
+from unittest import mock
+
+from calm.dsl.cli.polling import (
+    PollScheduler,
+    poll_until_complete,
+    WatchTarget,
+    MultiWatcher,
+)
+
+
+class Response:
+    def __init__(self, data):
+        self.data = data
+
+    def json(self):
+        return self.data
+
+
+class TestPollScheduler:
+    def test_backoff_and_reset(self):
+        scheduler = PollScheduler(min_interval=1, max_interval=5, backoff=2, jitter=0)
+
+        assert scheduler.update("RUNNING")
+        assert scheduler.next_delay() == 1
+
+        intervals = []
+        for _ in range(4):
+            assert not scheduler.update("RUNNING")
+            intervals.append(scheduler.next_delay())
+        assert intervals == [2, 4, 5, 5]
+
+        # State change resets the interval
+        assert scheduler.update("SUCCESS")
+        assert scheduler.next_delay() == 1
+
+    def test_jitter(self):
+        scheduler = PollScheduler(min_interval=4, max_interval=4, jitter=0.25)
+        for _ in range(20):
+            assert 3 <= scheduler.next_delay() <= 5
+
+    @mock.patch("calm.dsl.cli.polling.time.sleep")
+    def test_unchanged_response_not_rendered(self, _sleep):
+        states = ["RUNNING", "RUNNING", "RUNNING", "SUCCESS"]
+        responses = iter(
+            [(Response({"entities": [{"state": state}]}), None) for state in states]
+        )
+        rendered = []
+
+        def completion_func(response):
+            state = response["entities"][0]["state"]
+            rendered.append(state)
+            return (state == "SUCCESS", state)
+
+        res = poll_until_complete(
+            lambda: next(responses), completion_func, poll_interval=60
+        )
+
+        assert res == (True, "SUCCESS")
+        assert rendered == ["RUNNING", "SUCCESS"]
+
+
+class TestMultiWatcher:
+    @staticmethod
+    def get_target(name, states, failed_states=("FAILURE",)):
+        responses = iter(states)
+
+        def poll_func():
+            return Response({"state": next(responses)}), None
+
+        def status_func(response):
+            state = response["state"]
+            return (
+                state,
+                state in ("SUCCESS",) + failed_states,
+                state in failed_states,
+            )
+
+        target = WatchTarget(name, poll_func, status_func)
+        target.scheduler.min_interval = target.scheduler.interval = 0
+        return target
+
+    @mock.patch("calm.dsl.cli.polling.time.sleep")
+    def test_watch_multiple_targets(self, _sleep):
+        targets = [
+            self.get_target("app1", ["RUNNING", "SUCCESS"]),
+            self.get_target("app2", ["RUNNING", "RUNNING", "FAILURE"]),
+            self.get_target("app3", ["SUCCESS"]),
+        ]
+
+        failed_targets = MultiWatcher(targets, max_workers=2).run()
+
+        assert [target.name for target in failed_targets] == ["app2"]
+        assert [target.state for target in targets] == [
+            "SUCCESS",
+            "FAILURE",
+            "SUCCESS",
+        ]
+
+    @mock.patch("calm.dsl.cli.polling.time.sleep")
+    def test_poll_errors(self, _sleep):
+        def get_failing_target(name, results):
+            results = iter(results)
+
+            def poll_func():
+                result = next(results)
+                if isinstance(result, Exception):
+                    raise result
+                return result
+
+            target = self.get_target(name, [])
+            target.poll_func = poll_func
+            target.max_errors = 3
+            return target
+
+        timeout = ConnectionError("Read timed out")
+        server_error = (None, {"code": 503, "error": "Service unavailable"})
+        targets = [
+            self.get_target("app1", ["RUNNING", "RUNNING", "SUCCESS"]),
+            # Transient errors are retried
+            get_failing_target(
+                "app2", [timeout, server_error, (Response({"state": "SUCCESS"}), None)]
+            ),
+            # Consecutive errors mark only this target failed
+            get_failing_target("app3", [timeout, server_error, timeout]),
+        ]
+
+        failed_targets = MultiWatcher(targets, max_workers=2).run()
+
+        assert [target.name for target in failed_targets] == ["app3"]
+        assert targets[0].state == "SUCCESS"
+        assert targets[1].state == "SUCCESS"
+        assert targets[2].state == "ERROR (3/3): Read timed out"
@@ -0,0 +1,142 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from calm.dsl.cli.runlog import RunlogTree, RunlogOutputCache
+
+
+def get_runlog(uuid, parent, state, task, creation_time):
+    return {
+        "metadata": {
+            "uuid": uuid,
+            "creation_time": str(creation_time * 1000000),
+            "last_update_time": str((creation_time + 1) * 1000000),
+        },
+        "status": {
+            "type": "task_runlog",
+            "state": state,
+            "root_reference": {"uuid": "root"},
+            "parent_reference": {"uuid": parent},
+            "task_reference": {"uuid": task, "name": task},
+        },
+    }
+
+
+class TestRunlogTree:
+    def test_incremental_merge(self):
+        task_type_map = {"t1": "EXEC", "t2": "META", "t3": "EXEC"}
+        tree = RunlogTree("root", task_type_map, ["t1", "t2"])
+
+        tree.merge([get_runlog("a", "root", "RUNNING", "t1", 1)])
+        tree.get_lines()
+        assert tree.completed_tasks == 0
+
+        # Children of meta task are attached to its parent, sorted on creation time
+        tree.merge(
+            [
+                get_runlog("a", "root", "SUCCESS", "t1", 1),
+                get_runlog("m", "root", "RUNNING", "t2", 2),
+                get_runlog("c", "m", "RUNNING", "t3", 4),
+                get_runlog("b", "m", "RUNNING", "t3", 3),
+            ]
+        )
+        assert [child.runlog["metadata"]["uuid"] for child in tree.root.children] == [
+            "a",
+            "b",
+            "c",
+        ]
+        assert "m" not in tree.nodes
+        assert tree.completed_tasks == 1
+        assert tree.get_first_unfinished_runlog()["metadata"]["uuid"] == "m"
+
+        tree.get_lines()
+        assert not any(node.dirty for node in tree.nodes.values())
+
+        # Only changed nodes are marked dirty
+        tree.merge(
+            [
+                get_runlog("a", "root", "SUCCESS", "t1", 1),
+                get_runlog("m", "root", "RUNNING", "t2", 2),
+                get_runlog("b", "m", "SUCCESS", "t3", 3),
+                get_runlog("c", "m", "RUNNING", "t3", 4),
+            ]
+        )
+        assert [uuid for uuid, node in tree.nodes.items() if node.dirty] == ["b"]
+
+
+class TestRunlogOutputCache:
+    def _get_client(self, errors):
+        def runlog_output(runlog_uuid, task_runlog_uuid):
+            if task_runlog_uuid in errors:
+                return None, {"code": 500, "error": "output fetch failed"}
+
+            res = MagicMock()
+            res.json.return_value = {
+                "status": {
+                    "output_list": [{"output": "{} output".format(task_runlog_uuid)}]
+                    if task_runlog_uuid != "empty"
+                    else []
+                }
+            }
+            return res, None
+
+        client = MagicMock()
+        client.runbook.runlog_output.side_effect = runlog_output
+        return client
+
+    def _fetched_uuids(self, client):
+        uuids = [call[0][1] for call in client.runbook.runlog_output.call_args_list]
+        client.runbook.runlog_output.reset_mock()
+        return sorted(uuids)
+
+    def test_outputs_cached(self):
+        errors = set()
+        client = self._get_client(errors)
+        cache = RunlogOutputCache(client, "root", max_workers=2)
+
+        runlogs = [
+            get_runlog("a", "root", "SUCCESS", "t1", 1),
+            get_runlog("b", "root", "RUNNING", "t1", 2),
+            get_runlog("empty", "root", "FAILURE", "t1", 3),
+        ]
+        assert cache.get_outputs(runlogs) == {
+            "a": "a output",
+            "b": "b output",
+            "empty": None,
+        }
+        assert self._fetched_uuids(client) == ["a", "b", "empty"]
+
+        # Outputs of terminal tasks are not fetched again, running ones are
+        runlogs[1] = get_runlog("b", "root", "SUCCESS", "t1", 2)
+        assert cache.get_outputs(runlogs)["b"] == "b output"
+        assert self._fetched_uuids(client) == ["b"]
+
+        assert cache.get_outputs(runlogs) == {
+            "a": "a output",
+            "b": "b output",
+            "empty": None,
+        }
+        assert self._fetched_uuids(client) == []
+
+        # Task running again on rerun is fetched again
+        runlogs[0] = get_runlog("a", "root", "RUNNING", "t1", 1)
+        cache.get_outputs(runlogs)
+        assert self._fetched_uuids(client) == ["a"]
+
+    def test_fetch_error(self):
+        errors = {"b"}
+        client = self._get_client(errors)
+        cache = RunlogOutputCache(client, "root", max_workers=2)
+
+        runlogs = [
+            get_runlog("a", "root", "SUCCESS", "t1", 1),
+            get_runlog("b", "root", "SUCCESS", "t1", 2),
+        ]
+        with pytest.raises(Exception) as exc_info:
+            cache.get_outputs(runlogs)
+        assert "output fetch failed" in str(exc_info.value)
+
+        # Failed output is not cached, it is fetched on next call
+        errors.clear()
+        assert cache.get_outputs(runlogs)["b"] == "b output"
+        assert "b" in self._fetched_uuids(client)
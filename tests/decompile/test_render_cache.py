@@ -0,0 +1,65 @@
+import os
+
+from jinja2 import Environment, PackageLoader
+
+from calm.dsl.decompile import render
+from calm.dsl.decompile.render import TemplateBytecodeCache, render_template
+
+SCHEMA_FILE = "var_simple_string.py.jinja2"
+
+
+def _var_attrs(index):
+    return {
+        "name": "VAR_{}".format(index),
+        "value": "value",
+        "label": "",
+        "regex": None,
+        "is_mandatory": False,
+        "is_hidden": False,
+        "runtime": True,
+        "description": "",
+    }
+
+
+def _render_without_cache(schema_file, obj):
+    env = Environment(loader=PackageLoader(render.__name__, "schemas"))
+    return env.get_template(schema_file).render(obj=obj).strip()
+
+
+def _get_environment(cache_dir):
+    return Environment(
+        loader=PackageLoader(render.__name__, "schemas"),
+        bytecode_cache=TemplateBytecodeCache(cache_dir),
+    )
+
+
+class TestRenderCache:
+    def test_shared_environment(self):
+        assert render.get_environment() is render.get_environment()
+        assert render.get_template(SCHEMA_FILE) is render.get_template(SCHEMA_FILE)
+
+        assert render_template(SCHEMA_FILE, _var_attrs(1)) == _render_without_cache(
+            SCHEMA_FILE, _var_attrs(1)
+        )
+
+    def test_bytecode_cache(self, tmp_path):
+        cache_dir = str(tmp_path)
+        text = _get_environment(cache_dir).get_template(SCHEMA_FILE).render(obj={})
+
+        cache_files = os.listdir(cache_dir)
+        assert len(cache_files) == 1
+
+        # Templates are loaded from cache in new environments
+        env = _get_environment(cache_dir)
+        assert env.get_template(SCHEMA_FILE).render(obj={}) == text
+
+        # Partial cache files are ignored and rewritten
+        cache_file = os.path.join(cache_dir, cache_files[0])
+        with open(cache_file, "rb") as fd:
+            data = fd.read()
+        with open(cache_file, "wb") as fd:
+            fd.write(data[:10])
+
+        env = _get_environment(cache_dir)
+        assert env.get_template(SCHEMA_FILE).render(obj={}) == text
+        assert os.path.getsize(cache_file) == len(data)
@@ -0,0 +1,79 @@
+import os
+import copy
+import glob
+import random
+
+import pytest
+from ruamel import yaml
+
+from calm.dsl.providers import get_provider
+from calm.dsl.tools.validator import (
+    StrictDraft7Validator,
+    compile_schema,
+    get_validator,
+)
+
+TESTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Provider specs used by example blueprints
+EXAMPLE_SPECS = [
+    ("VMWARE_VM", "cli/provider_plugins/vmw/test_bp_creation/provider_spec.yaml")
+] + [
+    ("AHV_VM", os.path.relpath(spec_file, TESTS_DIR))
+    for spec_file in glob.glob(
+        os.path.join(TESTS_DIR, "*/specs/ahv_provider_spec.yaml")
+    )
+]
+
+
+def get_example_specs():
+    specs = []
+    for provider_type, spec_file in EXAMPLE_SPECS:
+        with open(os.path.join(TESTS_DIR, spec_file)) as fd:
+            spec = yaml.safe_load(fd)
+        specs.append((get_provider(provider_type).get_provider_spec(), spec))
+    return specs
+
+
+def mutate(instance, rand):
+    """randomly drops, adds or replaces a value in instance"""
+
+    if isinstance(instance, dict) and instance:
+        key = rand.choice(sorted(instance))
+        action = rand.random()
+        if action < 0.2:
+            instance.pop(key)
+        elif action < 0.3:
+            instance["unknown_property"] = 1
+        elif action < 0.5:
+            instance[key] = rand.choice([None, 1, 1.0, True, "value", [], {}])
+        else:
+            mutate(instance[key], rand)
+
+    elif isinstance(instance, list) and instance:
+        mutate(rand.choice(instance), rand)
+
+
+class TestCompiledValidators:
+    @pytest.mark.parametrize("schema, spec", get_example_specs())
+    def test_same_as_validator(self, schema, spec):
+        """compiled checks must give same result and defaults as the validator"""
+
+        validator = StrictDraft7Validator(schema)
+        check = compile_schema(schema)
+        assert check is not None
+
+        rand = random.Random(0)
+        for i in range(100):
+            instance = copy.deepcopy(spec)
+            if i:
+                mutate(instance, rand)
+
+            validated_instance = copy.deepcopy(instance)
+            assert check(instance) == validator.is_valid(validated_instance)
+            assert instance == validated_instance
+
+    def test_validator_cached_per_schema(self):
+        schema = {"type": "object", "properties": {"name": {"type": "string"}}}
+        assert get_validator(schema) is get_validator(schema)
+        assert get_validator(schema) is not get_validator(copy.deepcopy(schema))
@@ -0,0 +1,69 @@
+import sys
+import json
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from calm.dsl.providers import get_provider, get_providers
+from calm.dsl.providers.plugins import PROVIDER_PLUGINS
+
+LOADED_PLUGINS_SCRIPT = """
+import sys, json
+from calm.dsl.providers import get_provider, get_provider_types
+list(get_provider_types())
+if {provider_type!r}:
+    get_provider({provider_type!r}).get_validator()
+print(json.dumps(sorted(
+    m.rsplit(".", 1)[-1] for m in sys.modules if m.count(".") == 4 and m.startswith("calm.dsl.providers.plugins.")
+)))
+"""
+
+
+def run_script(script):
+    res = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, check=True, text=True
+    )
+    return res.stdout.strip().splitlines()[-1]
+
+
+class TestLazyProviders:
+    def test_provider_plugins_map(self):
+        """PROVIDER_PLUGINS must be updated whenever a provider plugin is added"""
+
+        providers = get_providers()
+        assert set(providers.keys()) == set(PROVIDER_PLUGINS.keys())
+        for provider_type, provider in providers.items():
+            assert provider.__module__.split(".")[4] == PROVIDER_PLUGINS[provider_type]
+
+    def test_only_used_plugin_loaded(self):
+        assert (
+            json.loads(run_script(LOADED_PLUGINS_SCRIPT.format(provider_type=None)))
+            == []
+        )
+        assert json.loads(
+            run_script(LOADED_PLUGINS_SCRIPT.format(provider_type="K8S_POD"))
+        ) == ["k8s"]
+
+    def test_concurrent_init(self):
+        class Provider(get_provider("K8S_POD")):
+            """Not registered, so it is initialised separately from K8S_POD"""
+
+            provider_type = None
+
+        workers = 8
+        barrier = threading.Barrier(workers)
+
+        def get_validator():
+            barrier.wait()
+            return Provider.get_validator()
+
+        with patch.object(Provider, "_init", wraps=Provider._init) as init:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                validators = list(
+                    executor.map(lambda _: get_validator(), range(workers))
+                )
+
+        assert init.call_count == 1
+        assert all(validator is validators[0] for validator in validators)
+        assert Provider.get_provider_spec() is Provider.provider_spec
@@ -0,0 +1,642 @@
+import copy
+import json
+import re
+from unittest.mock import MagicMock, patch
+
+import arrow
+import pytest
+from peewee import OperationalError, IntegrityError
+
+from calm.dsl.db import table_config
+from calm.dsl.db.table_config import (
+    dsl_database,
+    CacheSyncData,
+    CacheSyncStateTable,
+    AhvClustersCache,
+    AhvVpcsCache,
+    AhvSubnetsCache,
+    ProjectCache,
+    UsersCache,
+    get_entity_time_usecs,
+)
+from calm.dsl.store import Cache
+from calm.dsl.store import cache as cache_module
+from calm.dsl.store.sync_engine import CacheSyncEngine
+
+
+def _user_entity(uuid, name, creation_time, last_update_time=None):
+    """returns user entity created/updated at supplied epoch seconds"""
+
+    return {
+        "status": {"name": name, "resources": {"display_name": name}},
+        "metadata": {
+            "uuid": uuid,
+            "creation_time": arrow.get(creation_time).isoformat(),
+            "last_update_time": arrow.get(
+                last_update_time or creation_time
+            ).isoformat(),
+        },
+    }
+
+
+class UserAPI:
+    """Mocked user list api supporting `_last_update_time_usecs` filter"""
+
+    def __init__(self, entities):
+        self.entities = entities
+        self.supports_filter = True
+        self.delta_error = None
+        self.list_all_params = []
+
+    def list_all(self, base_params=None, ignore_error=False, fields=None, **kwargs):
+        self.list_all_params.append(base_params)
+
+        entities = copy.deepcopy(self.entities)
+        match = re.search(
+            r"_last_update_time_usecs=ge=(\d+)", base_params.get("filter", "")
+        )
+        if match:
+            if self.delta_error:
+                return [], self.delta_error
+
+            if self.supports_filter:
+                entities = [
+                    e
+                    for e in entities
+                    if get_entity_time_usecs(e, "last_update_time")
+                    >= int(match.group(1))
+                ]
+
+        return (entities, None) if ignore_error else entities
+
+    def list(self, params, ignore_error=False):
+        res = MagicMock()
+        res.json.return_value = {"metadata": {"total_matches": len(self.entities)}}
+        return res, None
+
+    def read(self, uuid):
+        res = MagicMock()
+        res.json.return_value = next(
+            e for e in self.entities if e["metadata"]["uuid"] == uuid
+        )
+        return res, None
+
+
+@pytest.fixture
+def cache_db(tmp_path):
+    """binds cache tables to a temporary db"""
+
+    database = dsl_database.database
+    dsl_database.init(str(tmp_path / "dsl.db"))
+    dsl_database.create_tables([UsersCache, CacheSyncStateTable])
+    yield
+    dsl_database.init(database)
+
+
+class MockedUserAPITest:
+    def setup_method(self):
+        self.api = UserAPI(
+            [
+                _user_entity("uuid-{}".format(i), "user{}".format(i), 100 + i)
+                for i in range(3)
+            ]
+        )
+        client = MagicMock()
+        client.user = self.api
+        self.patcher = patch.object(table_config, "get_api_client", return_value=client)
+        self.patcher.start()
+
+    def teardown_method(self):
+        self.patcher.stop()
+
+
+class TestDeltaSync(MockedUserAPITest):
+    def _sync(self):
+        sync_data = UsersCache.fetch_sync_data(UsersCache.get_sync_state())
+        UsersCache.apply_sync_data(sync_data)
+        return sync_data
+
+    def _get_rows(self):
+        return sorted((row.uuid, row.name) for row in UsersCache.select())
+
+    def _expected_rows(self):
+        return sorted(
+            (e["metadata"]["uuid"], e["status"]["name"]) for e in self.api.entities
+        )
+
+    def _update_entities(self):
+        """renames a user and adds a new one"""
+
+        self.api.entities[1] = _user_entity("uuid-1", "renamed", 101, 200)
+        self.api.entities.append(_user_entity("uuid-3", "user3", 300))
+
+    def test_full_sync(self, cache_db):
+        sync_data = self._sync()
+        assert not sync_data.is_delta
+        assert self._get_rows() == self._expected_rows()
+        assert UsersCache.get_sync_state()["high_water_mark"] == 102 * 10**6
+        assert UsersCache.get_sync_state()["total_matches"] == 3
+
+    def test_delta_sync(self, cache_db):
+        self._sync()
+        self._update_entities()
+
+        # Changed uuids are deleted in chunks
+        with patch.object(table_config, "SQLITE_MAX_VARIABLES", 1):
+            sync_data = self._sync()
+
+        assert sync_data.is_delta
+        # Entities updated at high-water mark are listed again
+        assert sync_data.changed_uuids == ["uuid-1", "uuid-2", "uuid-3"]
+        assert self.api.list_all_params[-1]["filter"] == (
+            "_last_update_time_usecs=ge={}".format(102 * 10**6)
+        )
+        assert self._get_rows() == self._expected_rows()
+
+        sync_state = UsersCache.get_sync_state()
+        assert sync_state["high_water_mark"] == 300 * 10**6
+        assert sync_state["total_matches"] == 4
+
+        # Nothing changed since last sync
+        sync_data = self._sync()
+        assert sync_data.is_delta
+        assert sync_data.changed_uuids == ["uuid-3"]
+        assert self._get_rows() == self._expected_rows()
+
+    def test_deleted_entities(self, cache_db):
+        """count mismatch denotes deleted entities, so table is synced fully"""
+
+        self._sync()
+        self._update_entities()
+        self.api.entities.pop(0)
+
+        sync_data = self._sync()
+        assert not sync_data.is_delta
+        assert self._get_rows() == self._expected_rows()
+        assert UsersCache.get_sync_state()["total_matches"] == 3
+
+    def test_delta_error(self, cache_db):
+        self._sync()
+        self._update_entities()
+        self.api.delta_error = {"code": 500, "error": "list failed"}
+
+        sync_data = self._sync()
+        assert not sync_data.is_delta
+        assert self._get_rows() == self._expected_rows()
+
+    def test_filter_not_supported(self, cache_db):
+        """stale entities in delta response denote filter is ignored by server"""
+
+        self._sync()
+        self._update_entities()
+        self.api.supports_filter = False
+
+        sync_data = self._sync()
+        assert not sync_data.is_delta
+        assert self._get_rows() == self._expected_rows()
+
+    def test_schema_change(self, cache_db):
+        self._sync()
+        self._update_entities()
+
+        with patch.object(UsersCache, "get_schema_signature", return_value="name,uuid"):
+            assert UsersCache.get_sync_state() is None
+            sync_data = self._sync()
+
+        assert not sync_data.is_delta
+        assert self._get_rows() == self._expected_rows()
+
+        # Sync state is stored with new signature
+        assert CacheSyncStateTable.get().schema == "name,uuid"
+
+
+class TestCreateEntries:
+    def _get_entries(self, count):
+        """returns subnet entries, having cluster, vpc or neither of them"""
+
+        entries = []
+        for index in range(count):
+            entry = {
+                "name": "subnet{}".format(index),
+                "uuid": "uuid-{:03d}".format(index),
+                "account_uuid": "account",
+            }
+            if index % 3 == 0:
+                entry["cluster_uuid"] = "cluster-{}".format(index)
+                entry["subnet_type"] = "VLAN"
+            elif index % 3 == 1:
+                entry["vpc_uuid"] = "vpc-{}".format(index)
+                entry["subnet_type"] = "OVERLAY"
+            entries.append(entry)
+        return entries
+
+    def _get_rows(self):
+        return list(AhvSubnetsCache.select().order_by(AhvSubnetsCache.uuid).dicts())
+
+    def _create_entries(self, entries):
+        """returns sizes of insert statements used to create entries"""
+
+        with patch.object(
+            AhvSubnetsCache, "insert_many", wraps=AhvSubnetsCache.insert_many
+        ) as insert_many:
+            AhvSubnetsCache.create_entries(entries)
+        return [len(call[0][0]) for call in insert_many.call_args_list]
+
+    @pytest.fixture(autouse=True)
+    def subnet_tables(self, cache_db):
+        dsl_database.create_tables([AhvClustersCache, AhvVpcsCache, AhvSubnetsCache])
+
+    def test_create_entries(self):
+        entries = self._get_entries(300)
+        for entry in entries:
+            AhvSubnetsCache.create_entry(**entry)
+        expected_rows = self._get_rows()
+        assert expected_rows[2]["cluster"] is None
+        assert expected_rows[2]["vpc"] is None
+
+        AhvSubnetsCache.clear()
+        batch_size = table_config.SQLITE_MAX_VARIABLES // len(
+            AhvSubnetsCache._meta.fields
+        )
+        assert self._create_entries(entries) == [
+            batch_size,
+            batch_size,
+            300 - 2 * batch_size,
+        ]
+        assert self._get_rows() == expected_rows
+
+        AhvSubnetsCache.clear()
+        with patch.object(table_config, "SQLITE_MAX_VARIABLES", 20):
+            assert self._create_entries(entries[:5]) == [2, 2, 1]
+        assert self._get_rows() == expected_rows[:5]
+
+    def test_rollback(self):
+        entries = self._get_entries(5)
+        entries[4]["name"] = None
+
+        with patch.object(table_config, "SQLITE_MAX_VARIABLES", 20):
+            with pytest.raises(IntegrityError):
+                self._create_entries(entries)
+
+        # Chunks inserted before failure are rolled back
+        assert self._get_rows() == []
+
+
+class TestProjectCacheEntries:
+    """Subnets, clusters and vpcs of two nutanix_pc accounts, pc-2 failing to list subnets"""
+
+    PC_ACCOUNT_ENTITIES = {
+        ("pc-1", "subnets"): [
+            {
+                "metadata": {"uuid": "subnet-vlan"},
+                "status": {
+                    "resources": {"subnet_type": "VLAN"},
+                    "cluster_reference": {"uuid": "cluster-1"},
+                },
+            },
+            {
+                "metadata": {"uuid": "subnet-overlay"},
+                "status": {
+                    "resources": {
+                        "subnet_type": "OVERLAY",
+                        "vpc_reference": {"uuid": "vpc-1"},
+                    }
+                },
+            },
+            {
+                "metadata": {"uuid": "subnet-other"},
+                "status": {
+                    "resources": {"subnet_type": "VLAN"},
+                    "cluster_reference": {"uuid": "cluster-other"},
+                },
+            },
+        ],
+        ("pc-1", "clusters"): [
+            {"metadata": {"uuid": uuid}}
+            for uuid in ["cluster-1", "cluster-2", "cluster-other"]
+        ],
+        ("pc-1", "VPCs"): [{"metadata": {"uuid": "vpc-1"}}],
+        ("pc-2", "clusters"): [{"metadata": {"uuid": "cluster-2"}}],
+        ("pc-2", "VPCs"): [{"metadata": {"uuid": "vpc-1"}}],
+    }
+
+    def setup_method(self):
+        def fetch_helper(entity_type):
+            def fetch(account_uuid):
+                if (account_uuid, entity_type) == ("pc-2", "subnets"):
+                    raise Exception("[500] - subnets list failed")
+                return {
+                    "entities": self.PC_ACCOUNT_ENTITIES[(account_uuid, entity_type)]
+                }
+
+            return MagicMock(side_effect=fetch)
+
+        self.ahv_obj = MagicMock()
+        self.ahv_obj.subnets = fetch_helper("subnets")
+        self.ahv_obj.clusters = fetch_helper("clusters")
+        self.ahv_obj.vpcs = fetch_helper("VPCs")
+        provider = MagicMock()
+        provider.get_api_obj.return_value = self.ahv_obj
+
+        client = self.client = MagicMock()
+        client.account.get_uuid_type_map.return_value = {
+            "pc-1": "nutanix_pc",
+            "pc-2": "nutanix_pc",
+            "aws-1": "aws",
+        }
+        self.patchers = [
+            patch.object(table_config, "get_api_client", return_value=client),
+            patch.object(ProjectCache, "get_provider_plugin", return_value=provider),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+
+    def teardown_method(self):
+        for patcher in self.patchers:
+            patcher.stop()
+
+    def test_fetch_pc_accounts_data(self):
+        data = ProjectCache.fetch_pc_accounts_data(["pc-1", "pc-2"])
+
+        assert set(data) == {
+            (account_uuid, entity_type)
+            for account_uuid in ["pc-1", "pc-2"]
+            for entity_type in ["subnets", "clusters", "VPCs"]
+        }
+        assert data[("pc-2", "subnets")] is None
+        for key, entities in self.PC_ACCOUNT_ENTITIES.items():
+            assert data[key] == entities
+
+        for helper in [self.ahv_obj.subnets, self.ahv_obj.clusters, self.ahv_obj.vpcs]:
+            assert sorted(
+                call[1]["account_uuid"] for call in helper.call_args_list
+            ) == [
+                "pc-1",
+                "pc-2",
+            ]
+
+    def test_get_entries(self):
+        account_uuids = ["pc-1", "pc-2", "aws-1", "deleted-account"]
+        project = {
+            "metadata": {"uuid": "project-uuid"},
+            "status": {
+                "name": "project",
+                "resources": {
+                    "account_reference_list": [
+                        {"uuid": uuid} for uuid in account_uuids
+                    ],
+                    "cluster_reference_list": [{"uuid": "cluster-2"}],
+                    "vpc_reference_list": [],
+                },
+            },
+            "spec": {
+                "resources": {
+                    "external_network_list": [{"uuid": "subnet-vlan"}],
+                    "subnet_reference_list": [{"uuid": "subnet-overlay"}],
+                }
+            },
+        }
+
+        (entry,) = ProjectCache.get_entries([project])
+        assert entry["name"] == "project"
+        assert entry["uuid"] == "project-uuid"
+
+        # Deleted accounts are skipped
+        assert json.loads(entry["accounts_data"]) == {
+            "nutanix_pc": ["pc-1", "pc-2"],
+            "aws": ["aws-1"],
+        }
+
+        def whitelist(key):
+            return {
+                account_uuid: sorted(uuids)
+                for account_uuid, uuids in json.loads(entry[key]).items()
+            }
+
+        # Clusters and vpcs of project subnets are whitelisted along with project ones.
+        # Nothing is whitelisted for pc-2, as its subnets could not be listed
+        assert whitelist("whitelisted_subnets") == {
+            "pc-1": ["subnet-overlay", "subnet-vlan"],
+            "pc-2": [],
+        }
+        assert whitelist("whitelisted_clusters") == {
+            "pc-1": ["cluster-1", "cluster-2"],
+            "pc-2": [],
+        }
+        assert whitelist("whitelisted_vpcs") == {"pc-1": ["vpc-1"], "pc-2": []}
+
+    def test_full_sync(self):
+        """rows depend on account data, that changes without updating projects"""
+
+        self.client.project.list_all.return_value = [{"metadata": {"uuid": "p"}}]
+        sync_state = {"high_water_mark": 1, "total_matches": 1}
+        with patch.object(ProjectCache, "get_entries", return_value=["entry"]):
+            sync_data = ProjectCache.fetch_sync_data(sync_state)
+
+        assert not sync_data.is_delta
+        assert sync_data.entries == ["entry"]
+        assert sync_data.sync_state is None
+        assert "filter" not in self.client.project.list_all.call_args[1]["base_params"]
+
+        with patch.object(CacheSyncStateTable, "get") as get_state:
+            assert ProjectCache.get_sync_state() is None
+        get_state.assert_not_called()
+
+
+class TestEntityDataMemo(MockedUserAPITest):
+    def setup_method(self):
+        super().setup_method()
+        Cache.clear_memo()
+        self.tables_patcher = patch.object(
+            Cache, "get_cache_tables", return_value={"user": UsersCache}
+        )
+        self.tables_patcher.start()
+
+    def teardown_method(self):
+        self.tables_patcher.stop()
+        Cache.clear_memo()
+        super().teardown_method()
+
+    def _get_name(self, uuid):
+        return Cache.get_entity_data_using_uuid("user", uuid).get("name")
+
+    def test_write_paths(self, cache_db):
+        Cache.sync_table("user")
+        assert Cache.get_entity_data("user", "user0")["uuid"] == "uuid-0"
+        assert Cache.get_entity_data("user", "user3") == {}
+
+        self.api.entities.append(_user_entity("uuid-3", "user3", 300))
+        Cache.add_one("user", "uuid-3")
+        assert Cache.get_entity_data("user", "user3")["uuid"] == "uuid-3"
+
+        assert self._get_name("uuid-1") == "user1"
+        self.api.entities[1] = _user_entity("uuid-1", "renamed", 101, 200)
+        Cache.update_one("user", "uuid-1")
+        assert self._get_name("uuid-1") == "renamed"
+
+        Cache.delete_one("user", "uuid-0")
+        assert Cache.get_entity_data("user", "user0") == {}
+
+        assert self._get_name("uuid-2") == "user2"
+        self.api.entities[2] = _user_entity("uuid-2", "synced", 102, 300)
+        Cache.sync_table("user")
+        assert self._get_name("uuid-2") == "synced"
+
+    def test_copies(self, cache_db):
+        Cache.sync_table("user")
+
+        entity = Cache.get_entity_data("user", "user0")
+        entity["name"] = "modified"
+        assert Cache.get_entity_data("user", "user0")["name"] == "user0"
+
+        entity = Cache.get_entity_data_using_uuid("user", "uuid-0")
+        entity.clear()
+        assert self._get_name("uuid-0") == "user0"
+
+
+class FakeTable:
+    """Cache table recording fetch and apply calls"""
+
+    def __init__(self, cache_type, entries, apply_log, fetch_error=None):
+        self.cache_type = cache_type
+        self.entries = entries
+        self.apply_log = apply_log
+        self.fetch_error = fetch_error
+        self.apply_errors = []
+        self.fetch_calls = []
+
+    def get_cache_type(self):
+        return self.cache_type
+
+    def get_sync_state(self):
+        return {"high_water_mark": 1, "total_matches": len(self.entries)}
+
+    def fetch_sync_data(self, sync_state=None):
+        self.fetch_calls.append(sync_state)
+        if self.fetch_error:
+            raise self.fetch_error
+
+        changed_uuids = [e["uuid"] for e in self.entries] if sync_state else None
+        return CacheSyncData(self.entries, changed_uuids=changed_uuids)
+
+    def apply_sync_data(self, sync_data):
+        if self.apply_errors:
+            raise self.apply_errors.pop(0)
+
+        self.apply_log.append((self.cache_type, sync_data))
+
+
+class TestCacheSyncEngine:
+    def setup_method(self):
+        self.apply_log = []
+        self.tables = [
+            FakeTable(
+                "table{}".format(i),
+                [{"name": "entity", "uuid": "uuid-{}".format(j)} for j in range(i)],
+                self.apply_log,
+            )
+            for i in range(4)
+        ]
+
+    def _sync(self, incremental=False):
+        """runs Cache.sync over fake tables, returns (results, init_db_handle mock)"""
+
+        cache_tables = {table.cache_type: table for table in self.tables}
+        with patch.object(
+            Cache, "get_cache_tables", return_value=cache_tables
+        ), patch.object(cache_module.Version, "sync"), patch.object(
+            cache_module, "init_db_handle"
+        ) as init_db_handle:
+            results = Cache.sync(incremental=incremental)
+
+        return results, init_db_handle
+
+    def test_fetch_error(self):
+        error = Exception("[500] - list failed")
+        self.tables[2].fetch_error = error
+
+        engine = CacheSyncEngine(self.tables, max_workers=2)
+        with pytest.raises(Exception) as exc_info:
+            engine.run()
+        assert exc_info.value is error
+
+        # All tables are fetched, but none is written if any fetch fails
+        assert [result.table for result in engine.results] == self.tables
+        assert [result.error for result in engine.results] == [None, None, error, None]
+        assert [len(result.entries) for result in engine.results] == [0, 1, 0, 3]
+        assert self.apply_log == []
+
+        with pytest.raises(Exception):
+            self._sync()
+        assert self.apply_log == []
+
+    def test_results(self):
+        results, init_db_handle = self._sync(incremental=True)
+
+        init_db_handle.assert_not_called()
+        assert [cache_type for cache_type, _ in self.apply_log] == [
+            table.cache_type for table in self.tables
+        ]
+        assert [result.cache_type for result in results] == [
+            table.cache_type for table in self.tables
+        ]
+        assert all(result.is_delta for result in results)
+        assert all(result.error is None for result in results)
+        assert [len(result.entries) for result in results] == [0, 1, 2, 3]
+
+    @pytest.mark.parametrize("error_cls", [OperationalError, IntegrityError])
+    def test_retry(self, error_cls):
+        """full data is reused when db is recreated after a write failure"""
+
+        self.tables[1].apply_errors = [error_cls("no such column")]
+        results, init_db_handle = self._sync()
+
+        init_db_handle.assert_called_once_with()
+        assert all(len(table.fetch_calls) == 1 for table in self.tables)
+
+        # Tables written before failure are written again to recreated db
+        assert [cache_type for cache_type, _ in self.apply_log] == ["table0"] + [
+            table.cache_type for table in self.tables
+        ]
+        assert [len(result.entries) for result in results] == [0, 1, 2, 3]
+
+    def test_retry_after_delta(self):
+        """delta data can't be applied to recreated db, so tables are fetched fully"""
+
+        self.tables[1].apply_errors = [OperationalError("no such table")]
+        results, init_db_handle = self._sync(incremental=True)
+
+        init_db_handle.assert_called_once_with()
+        for table in self.tables:
+            assert table.fetch_calls == [table.get_sync_state(), None]
+
+        assert not any(result.is_delta for result in results)
+        assert not any(sync_data.is_delta for _, sync_data in self.apply_log[1:])
+
+    def test_show_sync_timings(self, capsys):
+        results, _ = self._sync()
+        for index, result in enumerate(results):
+            result.fetch_time = index
+            result.apply_time = 0.5
+
+        Cache.show_sync_timings(results)
+        rows = [
+            line.split("|")[1:-1]
+            for line in capsys.readouterr().out.splitlines()
+            if line.startswith("|")
+        ]
+        assert [cell.strip() for cell in rows[0]] == [
+            "TABLE",
+            "SYNC TYPE",
+            "ENTRIES",
+            "FETCH (s)",
+            "UPDATE (s)",
+            "TOTAL (s)",
+        ]
+
+        # Slowest tables are listed first
+        assert [[cell.strip() for cell in row] for row in rows[1:3]] == [
+            ["table3", "full", "3", "3.00", "0.50", "3.50"],
+            ["table2", "full", "2", "2.00", "0.50", "2.50"],
+        ]
+        assert len(rows) == 5
@@ -0,0 +1,104 @@
+import inspect
+import io
+import logging
+from unittest.mock import MagicMock, patch
+
+from calm.dsl.api.connection import Connection, REQUEST
+from calm.dsl.api.resource import ResourceAPI
+from calm.dsl.builtins import Service, CalmTask, CalmVariable, action
+from calm.dsl.log import CustomLogging
+
+LOG = CustomLogging(__name__)
+
+
+class LoggedService(Service):
+    """service compiled by benchmark"""
+
+    PORT = CalmVariable.Simple.int("3306", is_mandatory=True)
+
+    @action
+    def __create__():
+        CalmTask.Exec.ssh(name="Task1", script="echo 'created'")
+
+
+class _Counted:
+    """object counting the times it is formatted in a log message"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __str__(self):
+        self.count += 1
+        return "counted"
+
+
+def _list_response(offset, length):
+    res = MagicMock()
+    res.json.return_value = {
+        "entities": list(range(offset, min(offset + length, 1000))),
+        "metadata": {"total_matches": 1000},
+    }
+    return res
+
+
+class TestLogOverhead:
+    def setup_method(self):
+        self.stream = io.StringIO()
+        LOG._ch1.stream = self.stream
+
+    def teardown_method(self):
+        CustomLogging.set_verbose_level(logging.INFO)
+
+    def test_disabled_levels(self):
+        CustomLogging.set_verbose_level(logging.INFO)
+
+        counted = _Counted()
+        LOG.debug("Skipped %s", counted)
+        assert counted.count == 0
+        assert self.stream.getvalue() == ""
+
+        line = inspect.currentframe().f_lineno + 1
+        LOG.info("Printed %s", counted)
+        assert counted.count > 0
+        assert ":{}] Printed counted".format(line) in self.stream.getvalue()
+
+    def test_caller_info(self):
+        CustomLogging.set_verbose_level(logging.DEBUG)
+        CustomLogging.IS_RP_ENABLED = True
+        try:
+            line = inspect.currentframe().f_lineno + 1
+            LOG.debug("Debug message")
+        finally:
+            CustomLogging.IS_RP_ENABLED = False
+
+        assert (
+            "{}-test_caller_info:{}] Debug message".format(__file__, line)
+            in self.stream.getvalue()
+        )
+
+    def test_hot_paths(self):
+        """disabled debug logs in compile and list paths collect no caller info"""
+
+        CustomLogging.set_verbose_level(logging.INFO)
+
+        connection = Connection("127.0.0.1", 9440, scheme=REQUEST.SCHEME.HTTP)
+        connection.session = MagicMock()
+        connection.session.post.return_value = _list_response(0, 1000)
+        resource = ResourceAPI(connection, "blueprints")
+
+        with patch.object(
+            CustomLogging,
+            "_CustomLogging__add_caller_info",
+            autospec=True,
+            side_effect=lambda self, msg, kwargs: msg,
+        ) as add_caller_info:
+            # Debug logs are issued for every request and validated object
+            LoggedService.json_dumps()
+            resource.list_all(api_limit=1000)
+            assert add_caller_info.call_count == 0
+
+            LOG.info("Printed")
+            assert add_caller_info.call_count == 1
+
+        assert "Printed" in self.stream.getvalue()
+        assert "Validating object" not in self.stream.getvalue()
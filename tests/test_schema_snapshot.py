@@ -0,0 +1,134 @@
+import pickle
+from unittest.mock import patch
+
+import jsonref
+import pytest
+
+from calm.dsl.builtins.models import schema
+
+
+def _assert_same(obj, expected, seen=None):
+    """compares resolved schemas with jsonref schemas, following cycles once"""
+
+    if seen is None:
+        seen = set()
+
+    if isinstance(expected, jsonref.JsonRef):
+        expected = expected.__subject__
+
+    if (id(obj), id(expected)) in seen:
+        return
+    seen.add((id(obj), id(expected)))
+
+    assert not isinstance(obj, jsonref.JsonRef)
+    if isinstance(expected, dict):
+        assert isinstance(obj, dict)
+        assert list(obj.keys()) == list(expected.keys())
+        for key, value in expected.items():
+            _assert_same(obj[key], value, seen)
+
+    elif isinstance(expected, list):
+        assert isinstance(obj, list)
+        assert len(obj) == len(expected)
+        for value, expected_value in zip(obj, expected):
+            _assert_same(value, expected_value, seen)
+
+    else:
+        assert obj == expected
+
+
+class TestSchemaSnapshot:
+    @pytest.fixture(autouse=True)
+    def snapshot_file(self, tmp_path):
+        """stores snapshot in tmp_path, and rebuilds schemas in every test"""
+
+        snapshot_file = str(tmp_path / schema.SCHEMA_SNAPSHOT_FILE)
+        schemas = schema._SCHEMAS
+        schema._SCHEMAS = None
+        with patch.object(
+            schema, "_get_schema_snapshot_location", return_value=snapshot_file
+        ):
+            yield snapshot_file
+        schema._SCHEMAS = schemas
+
+    def _get_all_schemas(self):
+        """returns (schemas, number of times templates are loaded)"""
+
+        schema._SCHEMAS = None
+        with patch.object(
+            schema, "_load_all_schemas", wraps=schema._load_all_schemas
+        ) as load_all_schemas:
+            schemas = schema._get_all_schemas()
+        return schemas, load_all_schemas.call_count
+
+    def _read_snapshot(self, snapshot_file):
+        with open(snapshot_file, "rb") as fd:
+            return pickle.load(fd)
+
+    def test_round_trip(self, snapshot_file):
+        schemas, load_count = self._get_all_schemas()
+        assert load_count == 1
+        _assert_same(schemas, schema._load_all_schemas())
+
+        # Schemas are read from snapshot in next run
+        snapshot_schemas, load_count = self._get_all_schemas()
+        assert load_count == 0
+        _assert_same(snapshot_schemas, schema._load_all_schemas())
+        assert self._read_snapshot(snapshot_file)["signature"] == (
+            schema._get_schema_templates_signature()
+        )
+
+    def test_signature_change(self, snapshot_file):
+        self._get_all_schemas()
+
+        with patch.object(
+            schema, "_get_schema_templates_signature", return_value="changed"
+        ):
+            _, load_count = self._get_all_schemas()
+            assert load_count == 1
+            assert self._read_snapshot(snapshot_file)["signature"] == "changed"
+
+            _, load_count = self._get_all_schemas()
+            assert load_count == 0
+
+    @pytest.mark.parametrize("corrupt", ["truncate", "garbage", "other_object"])
+    def test_corrupt_snapshot(self, snapshot_file, corrupt):
+        self._get_all_schemas()
+
+        with open(snapshot_file, "rb") as fd:
+            data = fd.read()
+        if corrupt == "truncate":
+            data = data[: len(data) // 2]
+        elif corrupt == "garbage":
+            data = b"not a pickle"
+        else:
+            data = pickle.dumps(["schemas"])
+        with open(snapshot_file, "wb") as fd:
+            fd.write(data)
+
+        schemas, load_count = self._get_all_schemas()
+        assert load_count == 1
+        _assert_same(schemas, schema._load_all_schemas())
+
+        # Snapshot is rewritten
+        _, load_count = self._get_all_schemas()
+        assert load_count == 0
+
+    def test_resolve_schema_refs(self):
+        data = jsonref.loads(
+            """{
+                "base": {"type": "object", "properties": {"name": {"type": "string"}}},
+                "first": {"$ref": "#/base"},
+                "second": {"items": [{"$ref": "#/base"}]},
+                "node": {"properties": {"child": {"$ref": "#/node"}}}
+            }"""
+        )
+        resolved = schema._resolve_schema_refs(data)
+
+        # Shared and cyclic references are kept after pickling
+        for res in [resolved, pickle.loads(pickle.dumps(resolved))]:
+            assert type(res["first"]) is dict
+            assert res["first"] is res["base"]
+            assert res["second"]["items"][0] is res["base"]
+            assert res["node"]["properties"]["child"] is res["node"]
+            assert res["base"]["properties"]["name"] == {"type": "string"}
@@ -0,0 +1,89 @@
+import types
+import uuid
+from unittest.mock import patch
+
+import peewee
+import pytest
+import scrypt
+
+from calm.dsl.crypto import Crypto, DEFAULT_KDF_COST
+from calm.dsl.db.handler import Database
+from calm.dsl.db.table_config import DataTable
+from calm.dsl.store import Secret
+
+
+def _secret_name():
+    return "secret_{}".format(str(uuid.uuid4())[-10:])
+
+
+class TestSecretStore:
+    def setup_method(self):
+        self.secret_names = []
+        Crypto.clear_key_cache()
+
+    def teardown_method(self):
+        for name in self.secret_names:
+            Secret.delete(name)
+
+    def _create_secret(self, value, **kwargs):
+        name = _secret_name()
+        Secret.create(name, value, **kwargs)
+        self.secret_names.append(name)
+        return name
+
+    def test_find_many(self):
+        values = ["val_{}".format(index) for index in range(3)]
+        names = [self._create_secret(value) for value in values]
+        Crypto.clear_key_cache()
+
+        with patch.object(scrypt, "hash", wraps=scrypt.hash) as scrypt_hash:
+            assert Secret.find_many(names + ["missing"]) == dict(zip(names, values))
+            assert scrypt_hash.call_count == 3
+
+            # Derived keys are cached, so repeated lookups skip scrypt
+            assert [Secret.find(name) for name in names] == values
+            assert Secret.find_many(names[:1]) == {names[0]: values[0]}
+            assert scrypt_hash.call_count == 3
+
+        assert Secret.find_many([]) == {}
+
+    def test_kdf_cost(self):
+        name = self._create_secret("value", kdf_cost=1024)
+        secret_data = Secret.get_instance(name).data[0]
+        assert secret_data.kdf_cost == 1024
+        assert Secret.find(name) == "value"
+
+        # Cost of secret is retained on update
+        Secret.update(name, "new_value")
+        secret_data = Secret.get_instance(name).data[0]
+        assert secret_data.kdf_cost == 1024
+        assert Secret.find(name) == "new_value"
+
+        name = self._create_secret("value")
+        assert Secret.get_instance(name).data[0].kdf_cost == DEFAULT_KDF_COST
+
+        with pytest.raises(ValueError):
+            Secret.create(_secret_name(), "value", kdf_cost=1000)
+
+    def test_add_kdf_cost_column(self, tmp_path):
+        """secrets stored by older versions are decrypted with default cost"""
+
+        db = peewee.SqliteDatabase(str(tmp_path / "dsl.db"))
+        db.execute_sql(
+            "CREATE TABLE datatable (id INTEGER PRIMARY KEY, secret_ref_id VARCHAR(255),"
+            " kdf_salt BLOB, ciphertext BLOB, iv BLOB, auth_tag BLOB, pass_phrase BLOB)"
+        )
+        enc_msg = Crypto.encrypt_AES_GCM("value", b"pass")
+        db.execute_sql(
+            "INSERT INTO datatable VALUES (1, 'old', ?, ?, ?, ?, ?)",
+            list(enc_msg) + [b"pass"],
+        )
+
+        Database.add_missing_columns(types.SimpleNamespace(db=db), DataTable)
+        Database.add_missing_columns(types.SimpleNamespace(db=db), DataTable)
+
+        (kdf_cost,) = db.execute_sql("SELECT kdf_cost FROM datatable").fetchone()
+        assert kdf_cost == DEFAULT_KDF_COST
+
+        Crypto.clear_key_cache()
+        assert Crypto.decrypt_AES_GCM(enc_msg, b"pass", kdf_cost=kdf_cost) == "value"
@@ -79,6 +79,29 @@ def test_service_valid_multiple_inheritance():
     Dog.compile()
 
 
+def test_service_merged_attrs():
+    class Base(Service):
+        tier = "web"
+
+    class MySQLService(Base):
+        singleton = True
+
+    attrs = MySQLService.get_all_attrs()
+    assert attrs["tier"] == "web"
+    assert attrs["singleton"] is True
+    assert MySQLService.get_merged_attrs() is MySQLService.get_merged_attrs()
+
+    # Attrs changed on the class or its bases are picked on next compile
+    Base.tier = "db"
+    MySQLService.foo = Var("bar")
+    attrs = MySQLService.get_all_attrs()
+    assert attrs["tier"] == "db"
+    assert "foo" in attrs
+
+    del MySQLService.foo
+    assert "foo" not in MySQLService.get_all_attrs()
+
+
 def test_service_invalid_name():
 
     with pytest.raises(SystemExit):
@@ -0,0 +1,99 @@
+import inspect
+import json
+import logging
+import os
+import subprocess
+import sys
+
+from calm.dsl.log import CustomLogging
+from calm.dsl.log.structured import (
+    StructuredLogWriter,
+    get_structured_handler,
+    stop_structured_logging,
+)
+
+LOG = CustomLogging(__name__)
+
+
+def _read_records(log_file):
+    with open(log_file) as fd:
+        return [json.loads(line) for line in fd]
+
+
+class TestStructuredLog:
+    def teardown_method(self):
+        stop_structured_logging()
+        CustomLogging.set_verbose_level(logging.INFO)
+
+    def test_json_records(self, tmp_path):
+        log_file = str(tmp_path / "calm.log")
+        CustomLogging.set_verbose_level(logging.INFO)
+        CustomLogging.enable_structured_logging(log_file)
+
+        line = inspect.currentframe().f_lineno + 1
+        LOG.info("Created %s", "bp1")
+        LOG.debug("Skipped")
+        try:
+            raise ValueError("invalid")
+        except ValueError:
+            LOG.error("Failed", exc_info=True)
+
+        stop_structured_logging()
+        records = _read_records(log_file)
+        assert [record["message"] for record in records] == ["Created bp1", "Failed"]
+
+        record = records[0]
+        assert record["level"] == "INFO"
+        assert record["logger"] == __name__
+        assert record["file"] == __file__
+        assert record["func"] == "test_json_records"
+        assert record["line"] == line
+        assert "ValueError: invalid" in records[1]["exc"]
+
+        # Logs are written to console after writer is stopped
+        LOG.info("Console")
+        assert LOG._handler is LOG._ch1
+        assert len(_read_records(log_file)) == 2
+
+    def test_bounded_queue(self, tmp_path):
+        log_file = str(tmp_path / "calm.log")
+        writer = StructuredLogWriter(log_file, max_queued_records=2)
+
+        # Records are queued till writer is started
+        for index in range(5):
+            writer.handler.handle(
+                logging.makeLogRecord(
+                    {"levelno": logging.INFO, "msg": "Record %s", "args": (index,)}
+                )
+            )
+        assert writer.handler.dropped == 3
+
+        writer.start()
+        writer.stop()
+        records = _read_records(log_file)
+        assert [record["message"] for record in records] == [
+            "Record 0",
+            "Record 1",
+            "Dropped 3 log records as queue was full",
+        ]
+
+    def test_flush_on_exit(self, tmp_path):
+        log_file = str(tmp_path / "calm.log")
+        script = "\n".join(
+            [
+                "import sys",
+                "from calm.dsl.log import get_logging_handle, CustomLogging",
+                "LOG = get_logging_handle('exit_test')",
+                "CustomLogging.enable_structured_logging(sys.argv[1])",
+                "for index in range(1000):",
+                "    LOG.info('Record {}'.format(index))",
+                "sys.exit(-1)",
+            ]
+        )
+        env = dict(os.environ, PYTHONPATH=os.getcwd())
+        subprocess.run([sys.executable, "-c", script, log_file], env=env)
+
+        records = _read_records(log_file)
+        assert len(records) == 1000
+        assert records[-1]["message"] == "Record 999"
+        assert get_structured_handler() is None